@@ -1,38 +1,65 @@
 """Conversation API endpoints."""
-from fastapi import APIRouter, HTTPException, Depends, Query
+import orjson
+from collections import Counter
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
-from ..models.conversation import ConversationHistoryRequest, ConversationHistoryResponse, ConversationSession, ConversationMessage
+from ..models.conversation import ConversationHistoryRequest, ConversationHistoryResponse, ConversationSession, ConversationMessage, ConversationMessageBody
 from ..database import get_database
 from ..cache import get_cache
 
-router = APIRouter(prefix="/api/conversation", tags=["conversations"])
+router = APIRouter(prefix="/api/conversation", tags=["conversations"], default_response_class=ORJSONResponse)
+
+# Legacy message_type values map onto the conversation_messages 'role' column
+MESSAGE_TYPE_TO_ROLE = {
+    "user_input": "user",
+    "agent_response": "agent",
+    "system_event": "system",
+}
+
+# Everything but the timestamp is fixed: serialize it once and splice the time in per probe
+HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "services": {
+        "database": "available",
+        "cache": "available"
+    }
+})[:-1] + b',"timestamp":"'
+
+# Validated once at import; only the request-specific keys are filled in per call.
+MOCK_SESSION = ConversationSession(
+    id="session-1",
+    user_id="",
+    session_start="2024-01-01T00:00:00Z",
+    session_end="2024-01-01T01:00:00Z",
+    total_interactions=10,
+    voice_interruptions=2,
+    topics_discussed=["technology", "finance"],
+    is_active=False
+).model_dump(mode="json")
+
+MOCK_SUMMARY_FIELDS = {
+    "topics_discussed": ["technology", "finance"],
+    "key_insights": ["User interested in tech news", "Asked about stock prices"],
+    "session_duration_minutes": 30.0,
+    "average_response_time_ms": 1200.0,
+    "interruption_count": 2,
+    "created_at": "2024-01-01T00:00:00Z"
+}
 
 
 @router.get("/sessions", response_model=List[ConversationSession])
 async def get_conversation_sessions(
     user_id: str = Query(..., description="User ID"),
     limit: int = Query(20, description="Maximum number of sessions"),
-    offset: int = Query(0, description="Sessions offset"),
-    db=Depends(get_database)
+    offset: int = Query(0, description="Sessions offset")
 ):
     """Get user's conversation sessions."""
     try:
         # This would need to be implemented in the database layer
-        # For now, return mock data
-        sessions = [
-            ConversationSession(
-                id="session-1",
-                user_id=user_id,
-                session_start="2024-01-01T00:00:00Z",
-                session_end="2024-01-01T01:00:00Z",
-                total_interactions=10,
-                voice_interruptions=2,
-                topics_discussed=["technology", "finance"],
-                is_active=False
-            )
-        ]
-        
-        return sessions
+        # For now, return the prevalidated mock session (no per-request model validation)
+        return ORJSONResponse([{**MOCK_SESSION, "user_id": user_id}])
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting conversation sessions: {str(e)}")
@@ -48,12 +75,9 @@ async def get_conversation_messages(
 ):
     """Get messages for a specific conversation session."""
     try:
-        # Get messages from database
-        messages = await db.get_conversation_messages(session_id, limit)
-        
-        # Filter by message type if requested
-        if message_type:
-            messages = [msg for msg in messages if msg.get("message_type") == message_type]
+        # Get messages from database (message type filter applied in SQL)
+        role = MESSAGE_TYPE_TO_ROLE.get(message_type, message_type) if message_type else None
+        messages = await db.get_conversation_messages(session_id, limit, role=role)
         
         return ConversationHistoryResponse(
             messages=messages,
@@ -90,31 +114,18 @@ async def create_conversation_session(
 @router.post("/{session_id}/messages")
 async def add_conversation_message(
     session_id: str,
-    user_id: str,
-    message_type: str,
-    content: str,
-    audio_url: Optional[str] = None,
-    processing_time_ms: Optional[int] = None,
-    confidence_score: Optional[float] = None,
-    referenced_news_ids: List[str] = [],
-    metadata: Dict[str, Any] = {},
+    payload: ConversationMessageBody,
     db=Depends(get_database)
 ):
     """Add message to conversation session."""
     try:
-        # Add message to database
+        # Add message to database (legacy message_type is stored in the 'role' column)
         message = await db.add_conversation_message(
             session_id=session_id,
-            user_id=user_id,
-            message_type=message_type,
-            content=content,
-            metadata={
-                "audio_url": audio_url,
-                "processing_time_ms": processing_time_ms,
-                "confidence_score": confidence_score,
-                "referenced_news_ids": referenced_news_ids,
-                **metadata
-            }
+            user_id=payload.user_id,
+            role=MESSAGE_TYPE_TO_ROLE.get(payload.message_type, "system"),
+            content=payload.content,
+            metadata=payload.message_metadata()
         )
         
         if not message:
@@ -138,34 +149,26 @@ async def get_conversation_summary(
         # Get messages for summary
         messages = await db.get_conversation_messages(session_id, 100)
         
-        # Generate summary (mock for now)
-        summary = {
+        # Count messages per role in a single pass
+        role_counts = Counter(m.get("role") for m in messages)
+        
+        # Generate summary (mock fields for now); the dict is already JSON-safe, so skip jsonable_encoder
+        return ORJSONResponse({
             "session_id": session_id,
             "total_messages": len(messages),
-            "user_messages": len([m for m in messages if m.get("message_type") == "user_input"]),
-            "agent_messages": len([m for m in messages if m.get("message_type") == "agent_response"]),
-            "topics_discussed": ["technology", "finance"],
-            "key_insights": ["User interested in tech news", "Asked about stock prices"],
-            "session_duration_minutes": 30.0,
-            "average_response_time_ms": 1200.0,
-            "interruption_count": 2,
-            "created_at": "2024-01-01T00:00:00Z"
-        }
-        
-        return summary
+            "user_messages": role_counts[MESSAGE_TYPE_TO_ROLE["user_input"]],
+            "agent_messages": role_counts[MESSAGE_TYPE_TO_ROLE["agent_response"]],
+            **MOCK_SUMMARY_FIELDS
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting conversation summary: {str(e)}")
 
 
 @router.get("/health")
-async def conversation_health_check():
+async def conversation_health_check() -> Response:
     """Health check for conversation services."""
-    return {
-        "status": "healthy",
-        "services": {
-            "database": "available",
-            "cache": "available"
-        },
-        "timestamp": "2024-01-01T00:00:00Z"
-    }
+    return Response(
+        HEALTH_PREFIX + datetime.utcnow().isoformat().encode() + b'Z"}',
+        media_type="application/json"
+    )
@@ -30,13 +30,7 @@ async def log_message(payload: ConversationMessageCreate, db=Depends(get_databas
         user_id=payload.user_id,
         role=role,
         content=payload.content,
-        metadata={
-            "audio_url": payload.audio_url,
-            "processing_time_ms": payload.processing_time_ms,
-            "confidence_score": payload.confidence_score,
-            "referenced_news_ids": payload.referenced_news_ids,
-            **(payload.metadata or {})
-        }
+        metadata=payload.message_metadata()
     )
     if not item:
         raise HTTPException(status_code=500, detail="Failed to add message")
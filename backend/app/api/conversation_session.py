@@ -4,15 +4,22 @@ Conversation Session API
 API endpoints for retrieving conversation session data and logs.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+from itertools import islice
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Iterable, Optional, List
 from datetime import datetime
+import orjson
 from pydantic import BaseModel
 
 from ..utils.conversation_logger import get_conversation_logger, SessionInfo, ConversationTurn
+from ..utils.http_cache import etag_matches
 
 router = APIRouter(prefix="/api/conversation-session", tags=["conversation-sessions"])
 
+# Process-wide logger singleton, resolved once instead of on every request
+conversation_logger = get_conversation_logger()
+
 
 class ConversationTurnResponse(BaseModel):
     """Response model for conversation turn."""
@@ -49,8 +56,46 @@ class ModelInfoResponse(BaseModel):
     loading_time_ms: dict
 
 
+def _session_json_chunks(session_info: SessionInfo) -> Iterable[bytes]:
+    """Encode one session as JSON, one turn per chunk.
+
+    Turns and totals are snapshotted up front so an active session that keeps
+    logging turns still produces a consistent document.
+    """
+    turns = list(session_info.turns)
+    header = orjson.dumps({
+        "session_id": session_info.session_id,
+        "user_id": session_info.user_id,
+        "session_start": session_info.session_start,
+        "session_end": session_info.session_end,
+        "total_turns": session_info.total_turns,
+        "total_interruptions": session_info.total_interruptions,
+    })
+    yield header[:-1] + b',"turns":['
+    for index, turn in enumerate(turns):
+        yield (b"," if index else b"") + orjson.dumps(turn)
+    yield b"]}"
+
+
+async def _stream_sessions(sessions: List[SessionInfo]) -> AsyncIterator[bytes]:
+    """Stream a JSON array of sessions without building response models."""
+    yield b"["
+    for index, session_info in enumerate(sessions):
+        if index:
+            yield b","
+        for chunk in _session_json_chunks(session_info):
+            yield chunk
+    yield b"]"
+
+
+async def _stream_session(session_info: SessionInfo) -> AsyncIterator[bytes]:
+    """Stream a single session as a JSON object."""
+    for chunk in _session_json_chunks(session_info):
+        yield chunk
+
+
 @router.get("/sessions/{session_id}", response_model=SessionInfoResponse)
-async def get_conversation_session(session_id: str):
+async def get_conversation_session(session_id: str, request: Request):
     """
     Retrieve full conversation session data by session ID.
 
@@ -63,40 +108,19 @@ async def get_conversation_session(session_id: str):
     Raises:
         404: Session not found
     """
-    logger = get_conversation_logger()
-
-    session_info = logger.get_session_info(session_id)
+    session_info = conversation_logger.get_session_info(session_id)
 
     if not session_info:
         raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
 
-    # Convert to response model
-    turns = [
-        ConversationTurnResponse(
-            session_id=turn.session_id,
-            user_id=turn.user_id,
-            timestamp=turn.timestamp,
-            transcription=turn.transcription,
-            agent_response=turn.agent_response,
-            processing_time_ms=turn.processing_time_ms,
-            audio_format=turn.audio_format,
-            audio_size_bytes=turn.audio_size_bytes,
-            tts_chunks_sent=turn.tts_chunks_sent,
-            error=turn.error,
-            metadata=turn.metadata
-        )
-        for turn in session_info.turns
-    ]
-
-    return SessionInfoResponse(
-        session_id=session_info.session_id,
-        user_id=session_info.user_id,
-        session_start=session_info.session_start,
-        session_end=session_info.session_end,
-        turns=turns,
-        total_turns=session_info.total_turns,
-        total_interruptions=session_info.total_interruptions
-    )
+    # Turns are append-only, so the counters identify a session version; polls of an unchanged session get a 304
+    etag = f'W/"{session_info.total_turns}-{session_info.total_interruptions}-{session_info.session_end or 0}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Stream turn by turn so long sessions are never buffered as one response body
+    return StreamingResponse(_stream_session(session_info), media_type="application/json", headers=headers)
 
 
 @router.get("/sessions", response_model=List[SessionInfoResponse])
@@ -114,49 +138,18 @@ async def list_conversation_sessions(
     Returns:
         List of session information
     """
-    logger = get_conversation_logger()
-
-    # Get active sessions
-    active_sessions = list(logger.active_sessions.values())
+    # Iterate lazily over active sessions so only the returned `limit` are materialized
+    sessions = conversation_logger.active_sessions.values()
 
     # Filter by user_id if provided
     if user_id:
-        active_sessions = [s for s in active_sessions if s.user_id == user_id]
+        sessions = (s for s in sessions if s.user_id == user_id)
 
     # Limit results
-    active_sessions = active_sessions[:limit]
-
-    # Convert to response models
-    responses = []
-    for session_info in active_sessions:
-        turns = [
-            ConversationTurnResponse(
-                session_id=turn.session_id,
-                user_id=turn.user_id,
-                timestamp=turn.timestamp,
-                transcription=turn.transcription,
-                agent_response=turn.agent_response,
-                processing_time_ms=turn.processing_time_ms,
-                audio_format=turn.audio_format,
-                audio_size_bytes=turn.audio_size_bytes,
-                tts_chunks_sent=turn.tts_chunks_sent,
-                error=turn.error,
-                metadata=turn.metadata
-            )
-            for turn in session_info.turns
-        ]
-
-        responses.append(SessionInfoResponse(
-            session_id=session_info.session_id,
-            user_id=session_info.user_id,
-            session_start=session_info.session_start,
-            session_end=session_info.session_end,
-            turns=turns,
-            total_turns=session_info.total_turns,
-            total_interruptions=session_info.total_interruptions
-        ))
-
-    return responses
+    active_sessions = list(islice(sessions, limit))
+
+    # Stream the dataclasses straight to JSON (same shape as SessionInfoResponse)
+    return StreamingResponse(_stream_sessions(active_sessions), media_type="application/json")
 
 
 @router.get("/models/info", response_model=ModelInfoResponse)
@@ -167,8 +160,7 @@ async def get_model_info():
     Returns:
         Model loading information including which models are loaded and loading times
     """
-    logger = get_conversation_logger()
-    model_info = logger.get_model_info()
+    model_info = conversation_logger.get_model_info()
 
     return ModelInfoResponse(
         sensevoice_loaded=model_info.get("sensevoice_loaded", False),
@@ -190,10 +182,8 @@ async def delete_conversation_session(session_id: str):
     Returns:
         Success message
     """
-    logger = get_conversation_logger()
-
     # End session if active
-    session_info = logger.end_session(session_id)
+    session_info = conversation_logger.end_session(session_id)
 
     if not session_info:
         raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
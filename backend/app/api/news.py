@@ -1,35 +1,63 @@
 """News API endpoints."""
-from fastapi import APIRouter, HTTPException, Depends, Query
+import asyncio
+import orjson
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
 from ..models.news import NewsLatestRequest, NewsSearchRequest, NewsResponse, NewsSummaryRequest, NewsSummaryResponse
 from ..core.agent_wrapper_langgraph import get_agent
 from ..database import get_database
 from ..cache import get_cache
+from ..utils.http_cache import precompute_json, cached_json_response
 
-router = APIRouter(prefix="/api/news", tags=["news"])
+router = APIRouter(prefix="/api/news", tags=["news"], default_response_class=ORJSONResponse)
 
+# Maximum number of article summaries generated concurrently per request
+SUMMARY_CONCURRENCY = 8
 
-@router.get("/latest", response_model=NewsResponse)
+# Available news topics (immutable; the served payload is derived from this)
+NEWS_TOPICS = (
+    "technology",
+    "finance",
+    "politics",
+    "crypto",
+    "energy",
+    "healthcare",
+    "automotive",
+    "real_estate",
+    "retail",
+    "general",
+)
+
+# Static payloads are serialized once at import time and served with a stable ETag
+TOPICS_JSON, TOPICS_ETAG = precompute_json({"topics": list(NEWS_TOPICS), "count": len(NEWS_TOPICS)})
+
+# Everything but the timestamp is fixed: serialize it once and splice the time in per probe
+HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "services": {
+        "database": "available",
+        "cache": "available",
+        "external_apis": "available"
+    }
+})[:-1] + b',"timestamp":"'
+
+
+@router.get("/latest", response_model=NewsResponse, response_model_exclude_none=True)
 async def get_latest_news(
     topics: Optional[List[str]] = Query(None, description="Filter by topics"),
     limit: int = Query(10, description="Maximum number of articles"),
     breaking_only: bool = Query(False, description="Breaking news only"),
     category: Optional[str] = Query(None, description="Filter by category"),
-    agent=Depends(get_agent),
-    db=Depends(get_database)
+    agent=Depends(get_agent)
 ):
     """Get latest news articles."""
     try:
-        # Get news from agent wrapper
-        news_items = await agent.get_news_latest(topics or [], limit)
-        
-        # Filter breaking news if requested
-        if breaking_only:
-            news_items = [item for item in news_items if item.get("is_breaking", False)]
-        
-        # Filter by category if requested
-        if category:
-            news_items = [item for item in news_items if item.get("source", {}).get("category") == category]
+        # Filters are applied at the data source so `limit` counts matching articles
+        news_items = await agent.get_news_latest(
+            topics or [], limit, breaking_only=breaking_only, category=category
+        )
         
         return NewsResponse(
             articles=news_items,
@@ -43,27 +71,18 @@ async def get_latest_news(
         raise HTTPException(status_code=500, detail=f"Error getting latest news: {str(e)}")
 
 
-@router.get("/search", response_model=NewsResponse)
+@router.get("/search", response_model=NewsResponse, response_model_exclude_none=True)
 async def search_news(
     query: str = Query(..., description="Search query"),
     limit: int = Query(10, description="Maximum number of articles"),
     category: Optional[str] = Query(None, description="Filter by category"),
     topics: Optional[List[str]] = Query(None, description="Filter by topics"),
-    agent=Depends(get_agent),
-    db=Depends(get_database)
+    agent=Depends(get_agent)
 ):
     """Search news articles."""
     try:
-        # Search news through agent wrapper
-        news_items = await agent.search_news(query, limit)
-        
-        # Filter by category if requested
-        if category:
-            news_items = [item for item in news_items if item.get("source", {}).get("category") == category]
-        
-        # Filter by topics if requested
-        if topics:
-            news_items = [item for item in news_items if any(topic in item.get("topics", []) for topic in topics)]
+        # Search news through agent wrapper (category/topic filters applied at the data source)
+        news_items = await agent.search_news(query, limit, category=category, topics=topics)
         
         return NewsResponse(
             articles=news_items,
@@ -80,7 +99,6 @@ async def search_news(
 @router.get("/article/{article_id}")
 async def get_news_article(
     article_id: str,
-    agent=Depends(get_agent),
     db=Depends(get_database)
 ):
     """Get specific news article."""
@@ -103,50 +121,52 @@ async def get_news_article(
 @router.post("/summarize", response_model=List[NewsSummaryResponse])
 async def summarize_news(
     request: NewsSummaryRequest,
-    agent=Depends(get_agent)
+    agent=Depends(get_agent),
+    db=Depends(get_database)
 ):
     """Summarize news articles."""
     try:
-        summaries = []
-        
-        for article_id in request.article_ids:
-            # Get article (mock for now)
-            article = {
-                "id": article_id,
-                "title": f"Sample Article {article_id}",
-                "summary": "This is a sample article summary."
-            }
-            
-            # Generate summary (mock for now)
-            summary_text = f"Summary of {article['title']}: {article['summary']}"
-            
-            summaries.append(NewsSummaryResponse(
+        # Fetch all requested articles in one round-trip
+        articles = {article["id"]: article for article in await db.get_news_articles(request.article_ids)}
+        semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+        async def summarize_one(article_id: str) -> NewsSummaryResponse:
+            async with semaphore:
+                # Fall back to a sample article until the news table is populated (mock for now)
+                article = articles.get(article_id) or {
+                    "id": article_id,
+                    "title": f"Sample Article {article_id}",
+                    "summary": "This is a sample article summary."
+                }
+                summary_text = await _summarize_article(article, request.summary_type)
+
+            return NewsSummaryResponse(
                 article_id=article_id,
                 summary=summary_text,
                 summary_type=request.summary_type,
                 word_count=len(summary_text.split()),
                 processing_time_ms=200
-            ))
-        
-        return summaries
+            )
+
+        return await asyncio.gather(*(summarize_one(article_id) for article_id in request.article_ids))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error summarizing news: {str(e)}")
 
 
+async def _summarize_article(article: Dict[str, Any], summary_type: str) -> str:
+    """Generate a summary for one article (mock for now)."""
+    return f"Summary of {article['title']}: {article.get('summary') or ''}"
+
+
 @router.get("/breaking")
 async def get_breaking_news(
     limit: int = Query(5, description="Maximum number of articles"),
-    agent=Depends(get_agent),
-    db=Depends(get_database)
+    agent=Depends(get_agent)
 ):
-    """Get breaking news."""
+    """Get breaking news (same cached query as /latest?breaking_only=true)."""
     try:
-        # Get breaking news from agent wrapper
-        news_items = await agent.get_news_latest([], limit)
-        
-        # Filter for breaking news
-        breaking_news = [item for item in news_items if item.get("is_breaking", False)]
+        breaking_news = await agent.get_news_latest([], limit, breaking_only=True)
         
         return {
             "articles": breaking_news,
@@ -159,44 +179,15 @@ async def get_breaking_news(
 
 
 @router.get("/topics")
-async def get_news_topics(
-    agent=Depends(get_agent),
-    db=Depends(get_database)
-):
+async def get_news_topics(request: Request) -> Response:
     """Get available news topics."""
-    try:
-        # Return available topics
-        topics = [
-            "technology",
-            "finance",
-            "politics",
-            "crypto",
-            "energy",
-            "healthcare",
-            "automotive",
-            "real_estate",
-            "retail",
-            "general"
-        ]
-        
-        return {
-            "topics": topics,
-            "count": len(topics)
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting topics: {str(e)}")
+    return cached_json_response(request, TOPICS_JSON, TOPICS_ETAG, "public, max-age=3600")
 
 
 @router.get("/health")
-async def news_health_check():
+async def news_health_check() -> Response:
     """Health check for news services."""
-    return {
-        "status": "healthy",
-        "services": {
-            "database": "available",
-            "cache": "available",
-            "external_apis": "available"
-        },
-        "timestamp": "2024-01-01T00:00:00Z"
-    }
+    return Response(
+        HEALTH_PREFIX + datetime.utcnow().isoformat().encode() + b'Z"}',
+        media_type="application/json"
+    )
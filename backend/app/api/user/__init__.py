@@ -1,6 +1,9 @@
 """User API endpoints."""
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List, Optional, Dict, Any
+import orjson
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import ORJSONResponse
+from typing import Optional, Dict, Any
 from ...models.user import (
     UserPreferences,
     UserPreferencesUpdate,
@@ -8,215 +11,192 @@ from ...models.user import (
     AddTopicRequest,
     AddWatchlistRequest
 )
-from ...core.agent_wrapper_langgraph import get_agent
+from ...models.stock import StockSymbol
 from ...database import get_database
 from ...cache import get_cache
+from ...services import get_stock_price_service
+from ..news import NEWS_TOPICS
 
-router = APIRouter(prefix="/api/user", tags=["user"])
+router = APIRouter(prefix="/api/user", tags=["user"], default_response_class=ORJSONResponse)
 
+# Everything but the timestamp is fixed: serialize it once and splice the time in per probe
+HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "services": {
+        "database": "available",
+        "cache": "available"
+    }
+})[:-1] + b',"timestamp":"'
+
+# Preferences are read through a per-user Redis entry; every write below invalidates it
+PREFERENCES_CACHE_TTL = 300
+
+
+async def _load_preferences(user_id: str, db, cache) -> Optional[Dict[str, Any]]:
+    """Get user preferences from cache, falling back to the database on a miss."""
+    preferences = await cache.get_user_preferences(user_id)
+    if preferences is None:
+        preferences = await db.get_user_preferences(user_id)
+        if preferences is not None:
+            await cache.set_user_preferences(user_id, preferences, ttl=PREFERENCES_CACHE_TTL)
+    return preferences
 
-@router.get("/preferences", response_model=UserPreferences)
+
+@router.get("/preferences", response_model=UserPreferences, deprecated=True)
 async def get_user_preferences(
     user_id: str = Query(..., description="User ID"),
-    agent=Depends(get_agent),
-    db=Depends(get_database)
+    db=Depends(get_database),
+    cache=Depends(get_cache)
 ):
     """Get user preferences. Returns 404 if user doesn't exist."""
-    try:
-        # Get preferences from database directly
-        preferences = await db.get_user_preferences(user_id)
+    # Get preferences (cached per user)
+    preferences = await _load_preferences(user_id, db, cache)
+
+    # Return 404 if user doesn't exist
+    if preferences is None:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+
+    # Convert to UserPreferences model
+    user_prefs = UserPreferences(
+        preferred_topics=preferences.get("preferred_topics", []),
+        watchlist_stocks=preferences.get("watchlist_stocks", []),
+        voice_settings={
+            "speech_rate": 1.0,
+            "voice_type": "default",
+            "interruption_sensitivity": 0.5,
+            "auto_play": True
+        },
+        notification_settings={
+            "breaking_news": True,
+            "stock_alerts": True,
+            "daily_briefing": True,
+            "email_notifications": False
+        }
+    )
+
+    return user_prefs
 
-        # Return 404 if user doesn't exist
-        if preferences is None:
-            raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-
-        # Convert to UserPreferences model
-        user_prefs = UserPreferences(
-            preferred_topics=preferences.get("preferred_topics", []),
-            watchlist_stocks=preferences.get("watchlist_stocks", []),
-            voice_settings={
-                "speech_rate": 1.0,
-                "voice_type": "default",
-                "interruption_sensitivity": 0.5,
-                "auto_play": True
-            },
-            notification_settings={
-                "breaking_news": True,
-                "stock_alerts": True,
-                "daily_briefing": True,
-                "email_notifications": False
-            }
-        )
-
-        return user_prefs
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting user preferences: {str(e)}")
+
+@router.get("/profile")
+async def get_user_profile(
+    user_id: str = Query(..., description="User ID"),
+    db=Depends(get_database)
+):
+    """Get preferences and voice settings together. Returns 404 if user doesn't exist."""
+    # One joined query instead of /preferences + /settings/voice/{user_id}
+    profile = await db.get_user_profile(user_id)
+
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+
+    return {"user_id": user_id, **profile}
 
 
 @router.put("/preferences")
 async def update_user_preferences(
     user_id: str,
     preferences: UserPreferencesUpdate,
-    agent=Depends(get_agent),
-    db=Depends(get_database)
+    db=Depends(get_database),
+    cache=Depends(get_cache)
 ):
     """Update user preferences."""
-    try:
-        # Convert to dictionary
-        prefs_dict = {}
-        if preferences.preferred_topics is not None:
-            prefs_dict["preferred_topics"] = preferences.preferred_topics
-        if preferences.watchlist_stocks is not None:
-            prefs_dict["watchlist_stocks"] = preferences.watchlist_stocks
-        if preferences.voice_settings is not None:
-            prefs_dict["voice_settings"] = preferences.voice_settings
-        if preferences.notification_settings is not None:
-            prefs_dict["notification_settings"] = preferences.notification_settings
-        
-        # Update preferences through agent wrapper
-        success = await agent.update_user_preferences(user_id, prefs_dict)
-        
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to update preferences")
-        
-        return {"message": "Preferences updated successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error updating user preferences: {str(e)}")
+    # Only the fields the client actually sent
+    prefs_dict = preferences.model_dump(exclude_unset=True, exclude_none=True)
+    if not prefs_dict:
+        return {"message": "No changes"}
+    
+    # Update preferences in the database
+    success = await db.update_user_preferences(user_id, prefs_dict)
+    
+    if not success:
+        raise HTTPException(status_code=500, detail="Failed to update preferences")
+    
+    await cache.delete_user_preferences(user_id)
+    
+    return {"message": "Preferences updated successfully"}
 
 
 @router.get("/topics")
 async def get_user_topics(
     user_id: str = Query(..., description="User ID"),
-    db=Depends(get_database)
+    db=Depends(get_database),
+    cache=Depends(get_cache)
 ):
     """Get user's preferred topics. Returns 404 if user doesn't exist."""
-    try:
-        # Get preferences from database
-        preferences = await db.get_user_preferences(user_id)
+    # Get preferences (cached per user)
+    preferences = await _load_preferences(user_id, db, cache)
 
-        # Return 404 if user doesn't exist
-        if preferences is None:
-            raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-
-        return {
-            "preferred_topics": preferences.get("preferred_topics", []),
-            "available_topics": [
-                "technology",
-                "finance",
-                "politics",
-                "crypto",
-                "energy",
-                "healthcare",
-                "automotive",
-                "real_estate",
-                "retail",
-                "general"
-            ]
-        }
+    # Return 404 if user doesn't exist
+    if preferences is None:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting user topics: {str(e)}")
+    return ORJSONResponse({
+        "preferred_topics": preferences.get("preferred_topics", []),
+        "available_topics": NEWS_TOPICS
+    })
 
 
 @router.post("/topics/add")
 async def add_user_topic(
     request: AddTopicRequest,
-    agent=Depends(get_agent)
+    db=Depends(get_database),
+    cache=Depends(get_cache)
 ):
     """Add topic to user's preferences."""
-    try:
-        # Get current preferences
-        preferences = await agent.get_user_preferences(request.user_id)
-        current_topics = preferences.get("preferred_topics", [])
-
-        # Add topic if not already present
-        if request.topic not in current_topics:
-            current_topics.append(request.topic)
-
-            # Update preferences
-            success = await agent.update_user_preferences(request.user_id, {
-                "preferred_topics": current_topics
-            })
+    # Single atomic append (no-op if already present) instead of read-modify-write
+    result = await db.mutate_user_array(request.user_id, "preferred_topics", request.topic)
 
-            if not success:
-                raise HTTPException(status_code=500, detail="Failed to add topic")
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"User {request.user_id} not found")
 
-        return {"message": f"Topic '{request.topic}' added successfully", "topics": current_topics}
+    await cache.delete_user_preferences(request.user_id)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error adding topic: {str(e)}")
+    return {"message": f"Topic '{request.topic}' added successfully", "topics": result["items"]}
 
 
 @router.delete("/topics/{topic}")
 async def remove_user_topic(
     user_id: str,
     topic: str,
-    agent=Depends(get_agent)
+    db=Depends(get_database),
+    cache=Depends(get_cache)
 ):
     """Remove topic from user's preferences."""
-    try:
-        # Get current preferences
-        preferences = await agent.get_user_preferences(user_id)
-        current_topics = preferences.get("preferred_topics", [])
-        
-        # Remove topic if present
-        if topic in current_topics:
-            current_topics.remove(topic)
-            
-            # Update preferences
-            success = await agent.update_user_preferences(user_id, {
-                "preferred_topics": current_topics
-            })
-            
-            if not success:
-                raise HTTPException(status_code=500, detail="Failed to remove topic")
-        
-        return {"message": f"Topic '{topic}' removed successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error removing topic: {str(e)}")
+    # Single atomic removal (no-op if absent)
+    result = await db.mutate_user_array(user_id, "preferred_topics", topic, remove=True)
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+
+    await cache.delete_user_preferences(user_id)
+    
+    return {"message": f"Topic '{topic}' removed successfully"}
 
 
 @router.get("/watchlist")
 async def get_user_watchlist(
     user_id: str = Query(..., description="User ID"),
-    db=Depends(get_database)
+    db=Depends(get_database),
+    cache=Depends(get_cache)
 ):
     """Get user's stock watchlist. Returns 404 if user doesn't exist."""
-    try:
-        # Get preferences from database
-        preferences = await db.get_user_preferences(user_id)
-
-        # Return 404 if user doesn't exist
-        if preferences is None:
-            raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+    # Get preferences (cached per user)
+    preferences = await _load_preferences(user_id, db, cache)
 
-        return {
-            "watchlist_stocks": preferences.get("watchlist_stocks", [])
-        }
+    # Return 404 if user doesn't exist
+    if preferences is None:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting user watchlist: {str(e)}")
+    return {
+        "watchlist_stocks": preferences.get("watchlist_stocks", [])
+    }
 
 
 @router.post("/watchlist/add")
 async def add_watchlist_stock(
     request: AddWatchlistRequest,
-    agent=Depends(get_agent)
+    db=Depends(get_database),
+    cache=Depends(get_cache)
 ):
     """
     Add stock to user's watchlist.
@@ -225,84 +205,56 @@ async def add_watchlist_stock(
     1. Immediately fetches the stock price if not in cache/DB
     2. Adds the stock to the background scheduler for automatic updates
     """
-    try:
-        # Get current preferences
-        preferences = await agent.get_user_preferences(request.user_id)
-        current_stocks = preferences.get("watchlist_stocks", [])
-
-        # Add stock if not already present
-        symbol_upper = request.symbol.upper()
-        is_new_stock = symbol_upper not in current_stocks
-
-        if is_new_stock:
-            current_stocks.append(symbol_upper)
+    # Single atomic append; `changed` tells us whether the symbol is new to the watchlist
+    symbol = request.symbol
+    result = await db.mutate_user_array(request.user_id, "watchlist_stocks", symbol)
 
-            # Update preferences
-            success = await agent.update_user_preferences(request.user_id, {
-                "watchlist_stocks": current_stocks
-            })
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"User {request.user_id} not found")
 
-            if not success:
-                raise HTTPException(status_code=500, detail="Failed to add stock")
+    await cache.delete_user_preferences(request.user_id)
 
-            # Immediately fetch stock price and add to scheduler
-            try:
-                from ...services import get_stock_price_service
-                stock_service = await get_stock_price_service()
+    current_stocks = result["items"]
 
-                # Fetch price immediately (this also adds to scheduler if not cached)
-                price_data = await stock_service.get_stock_price(symbol_upper, refresh=False)
+    if result["changed"]:
+        # Immediately fetch stock price and add to scheduler
+        try:
+            stock_service = await get_stock_price_service()
 
-                if price_data:
-                    return {
-                        "message": f"Stock '{symbol_upper}' added to watchlist",
-                        "watchlist": current_stocks,
-                        "price": price_data.get("price"),
-                        "change_percent": price_data.get("change_percent")
-                    }
-            except Exception as e:
-                # Log error but don't fail the request
-                print(f"⚠️ Warning: Could not fetch price for {symbol_upper}: {e}")
+            # Fetch price immediately (this also adds to scheduler if not cached)
+            price_data = await stock_service.get_stock_price(symbol, refresh=False)
 
-        return {"message": f"Stock '{symbol_upper}' added to watchlist", "watchlist": current_stocks}
+            if price_data:
+                return {
+                    "message": f"Stock '{symbol}' added to watchlist",
+                    "watchlist": current_stocks,
+                    "price": price_data.get("price"),
+                    "change_percent": price_data.get("change_percent")
+                }
+        except Exception as e:
+            # Log error but don't fail the request
+            print(f"⚠️ Warning: Could not fetch price for {symbol}: {e}")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error adding stock to watchlist: {str(e)}")
+    return {"message": f"Stock '{symbol}' added to watchlist", "watchlist": current_stocks}
 
 
 @router.delete("/watchlist/{symbol}")
 async def remove_watchlist_stock(
     user_id: str,
-    symbol: str,
-    agent=Depends(get_agent)
+    symbol: StockSymbol,
+    db=Depends(get_database),
+    cache=Depends(get_cache)
 ):
     """Remove stock from user's watchlist."""
-    try:
-        # Get current preferences
-        preferences = await agent.get_user_preferences(user_id)
-        current_stocks = preferences.get("watchlist_stocks", [])
-        
-        # Remove stock if present
-        symbol_upper = symbol.upper()
-        if symbol_upper in current_stocks:
-            current_stocks.remove(symbol_upper)
-            
-            # Update preferences
-            success = await agent.update_user_preferences(user_id, {
-                "watchlist_stocks": current_stocks
-            })
-            
-            if not success:
-                raise HTTPException(status_code=500, detail="Failed to remove stock")
-        
-        return {"message": f"Stock '{symbol_upper}' removed from watchlist"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error removing stock from watchlist: {str(e)}")
+    # Single atomic removal (no-op if absent)
+    result = await db.mutate_user_array(user_id, "watchlist_stocks", symbol, remove=True)
+    
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+
+    await cache.delete_user_preferences(user_id)
+    
+    return {"message": f"Stock '{symbol}' removed from watchlist"}
 
 
 @router.get("/analytics", response_model=UserAnalytics)
@@ -311,35 +263,27 @@ async def get_user_analytics(
     db=Depends(get_database)
 ):
     """Get user analytics."""
-    try:
-        # This would need to be implemented in the database layer
-        # For now, return mock data
-        analytics = UserAnalytics(
-            user_id=user_id,
-            total_interactions=100,
-            successful_interactions=95,
-            average_response_time_ms=1200.0,
-            most_used_topics=["technology", "finance"],
-            most_used_commands=["tell me the news", "stock prices"],
-            session_count=25,
-            total_session_time_minutes=750.0,
-            last_active="2024-01-01T00:00:00Z"
-        )
-        
-        return analytics
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting user analytics: {str(e)}")
+    # This would need to be implemented in the database layer
+    # For now, return mock data
+    analytics = UserAnalytics(
+        user_id=user_id,
+        total_interactions=100,
+        successful_interactions=95,
+        average_response_time_ms=1200.0,
+        most_used_topics=["technology", "finance"],
+        most_used_commands=["tell me the news", "stock prices"],
+        session_count=25,
+        total_session_time_minutes=750.0,
+        last_active="2024-01-01T00:00:00Z"
+    )
+    
+    return analytics
 
 
 @router.get("/health")
-async def user_health_check():
+async def user_health_check() -> Response:
     """Health check for user services."""
-    return {
-        "status": "healthy",
-        "services": {
-            "database": "available",
-            "cache": "available"
-        },
-        "timestamp": "2024-01-01T00:00:00Z"
-    }
+    return Response(
+        HEALTH_PREFIX + datetime.utcnow().isoformat().encode() + b'Z"}',
+        media_type="application/json"
+    )
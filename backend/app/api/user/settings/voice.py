@@ -1,7 +1,8 @@
 """Voice settings API endpoints."""
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional
-import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
+from typing import Dict, Optional
+import time
 from ....models.voice_settings import (
     VoiceSettings,
     VoiceSettingsCreate,
@@ -10,12 +11,24 @@ from ....models.voice_settings import (
     VoiceSettingsPresets
 )
 from ....database import get_database
+from ....utils.http_cache import STATIC_CACHE_CONTROL, precompute_json, cached_json_response
 
-router = APIRouter(prefix="/api/user/settings/voice", tags=["user-settings", "voice"])
+router = APIRouter(prefix="/api/user/settings/voice", tags=["user-settings", "voice"], default_response_class=ORJSONResponse)
+
+# Voice sessions touch last_used_at on every chunk; write it at most once per window per user
+LAST_USED_DEBOUNCE_SECONDS = 30
+# Above this many tracked users, entries older than the window are pruned
+LAST_USED_MAX_TRACKED = 10_000
+
+# user_id -> monotonic time of the last accepted touch
+_LAST_TOUCH: Dict[str, float] = {}
+
+# Presets are static; built and serialized once at import time
+PRESETS_JSON, PRESETS_ETAG = precompute_json(VoiceSettingsPresets().model_dump(mode="json"))
 
 
 @router.get("/presets", response_model=VoiceSettingsPresets)
-async def get_voice_settings_presets():
+async def get_voice_settings_presets(request: Request) -> Response:
     """
     Get voice settings presets and voice type descriptions.
 
@@ -26,10 +39,12 @@ async def get_voice_settings_presets():
     - quiet_environment: High sensitivity for quiet speech
     - noisy_environment: Low sensitivity to avoid false positives
     """
-    return VoiceSettingsPresets()
+    response = cached_json_response(request, PRESETS_JSON, PRESETS_ETAG, STATIC_CACHE_CONTROL)
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
 
 
-@router.get("/{user_id}", response_model=VoiceSettingsResponse)
+@router.get("/{user_id}", response_model=VoiceSettingsResponse, deprecated=True)
 async def get_voice_settings(
     user_id: str,
     db=Depends(get_database)
@@ -39,49 +54,41 @@ async def get_voice_settings(
 
     Returns 404 if user has no voice settings configured.
     Returns default settings if user exists but hasn't customized voice settings.
-    """
-    try:
-        # Query database for voice settings (wrap sync client in async)
-        def _fetch():
-            return db.client.table("user_voice_settings")\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .maybe_single()\
-                .execute()
-
-        result = await asyncio.to_thread(_fetch)
-
-        if not result.data:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Voice settings not found for user {user_id}"
-            )
-
-        settings = result.data
-
-        # Convert to response model
-        return VoiceSettingsResponse(
-            user_id=settings["user_id"],
-            voice_type=settings["voice_type"],
-            speech_rate=float(settings["speech_rate"]),
-            vad_sensitivity=settings["vad_sensitivity"],
-            vad_aggressiveness=settings["vad_aggressiveness"],
-            interruption_enabled=settings["interruption_enabled"],
-            interruption_threshold=float(settings["interruption_threshold"]),
-            use_audio_compression=settings["use_audio_compression"],
-            auto_play_responses=settings["auto_play_responses"],
-            updated_at=settings["updated_at"],
-            last_used_at=settings.get("last_used_at")
-        )
 
-    except HTTPException:
-        raise
-    except Exception as e:
+    Deprecated: use GET /api/user/profile, which returns preferences and voice
+    settings in one request.
+    """
+    # Query database for voice settings (async client, runs on the event loop)
+    result = await db.async_client.table("user_voice_settings")\
+        .select("*")\
+        .eq("user_id", user_id)\
+        .maybe_single()\
+        .execute()
+
+    # maybe_single() yields no response at all when the row is missing
+    if not result or not result.data:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error retrieving voice settings: {str(e)}"
+            status_code=404,
+            detail=f"Voice settings not found for user {user_id}"
         )
 
+    settings = result.data
+
+    # Convert to response model
+    return VoiceSettingsResponse(
+        user_id=settings["user_id"],
+        voice_type=settings["voice_type"],
+        speech_rate=float(settings["speech_rate"]),
+        vad_sensitivity=settings["vad_sensitivity"],
+        vad_aggressiveness=settings["vad_aggressiveness"],
+        interruption_enabled=settings["interruption_enabled"],
+        interruption_threshold=float(settings["interruption_threshold"]),
+        use_audio_compression=settings["use_audio_compression"],
+        auto_play_responses=settings["auto_play_responses"],
+        updated_at=settings["updated_at"],
+        last_used_at=settings.get("last_used_at")
+    )
+
 
 @router.post("/{user_id}", response_model=VoiceSettingsResponse, status_code=201)
 async def create_or_update_voice_settings(
@@ -95,53 +102,40 @@ async def create_or_update_voice_settings(
     If user already has settings, updates only the provided fields.
     If user has no settings, creates new record with provided values + defaults.
     """
-    try:
-        # Prepare settings data
-        settings_data = {
-            "user_id": user_id,
-            **settings.model_dump(exclude_unset=True, exclude_none=True)
-        }
-
-        # Upsert to database (insert or update if user_id exists)
-        def _upsert():
-            return db.client.table("user_voice_settings")\
-                .upsert(settings_data, on_conflict="user_id")\
-                .select("*")\
-                .execute()
-
-        result = await asyncio.to_thread(_upsert)
-
-        if not result.data or len(result.data) == 0:
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to create/update voice settings"
-            )
-
-        created_settings = result.data[0]
-
-        # Return response
-        return VoiceSettingsResponse(
-            user_id=created_settings["user_id"],
-            voice_type=created_settings["voice_type"],
-            speech_rate=float(created_settings["speech_rate"]),
-            vad_sensitivity=created_settings["vad_sensitivity"],
-            vad_aggressiveness=created_settings["vad_aggressiveness"],
-            interruption_enabled=created_settings["interruption_enabled"],
-            interruption_threshold=float(created_settings["interruption_threshold"]),
-            use_audio_compression=created_settings["use_audio_compression"],
-            auto_play_responses=created_settings["auto_play_responses"],
-            updated_at=created_settings["updated_at"],
-            last_used_at=created_settings.get("last_used_at")
-        )
-
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Prepare settings data
+    settings_data = {
+        "user_id": user_id,
+        **settings.model_dump(exclude_unset=True, exclude_none=True)
+    }
+
+    # Upsert to database (insert or update if user_id exists); the row is returned by default
+    result = await db.async_client.table("user_voice_settings")\
+        .upsert(settings_data, on_conflict="user_id")\
+        .execute()
+
+    if not result.data or len(result.data) == 0:
         raise HTTPException(
             status_code=500,
-            detail=f"Error creating/updating voice settings: {str(e)}"
+            detail="Failed to create/update voice settings"
         )
 
+    created_settings = result.data[0]
+
+    # Return response
+    return VoiceSettingsResponse(
+        user_id=created_settings["user_id"],
+        voice_type=created_settings["voice_type"],
+        speech_rate=float(created_settings["speech_rate"]),
+        vad_sensitivity=created_settings["vad_sensitivity"],
+        vad_aggressiveness=created_settings["vad_aggressiveness"],
+        interruption_enabled=created_settings["interruption_enabled"],
+        interruption_threshold=float(created_settings["interruption_threshold"]),
+        use_audio_compression=created_settings["use_audio_compression"],
+        auto_play_responses=created_settings["auto_play_responses"],
+        updated_at=created_settings["updated_at"],
+        last_used_at=created_settings.get("last_used_at")
+    )
+
 
 @router.delete("/{user_id}", status_code=204)
 async def delete_voice_settings(
@@ -154,23 +148,13 @@ async def delete_voice_settings(
     User will get default settings on next access.
     Returns 204 No Content on success.
     """
-    try:
-        def _delete():
-            return db.client.table("user_voice_settings")\
-                .delete()\
-                .eq("user_id", user_id)\
-                .execute()
+    await db.async_client.table("user_voice_settings")\
+        .delete()\
+        .eq("user_id", user_id)\
+        .execute()
 
-        result = await asyncio.to_thread(_delete)
-
-        # Supabase delete doesn't error if no rows match, so we're good
-        return None
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error deleting voice settings: {str(e)}"
-        )
+    # Supabase delete doesn't error if no rows match, so we're good
+    return None
 
 
 @router.patch("/{user_id}/last-used", status_code=204)
@@ -183,30 +167,36 @@ async def update_last_used(
 
     Called when user starts a voice session to track active usage.
     Returns 204 No Content on success.
-    """
-    try:
-        from datetime import datetime
-
-        def _update():
-            return db.client.table("user_voice_settings")\
-                .update({"last_used_at": datetime.utcnow().isoformat()})\
-                .eq("user_id", user_id)\
-                .execute()
-
-        result = await asyncio.to_thread(_update)
-
-        if not result.data or len(result.data) == 0:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Voice settings not found for user {user_id}"
-            )
 
+    The timestamp comes from the `touch_voice_settings_last_used` RPC (database/functions.sql).
+    Repeat calls within LAST_USED_DEBOUNCE_SECONDS of an accepted touch are
+    answered without a database write.
+    """
+    now = time.monotonic()
+    if now - _LAST_TOUCH.get(user_id, float("-inf")) < LAST_USED_DEBOUNCE_SECONDS:
         return None
 
-    except HTTPException:
+    # Claimed before awaiting so concurrent calls for the same user coalesce into this write
+    _LAST_TOUCH[user_id] = now
+    if len(_LAST_TOUCH) > LAST_USED_MAX_TRACKED:
+        for uid, touched in list(_LAST_TOUCH.items()):
+            if now - touched >= LAST_USED_DEBOUNCE_SECONDS:
+                del _LAST_TOUCH[uid]
+
+    try:
+        result = await db.async_client.rpc(
+            "touch_voice_settings_last_used", {"uid": user_id}
+        ).execute()
+    except Exception:
+        _LAST_TOUCH.pop(user_id, None)
         raise
-    except Exception as e:
+
+    if not result.data:
+        # Nothing was touched, so don't debounce the next attempt
+        _LAST_TOUCH.pop(user_id, None)
         raise HTTPException(
-            status_code=500,
-            detail=f"Error updating last used timestamp: {str(e)}"
+            status_code=404,
+            detail=f"Voice settings not found for user {user_id}"
         )
+
+    return None
@@ -1,10 +1,11 @@
 """API v1 router for Stock & News endpoints."""
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from .stocks import router as stocks_router
 from .stock_news import router as stock_news_router
 
-# Create v1 API router
-api_v1_router = APIRouter()
+# Create v1 API router (owns the /api/v1 prefix, so main includes it as-is)
+api_v1_router = APIRouter(prefix="/api/v1", tags=["v1"], default_response_class=ORJSONResponse)
 
 # Include all sub-routers
 api_v1_router.include_router(stocks_router, tags=["stocks"])
@@ -1,22 +1,45 @@
 """Stock prices API endpoints."""
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Optional
 import time
 from datetime import datetime
+import orjson
 
 from ...models.stock import (
     StockPriceResponse,
     StockPriceBatchRequest,
-    StockPriceBatchResponse
+    StockPriceBatchResponse,
+    StockSymbol
 )
 from ...services import get_stock_price_service
+from ...utils.http_cache import EDGE_CACHE_CONTROL, set_cache_headers
 
-router = APIRouter(prefix="/stocks")
+router = APIRouter(prefix="/stocks", default_response_class=ORJSONResponse)
+
+# Optional StockPriceResponse fields copied as-is from service price records
+OPTIONAL_PRICE_FIELDS = ("change", "change_percent", "volume", "market_cap", "high_52_week", "low_52_week")
+
+
+def _price_payload(price_data: Dict[str, Any], symbol: str, now: datetime) -> Dict[str, Any]:
+    """Map a service price record onto StockPriceResponse fields.
+
+    Returned as a plain dict so FastAPI validates it once against the response
+    model, instead of building a model here and re-validating it on the way out.
+    """
+    payload = {field: price_data.get(field) for field in OPTIONAL_PRICE_FIELDS}
+    payload["symbol"] = price_data.get("symbol", symbol)
+    payload["price"] = price_data.get("price", 0.0)
+    payload["last_updated"] = price_data.get("last_updated") or now
+    payload["source"] = price_data.get("source", "unknown")
+    payload["cache_hit"] = price_data.get("cache_hit", False)
+    return payload
 
 
 @router.get("/{symbol}/price", response_model=StockPriceResponse)
 async def get_stock_price(
-    symbol: str,
+    symbol: StockSymbol,
+    response: Response,
     refresh: bool = Query(False, description="Force cache refresh")
 ):
     """
@@ -27,38 +50,21 @@ async def get_stock_price(
 
     Returns current price with cache metadata.
     """
-    try:
-        service = await get_stock_price_service()
-        price_data = await service.get_stock_price(symbol.upper(), refresh=refresh)
-
-        if not price_data:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Stock price not found for symbol: {symbol}"
-            )
-
-        return StockPriceResponse(
-            symbol=price_data.get("symbol", symbol.upper()),
-            price=price_data.get("price", 0.0),
-            change=price_data.get("change"),
-            change_percent=price_data.get("change_percent"),
-            volume=price_data.get("volume"),
-            market_cap=price_data.get("market_cap"),
-            high_52_week=price_data.get("high_52_week"),
-            low_52_week=price_data.get("low_52_week"),
-            last_updated=price_data.get("last_updated", datetime.now()),
-            source=price_data.get("source", "unknown"),
-            cache_hit=price_data.get("cache_hit", False)
-        )
+    service = await get_stock_price_service()
+    price_data = await service.get_stock_price(symbol, refresh=refresh)
 
-    except HTTPException:
-        raise
-    except Exception as e:
+    if not price_data:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching stock price: {str(e)}"
+            status_code=404,
+            detail=f"Stock price not found for symbol: {symbol}"
         )
 
+    # Forced refreshes must reach the app, so only the default read is edge-cacheable
+    if not refresh:
+        set_cache_headers(response, EDGE_CACHE_CONTROL)
+
+    return _price_payload(price_data, symbol, datetime.now())
+
 
 @router.post("/prices/batch", response_model=StockPriceBatchResponse)
 async def get_batch_prices(request: StockPriceBatchRequest):
@@ -70,88 +76,103 @@ async def get_batch_prices(request: StockPriceBatchRequest):
 
     Returns batch response with cache statistics.
     """
-    try:
-        start_time = time.time()
-        service = await get_stock_price_service()
-
-        # Get prices for all symbols
-        results = await service.get_multiple_prices(
-            request.symbols,
-            refresh=request.refresh
-        )
+    start_time = time.time()
+    service = await get_stock_price_service()
+
+    # Get prices for all symbols
+    results = await service.get_multiple_prices(
+        request.symbols,
+        refresh=request.refresh
+    )
+
+    # Format responses and count cache hits
+    now = datetime.now()
+    prices = [
+        _price_payload(price_data, symbol, now)
+        for symbol, price_data in results.items()
+        if price_data
+    ]
+    cache_hits = sum(1 for price in prices if price["cache_hit"])
+
+    processing_time_ms = int((time.time() - start_time) * 1000)
+
+    return {
+        "prices": prices,
+        "total_count": len(prices),
+        "cache_hits": cache_hits,
+        "cache_misses": len(prices) - cache_hits,
+        "processing_time_ms": processing_time_ms,
+        "timestamp": now
+    }
+
+
+@router.post("/prices/batch/stream")
+async def stream_batch_prices(request: StockPriceBatchRequest):
+    """
+    Stream prices for multiple stocks as newline-delimited JSON.
 
-        # Format responses and count cache hits
-        prices = []
-        cache_hits = 0
-        cache_misses = 0
+    - **symbols**: List of stock ticker symbols (1-50)
+    - **refresh**: Force cache refresh for all symbols
 
-        for symbol, price_data in results.items():
+    Each line is one StockPriceResponse object, written as soon as that
+    symbol's lookup finishes (fastest first). Symbols with no price are omitted.
+    """
+    service = await get_stock_price_service()
+
+    async def generate() -> AsyncIterator[bytes]:
+        async for symbol, price_data in service.iter_multiple_prices(request.symbols, refresh=request.refresh):
             if price_data:
-                prices.append(
-                    StockPriceResponse(
-                        symbol=price_data.get("symbol", symbol),
-                        price=price_data.get("price", 0.0),
-                        change=price_data.get("change"),
-                        change_percent=price_data.get("change_percent"),
-                        volume=price_data.get("volume"),
-                        market_cap=price_data.get("market_cap"),
-                        high_52_week=price_data.get("high_52_week"),
-                        low_52_week=price_data.get("low_52_week"),
-                        last_updated=price_data.get("last_updated", datetime.now()),
-                        source=price_data.get("source", "unknown"),
-                        cache_hit=price_data.get("cache_hit", False)
-                    )
-                )
-
-                if price_data.get("cache_hit"):
-                    cache_hits += 1
-                else:
-                    cache_misses += 1
-
-        processing_time_ms = int((time.time() - start_time) * 1000)
-
-        return StockPriceBatchResponse(
-            prices=prices,
-            total_count=len(prices),
-            cache_hits=cache_hits,
-            cache_misses=cache_misses,
-            processing_time_ms=processing_time_ms,
-            timestamp=datetime.now()
-        )
+                yield orjson.dumps(_price_payload(price_data, symbol, datetime.now())) + b"\n"
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching batch prices: {str(e)}"
-        )
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get("/{symbol}/history")
 async def get_price_history(
-    symbol: str,
-    limit: int = Query(100, ge=1, le=1000, description="Number of historical records")
+    symbol: StockSymbol,
+    limit: int = Query(100, ge=1, le=1000, description="Number of historical records"),
+    before_ts: Optional[datetime] = Query(None, description="Return records older than this (next_before of the previous page)"),
+    before_id: Optional[str] = Query(None, description="next_before_id of the previous page; pass together with before_ts")
 ):
     """
     Get historical price data for a symbol.
 
     - **symbol**: Stock ticker symbol
     - **limit**: Number of records to return (1-1000, default: 100)
+    - **before_ts**: Keyset cursor; pass the previous page's `next_before` to continue
+    - **before_id**: Pass the previous page's `next_before_id` alongside `before_ts`
 
-    Returns historical price data from database.
+    Returns historical price data from database, streamed as rows are fetched.
+    `next_before` is null once there are no older records. If the database fails
+    mid-stream the document ends with `"partial": true` and an `error`, and
+    `next_before`/`next_before_id` point at the last row sent so the client can resume.
     """
-    try:
-        service = await get_stock_price_service()
-        history = await service.get_price_history(symbol.upper(), limit=limit)
-
-        return {
-            "symbol": symbol.upper(),
-            "history": history,
-            "count": len(history),
-            "limit": limit
-        }
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error fetching price history: {str(e)}"
+    service = await get_stock_price_service()
+
+    async def stream_history() -> AsyncIterator[bytes]:
+        count = 0
+        oldest, oldest_id = (before_ts.isoformat() if before_ts else None), before_id
+        error = None
+        yield b'{"symbol":' + orjson.dumps(symbol) + b',"history":['
+        try:
+            async for row in service.iter_price_history(symbol, limit=limit, before=before_ts, before_id=before_id):
+                yield (b"," if count else b"") + orjson.dumps(row)
+                count += 1
+                oldest, oldest_id = row.get("last_updated"), row.get("id")
+        except Exception as e:
+            # Headers are already sent, so the failure has to go in the body
+            print(f"❌ Price history for {symbol} cut off after {count} rows: {e}")
+            error = "history fetch failed"
+        if error is None and count < limit:
+            oldest, oldest_id = None, None
+        tail = (
+            b'],"count":' + orjson.dumps(count)
+            + b',"limit":' + orjson.dumps(limit)
+            + b',"next_before":' + orjson.dumps(oldest)
+            + b',"next_before_id":' + orjson.dumps(oldest_id)
         )
+        if error is not None:
+            tail += b',"partial":true,"error":' + orjson.dumps(error)
+        yield tail + b"}"
+
+    return StreamingResponse(stream_history(), media_type="application/json")
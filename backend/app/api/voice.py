@@ -1,13 +1,18 @@
 """Voice API endpoints for text and voice commands."""
-from fastapi import APIRouter, HTTPException, Depends
+import time
+import orjson
+import xxhash
+from fastapi import APIRouter, HTTPException, Depends, Response
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any, Optional
 from datetime import datetime
 from ..models.voice import VoiceCommandRequest, VoiceCommandResponse, VoiceSynthesis, VoiceSynthesisResponse
 from ..core.agent_wrapper_langgraph import get_agent
+from ..core.single_flight import single_flight
 from ..database import get_database
 from ..cache import get_cache
 
-router = APIRouter(prefix="/api/voice", tags=["voice"])
+router = APIRouter(prefix="/api/voice", tags=["voice"], default_response_class=ORJSONResponse)
 
 
 @router.post("/command", response_model=VoiceCommandResponse)
@@ -19,7 +24,8 @@ async def process_voice_command(
     """Process voice command (text input for iOS ASR integration)."""
     try:
         # Process the command through the agent
-        result = await agent.process_voice_command(
+        result = await single_flight.submit(
+            agent.process_voice_command,
             command=request.command,
             user_id=request.user_id,
             session_id=request.session_id,
@@ -50,7 +56,8 @@ async def process_text_command(
     """Process text command (alternative endpoint for text input)."""
     try:
         # Process the command through the agent
-        result = await agent.process_text_command(
+        result = await single_flight.submit(
+            agent.process_text_command,
             query=request.command,
             user_id=request.user_id,
             session_id=request.session_id
@@ -74,20 +81,29 @@ async def process_text_command(
 @router.post("/synthesize", response_model=VoiceSynthesisResponse)
 async def synthesize_speech(
     request: VoiceSynthesis,
-    agent=Depends(get_agent)
+    cache=Depends(get_cache)
 ):
     """Synthesize text to speech."""
     try:
-        # For now, return a mock response
-        # In a full implementation, you would use Edge-TTS or similar
-        
+        start = time.perf_counter()
+
+        # Stable across processes (unlike hash()), and covers every option that changes the audio
+        text_hash = xxhash.xxh3_128_hexdigest(orjson.dumps(
+            [request.text, request.rate, request.pitch, request.volume, request.format]
+        ))
+        audio_url = await cache.get_tts_audio(text_hash, request.voice)
+        if audio_url is None:
+            # For now, return a mock response
+            # In a full implementation, you would use Edge-TTS or similar
+            audio_url = f"https://example.com/audio/{text_hash}.{request.format}"
+            await cache.set_tts_audio(text_hash, request.voice, audio_url, ttl=3600)
+
         return VoiceSynthesisResponse(
-            audio_url=f"https://example.com/audio/{hash(request.text)}.mp3",
+            audio_url=audio_url,
             audio_duration_ms=len(request.text) * 50,  # Rough estimate
-            processing_time_ms=500,
+            processing_time_ms=int((time.perf_counter() - start) * 1000),
             text_length=len(request.text),
-            voice=request.voice,
-            timestamp=request.timestamp
+            voice=request.voice
         )
         
     except Exception as e:
@@ -109,15 +125,21 @@ async def update_watchlist(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating watchlist: {str(e)}")
 
+# Everything but the timestamp is fixed: serialize it once and splice the time in per probe
+HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "services": {
+        "agent": "available",
+        "tts": "available",
+        "asr": "available"
+    }
+})[:-1] + b',"timestamp":"'
+
+
 @router.get("/health")
-async def voice_health_check():
+async def voice_health_check() -> Response:
     """Health check for voice services."""
-    return {
-        "status": "healthy",
-        "services": {
-            "agent": "available",
-            "tts": "available",
-            "asr": "available"
-        },
-        "timestamp": "2024-01-01T00:00:00Z"
-    }
+    return Response(
+        HEALTH_PREFIX + datetime.utcnow().isoformat().encode() + b'Z"}',
+        media_type="application/json"
+    )
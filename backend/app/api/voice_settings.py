@@ -4,15 +4,22 @@ Voice Settings API
 Endpoints for managing voice configuration (VAD, compression, TTS settings)
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 from datetime import datetime
 
 from ..models.voice import VoiceSettings
 from ..database import get_database
 from ..cache import get_cache
+from ..utils.http_cache import STATIC_CACHE_CONTROL, precompute_json, cached_json_response
 
-router = APIRouter(prefix="/api/voice-settings", tags=["voice-settings"])
+router = APIRouter(prefix="/api/voice-settings", tags=["voice-settings"], default_response_class=ORJSONResponse)
+
+# Users without saved settings all get the same defaults; build and dump them once
+DEFAULT_SETTINGS = VoiceSettings()
+DEFAULT_SETTINGS_JSON = DEFAULT_SETTINGS.model_dump(mode="json")
 
 
 @router.get("/{user_id}", response_model=VoiceSettings)
@@ -30,27 +37,32 @@ async def get_voice_settings(user_id: str):
         cached_settings = await cache.get(cache_key)
 
         if cached_settings:
-            return VoiceSettings.model_validate_json(cached_settings)
+            # Entries written before values were stored as objects are JSON strings
+            if isinstance(cached_settings, str):
+                return VoiceSettings.model_validate_json(cached_settings)
+            # The dict was dumped from an already-validated model, so skip re-validating it
+            return VoiceSettings.model_construct(**cached_settings)
 
         # Try to get from database
         db = await get_database()
         settings_data = await db.get_voice_settings(user_id)
 
-        if settings_data:
-            settings = VoiceSettings(**settings_data)
-        else:
+        if not settings_data:
             # Return defaults
-            settings = VoiceSettings()
+            await cache.set(cache_key, DEFAULT_SETTINGS_JSON, ttl=3600)
+            return DEFAULT_SETTINGS
+
+        settings = VoiceSettings(**settings_data)
 
-        # Cache for 1 hour
-        await cache.set(cache_key, settings.model_dump_json(), ttl=3600)
+        # Cache for 1 hour (stored as a JSON object, not a JSON-encoded string)
+        await cache.set(cache_key, settings.model_dump(mode="json"), ttl=3600)
 
         return settings
 
     except Exception as e:
         # On error, return defaults
         print(f"Error getting voice settings: {e}")
-        return VoiceSettings()
+        return DEFAULT_SETTINGS
 
 
 @router.put("/{user_id}", response_model=VoiceSettings)
@@ -72,11 +84,20 @@ async def update_voice_settings(
         settings_data['user_id'] = user_id
         settings_data['updated_at'] = datetime.now().isoformat()
 
-        await db.save_voice_settings(user_id, settings_data)
-
-        # Update cache
+        # The cache write doesn't depend on the DB write, so run them together
         cache_key = f"voice_settings:{user_id}"
-        await cache.set(cache_key, settings.model_dump_json(), ttl=3600)
+        saved, cached = await asyncio.gather(
+            db.save_voice_settings(user_id, settings_data),
+            cache.set(cache_key, settings.model_dump(mode="json"), ttl=3600),
+            return_exceptions=True
+        )
+
+        if isinstance(cached, Exception):
+            print(f"Error caching voice settings: {cached}")
+        if isinstance(saved, Exception):
+            # Don't serve settings from cache that never reached the database
+            await cache.delete(cache_key)
+            raise saved
 
         return settings
 
@@ -94,12 +115,17 @@ async def reset_voice_settings(user_id: str):
         cache = await get_cache()
         db = await get_database()
 
-        # Delete from database
-        await db.delete_voice_settings(user_id)
+        # Delete the row and the cached copy concurrently
+        deleted, uncached = await asyncio.gather(
+            db.delete_voice_settings(user_id),
+            cache.delete(f"voice_settings:{user_id}"),
+            return_exceptions=True
+        )
 
-        # Clear cache
-        cache_key = f"voice_settings:{user_id}"
-        await cache.delete(cache_key)
+        if isinstance(uncached, Exception):
+            print(f"Error dropping cached voice settings: {uncached}")
+        if isinstance(deleted, Exception):
+            raise deleted
 
         return {"message": "Voice settings reset to defaults"}
 
@@ -108,61 +134,71 @@ async def reset_voice_settings(user_id: str):
         raise HTTPException(status_code=500, detail="Failed to reset voice settings")
 
 
-@router.get("/{user_id}/presets", response_model=dict)
-async def get_vad_presets():
-    """
-    Get VAD configuration presets.
-    """
-    return {
-        "sensitive": {
-            "vad_threshold": 0.01,
-            "silence_timeout_ms": 500,
-            "backend_vad_mode": 0,
-            "backend_energy_threshold": 200.0,
-            "description": "Very sensitive - picks up soft speech, may detect noise"
-        },
-        "balanced": {
-            "vad_threshold": 0.02,
-            "silence_timeout_ms": 700,
-            "backend_vad_mode": 2,
-            "backend_energy_threshold": 500.0,
-            "description": "Balanced - good for most environments"
+# VAD presets and compression notes only change with a deploy, so serialize them once
+VAD_PRESETS_JSON, VAD_PRESETS_ETAG = precompute_json({
+    "sensitive": {
+        "vad_threshold": 0.01,
+        "silence_timeout_ms": 500,
+        "backend_vad_mode": 0,
+        "backend_energy_threshold": 200.0,
+        "description": "Very sensitive - picks up soft speech, may detect noise"
+    },
+    "balanced": {
+        "vad_threshold": 0.02,
+        "silence_timeout_ms": 700,
+        "backend_vad_mode": 2,
+        "backend_energy_threshold": 500.0,
+        "description": "Balanced - good for most environments"
+    },
+    "strict": {
+        "vad_threshold": 0.03,
+        "silence_timeout_ms": 1000,
+        "backend_vad_mode": 3,
+        "backend_energy_threshold": 800.0,
+        "description": "Strict - filters noise, requires clear speech"
+    }
+})
+
+COMPRESSION_INFO_JSON, COMPRESSION_INFO_ETAG = precompute_json({
+    "formats": {
+        "wav": {
+            "compression": False,
+            "file_size_3s": "94 KB",
+            "quality": "Lossless",
+            "description": "Uncompressed PCM audio"
         },
-        "strict": {
-            "vad_threshold": 0.03,
-            "silence_timeout_ms": 1000,
-            "backend_vad_mode": 3,
-            "backend_energy_threshold": 800.0,
-            "description": "Strict - filters noise, requires clear speech"
+        "opus": {
+            "compression": True,
+            "file_size_3s": "18 KB",
+            "quality": "High (64 kbps)",
+            "description": "Opus codec - optimized for speech",
+            "compression_ratio": "5x smaller"
         }
+    },
+    "recommendations": {
+        "slow_connection": "opus",
+        "fast_connection": "wav",
+        "mobile": "opus",
+        "desktop": "wav"
     }
+})
 
 
-@router.get("/{user_id}/compression-info", response_model=dict)
-async def get_compression_info():
+@router.get("/{user_id}/presets")
+async def get_vad_presets(user_id: str, request: Request) -> Response:
+    """
+    Get VAD configuration presets.
+    """
+    response = cached_json_response(request, VAD_PRESETS_JSON, VAD_PRESETS_ETAG, STATIC_CACHE_CONTROL)
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+@router.get("/{user_id}/compression-info")
+async def get_compression_info(user_id: str, request: Request) -> Response:
     """
     Get audio compression information and file size estimates.
     """
-    return {
-        "formats": {
-            "wav": {
-                "compression": False,
-                "file_size_3s": "94 KB",
-                "quality": "Lossless",
-                "description": "Uncompressed PCM audio"
-            },
-            "opus": {
-                "compression": True,
-                "file_size_3s": "18 KB",
-                "quality": "High (64 kbps)",
-                "description": "Opus codec - optimized for speech",
-                "compression_ratio": "5x smaller"
-            }
-        },
-        "recommendations": {
-            "slow_connection": "opus",
-            "fast_connection": "wav",
-            "mobile": "opus",
-            "desktop": "wav"
-        }
-    }
+    response = cached_json_response(request, COMPRESSION_INFO_JSON, COMPRESSION_INFO_ETAG, STATIC_CACHE_CONTROL)
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
@@ -1,10 +1,14 @@
 """WebSocket endpoint with full audio pipeline."""
+import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
 from ..core.websocket_manager_v2 import get_audio_ws_manager
 from ..core.streaming_handler import get_streaming_handler
 from ..core.agent_wrapper_langgraph import get_agent
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+logger = logging.getLogger("voice_news_agent.ws")
 
 
 @router.websocket("/ws/voice/simple")
@@ -15,7 +19,7 @@ async def websocket_audio_endpoint(websocket: WebSocket):
     try:
         # Step 1: Accept connection
         await websocket.accept()
-        print("✅ [ACCEPT] WebSocket connection accepted")
+        logger.debug("✅ [ACCEPT] WebSocket connection accepted")
         
         # Step 2: Get dependencies
         manager = get_audio_ws_manager()
@@ -24,38 +28,42 @@ async def websocket_audio_endpoint(websocket: WebSocket):
         
         # Inject handlers into manager
         manager.set_handlers(streaming_handler, agent)
-        print("✅ [SETUP] Handlers injected into manager")
+        logger.debug("✅ [SETUP] Handlers injected into manager")
         
         # Step 3: Get user ID
         user_id = websocket.query_params.get("user_id", "anonymous")
         
         # Step 4: Register connection
         session_id = await manager.connect(websocket, user_id)
-        print(f"✅ [REGISTER] Connection registered: {session_id[:8]}...")
+        logger.debug(f"✅ [REGISTER] Connection registered: {session_id[:8]}...")
         
         # Step 5: Message loop
-        print(f"🔄 [LOOP] Starting message loop for session={session_id[:8]}...")
+        logger.debug(f"🔄 [LOOP] Starting message loop for session={session_id[:8]}...")
         while True:
             try:
-                message = await websocket.receive_text()
-                await manager.handle_message(session_id, message)
+                # receive() hands over the raw frame, so binary audio is never UTF-8 decoded
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                if message.get("bytes") is not None:
+                    await manager.handle_binary(session_id, message["bytes"])
+                else:
+                    await manager.handle_message(session_id, message["text"])
                 
             except WebSocketDisconnect:
-                print(f"🔌 [DISCONNECT] Client closed connection: {session_id[:8]}...")
+                logger.debug(f"🔌 [DISCONNECT] Client closed connection: {session_id[:8]}...")
                 break
             except Exception as e:
-                print(f"❌ [LOOP ERROR] session={session_id[:8]}...: {e}")
+                logger.exception(f"❌ [LOOP ERROR] session={session_id[:8]}...: {e}")
                 break
     
     except Exception as e:
-        print(f"❌ [ENDPOINT ERROR]: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ [ENDPOINT ERROR]: {e}")
     
     finally:
         if session_id:
             await manager.disconnect(session_id)
-            print(f"🧹 [CLEANUP] Session cleaned up: {session_id[:8]}...")
+            logger.debug(f"🧹 [CLEANUP] Session cleaned up: {session_id[:8]}...")
 
 
 @router.get("/ws/status/audio")
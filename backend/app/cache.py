@@ -1,168 +1,380 @@
 """Cache management for Upstash Redis."""
-import json
-import hashlib
 import asyncio
-from typing import Optional, Any, Dict, List
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional, Any, Dict, List, AsyncIterator
 import httpx
+import orjson
+import redis.asyncio as redis
+import xxhash
 from .config import get_settings
 
 settings = get_settings()
 
+logger = logging.getLogger("voice_news_agent.cache")
+
+# Read-mostly keys also kept in a process-local L1 in front of Redis. The TTL
+# is short because other workers cannot invalidate this process's copy.
+L1_PREFIXES = ("voice_settings:", "user:preferences:", "user:watchlist:")
+L1_TTL_SECONDS = 5
+L1_MAX_KEYS = 10_000
+
+# Keep REST connections (and their TLS sessions) warm between requests
+REST_CONNECTION_LIMITS = httpx.Limits(
+    max_keepalive_connections=50,
+    max_connections=200,
+    keepalive_expiry=60
+)
+
+
+def _encode(value: Any) -> str:
+    """Serialize a cache value to JSON text."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class LocalTTLCache:
+    """Bounded in-process LRU whose entries expire after a fixed TTL.
+
+    Holds the raw JSON text so every hit decodes a fresh copy and callers
+    cannot mutate each other's values. Only touched from the event loop,
+    so no lock is needed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored text, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return raw
+
+    def put(self, key: str, raw: Any):
+        """Store text for key, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + self.ttl, raw)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, *keys: str):
+        """Drop keys if present."""
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
+
+
+# Commands that only read, so queuing them must not drop L1 entries
+READ_COMMANDS = frozenset({"GET", "MGET", "EXISTS", "TTL", "PTTL"})
+
+
+class CommandBatch:
+    """Redis commands queued by CacheManager.pipeline() and sent in one round-trip.
+
+    After the block exits, ``results`` holds one reply per queued command, in
+    order; values read with ``get()`` are JSON-decoded.
+    """
+
+    def __init__(self):
+        self.commands: List[List[Any]] = []
+        self.results: List[Any] = []
+        self._decode: List[bool] = []
+
+    def add(self, *command: Any) -> "CommandBatch":
+        """Queue one raw command, e.g. add("DEL", key)."""
+        self.commands.append(list(command))
+        self._decode.append(False)
+        return self
+
+    def get(self, key: str) -> "CommandBatch":
+        """Queue a GET whose result is decoded from JSON."""
+        self.add("GET", key)
+        self._decode[-1] = True
+        return self
+
+    def expire(self, key: str, ttl: int) -> "CommandBatch":
+        """Queue an EXPIRE."""
+        return self.add("EXPIRE", key, ttl)
+
+    def delete(self, key: str) -> "CommandBatch":
+        """Queue a DEL."""
+        return self.add("DEL", key)
+
+    def set(self, key: str, value: Any, ttl: int = None) -> "CommandBatch":
+        """Queue a SET of a JSON-encoded value."""
+        if ttl:
+            return self.add("SET", key, _encode(value), "EX", ttl)
+        return self.add("SET", key, _encode(value))
+
+
 class CacheManager:
-    """Upstash Redis cache manager."""
+    """Upstash Redis cache manager.
+
+    Talks native RESP over a pooled connection when REDIS_URL is set, and
+    falls back to the Upstash REST API otherwise.
+    """
     
     def __init__(self):
         self.client: Optional[httpx.AsyncClient] = None
+        self.redis: Optional[redis.Redis] = None
+        self.pool: Optional[redis.ConnectionPool] = None
         self.base_url = settings.upstash_redis_rest_url
         self.token = settings.upstash_redis_rest_token
+        self._l1 = LocalTTLCache(maxsize=L1_MAX_KEYS, ttl=L1_TTL_SECONDS)
+        self._init_lock = asyncio.Lock()
         self._initialized = False
     
     async def initialize(self):
-        """Initialize Upstash Redis client."""
+        """Initialize the Redis client (RESP pool if configured, else Upstash REST).
+
+        The lifespan calls this at startup; concurrent lazy callers share one
+        initialization behind a lock.
+        """
         if self._initialized:
             return
-            
+
+        async with self._init_lock:
+            if self._initialized:
+                return
+            self._connect()
+
+    def _connect(self):
+        """Build the transport client."""
         try:
-            self.client = httpx.AsyncClient(
-                timeout=10.0,
-                headers={
-                    "Authorization": f"Bearer {self.token}",
-                    "Content-Type": "application/json"
-                }
-            )
+            if settings.redis_url:
+                self.pool = redis.ConnectionPool.from_url(
+                    settings.redis_url,
+                    max_connections=settings.redis_max_connections
+                )
+                self.redis = redis.Redis(connection_pool=self.pool)
+            else:
+                # HTTP/2 multiplexes concurrent commands over one connection
+                self.client = httpx.AsyncClient(
+                    http2=True,
+                    limits=REST_CONNECTION_LIMITS,
+                    timeout=10.0,
+                    headers={
+                        "Authorization": f"Bearer {self.token}",
+                        "Content-Type": "application/json"
+                    }
+                )
             self._initialized = True
-            print("✅ Upstash Redis client initialized successfully")
+            logger.debug("✅ Upstash Redis client initialized successfully")
         except Exception as e:
-            print(f"❌ Failed to initialize Upstash Redis client: {e}")
+            logger.error(f"❌ Failed to initialize Upstash Redis client: {e}")
             raise
     
+    async def close(self):
+        """Drain and close the connection pool; the next command reconnects lazily."""
+        if self.redis:
+            await self.redis.aclose()
+            await self.pool.disconnect()
+        if self.client:
+            await self.client.aclose()
+        self.redis = None
+        self.pool = None
+        self.client = None
+        self._initialized = False
+    
+    async def _execute(self, *command: Any) -> Any:
+        """Run one raw command and return its result."""
+        if self.redis is None and self.client is None:
+            await self.initialize()
+        if self.redis:
+            return await self.redis.execute_command(*command)
+        # Upstash REST takes the full command as a JSON array posted to the base URL
+        response = await self.client.post(self.base_url, content=orjson.dumps(command))
+        response.raise_for_status()
+        return orjson.loads(response.content).get("result")
+    
+    async def _execute_many(self, commands: List[List[Any]]) -> List[Any]:
+        """Run several commands in one round-trip (non-transactional pipeline)."""
+        if not commands:
+            return []
+        if self.redis is None and self.client is None:
+            await self.initialize()
+        if self.redis:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for command in commands:
+                    pipe.execute_command(*command)
+                return await pipe.execute()
+        response = await self.client.post(f"{self.base_url}/pipeline", content=orjson.dumps(commands))
+        response.raise_for_status()
+        return [item.get("result") for item in orjson.loads(response.content)]
+    
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[CommandBatch]:
+        """Queue commands inside the block and send them together on exit.
+
+        Usage:
+            async with cache.pipeline() as batch:
+                batch.get("a").expire("a", 60).delete("b")
+            value, _, _ = batch.results
+
+        If the round-trip fails, every result is None.
+        """
+        batch = CommandBatch()
+        yield batch
+        for command in batch.commands:
+            if command[0] in READ_COMMANDS:
+                continue
+            self._l1.discard(*(command[1:] if command[0] in ("DEL", "UNLINK") else command[1:2]))
+        try:
+            replies = await self._execute_many(batch.commands)
+            batch.results = [
+                orjson.loads(reply) if decode and reply else reply
+                for reply, decode in zip(replies, batch._decode)
+            ]
+        except Exception as e:
+            logger.error(f"❌ Error executing cache pipeline: {e}")
+            batch.results = [None] * len(batch.commands)
+    
     async def health_check(self) -> bool:
         """Check cache connection health."""
         try:
-            if not self.client:
-                await self.initialize()
-            
-            response = await self.client.get(f"{self.base_url}/ping")
-            return response.status_code == 200
+            return await self._execute("PING") in (True, "PONG", b"PONG")
         except Exception as e:
-            print(f"❌ Cache health check failed: {e}")
+            logger.error(f"❌ Cache health check failed: {e}")
             return False
     
     async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
+        """Get value from cache, serving read-mostly keys from the in-process L1 when fresh."""
         try:
-            if not self.client:
-                await self.initialize()
-            
-            response = await self.client.get(f"{self.base_url}/get/{key}")
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("result"):
-                    return json.loads(result["result"])
-            return None
+            local = key.startswith(L1_PREFIXES)
+            raw = self._l1.get(key) if local else None
+            if raw is None:
+                raw = await self._execute("GET", key)
+                if raw and local:
+                    self._l1.put(key, raw)
+            return orjson.loads(raw) if raw else None
         except Exception as e:
-            print(f"❌ Error getting cache key {key}: {e}")
+            logger.error(f"❌ Error getting cache key {key}: {e}")
             return None
     
     async def set(self, key: str, value: Any, ttl: int = None) -> bool:
         """Set value in cache."""
+        self._l1.discard(key)
         try:
-            if not self.client:
-                await self.initialize()
-
-            json_value = json.dumps(value)
-
-            # Upstash REST API format: GET /set/{key}/{value}[/EX/{seconds}]
-            # URL encode the value
-            import urllib.parse
-            encoded_value = urllib.parse.quote(json_value, safe='')
-
+            command = ["SET", key, _encode(value)]
             if ttl:
-                url = f"{self.base_url}/set/{key}/{encoded_value}/EX/{ttl}"
-            else:
-                url = f"{self.base_url}/set/{key}/{encoded_value}"
-
-            response = await self.client.get(url)
-
-            if response.status_code != 200:
-                print(f"❌ Redis SET failed for {key}: status={response.status_code}, response={response.text}")
-                return False
-
-            # Check response - should be {"result": "OK"}
-            result = response.json()
-            return result.get("result") == "OK"
+                command += ["EX", ttl]
+            result = await self._execute(*command)
+            return result in (True, "OK", b"OK")
 
         except Exception as e:
-            print(f"❌ Error setting cache key {key}: {e}")
+            logger.error(f"❌ Error setting cache key {key}: {e}")
             return False
     
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
+        self._l1.discard(key)
         try:
-            if not self.client:
-                await self.initialize()
-            
-            response = await self.client.post(f"{self.base_url}/del/{key}")
-            return response.status_code == 200
+            await self._execute("DEL", key)
+            return True
         except Exception as e:
-            print(f"❌ Error deleting cache key {key}: {e}")
+            logger.error(f"❌ Error deleting cache key {key}: {e}")
+            return False
+    
+    async def delete_many(self, keys: List[str]) -> bool:
+        """Delete several keys with one variadic UNLINK (memory is freed in the background)."""
+        self._l1.discard(*keys)
+        try:
+            if keys:
+                await self._execute("UNLINK", *keys)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error deleting cache keys {keys}: {e}")
             return False
     
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         try:
-            if not self.client:
-                await self.initialize()
-            
-            response = await self.client.get(f"{self.base_url}/exists/{key}")
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("result", 0) > 0
-            return False
+            return (await self._execute("EXISTS", key) or 0) > 0
         except Exception as e:
-            print(f"❌ Error checking cache key {key}: {e}")
+            logger.error(f"❌ Error checking cache key {key}: {e}")
             return False
     
     async def get_multiple(self, keys: List[str]) -> Dict[str, Any]:
-        """Get multiple values from cache."""
+        """Get multiple values from cache in one round-trip."""
         try:
-            if not self.client:
-                await self.initialize()
-            
-            response = await self.client.post(f"{self.base_url}/mget", json=keys)
-            if response.status_code == 200:
-                result = response.json()
-                values = result.get("result", [])
-                return {key: json.loads(val) if val else None for key, val in zip(keys, values)}
-            return {}
+            if not keys:
+                return {}
+
+            values = await self._execute("MGET", *keys) or []
+            return {key: orjson.loads(val) if val else None for key, val in zip(keys, values)}
         except Exception as e:
-            print(f"❌ Error getting multiple cache keys: {e}")
+            logger.error(f"❌ Error getting multiple cache keys: {e}")
             return {}
     
     async def set_multiple(self, data: Dict[str, Any], ttl: int = None) -> bool:
-        """Set multiple values in cache."""
+        """Set multiple values in cache in one round-trip."""
+        self._l1.discard(*data)
         try:
-            if not self.client:
-                await self.initialize()
-            
-            # Convert values to JSON strings
-            json_data = {key: json.dumps(value) for key, value in data.items()}
-            
-            response = await self.client.post(f"{self.base_url}/mset", json=json_data)
-            return response.status_code == 200
+            if not data:
+                return True
+
+            if ttl:
+                # MSET has no expiry option, so pipeline one SET ... EX per key
+                async with self.pipeline() as batch:
+                    for key, value in data.items():
+                        batch.set(key, value, ttl)
+                return True
+
+            args = [part for key, value in data.items() for part in (key, _encode(value))]
+            return await self._execute("MSET", *args) in (True, "OK", b"OK")
         except Exception as e:
-            print(f"❌ Error setting multiple cache keys: {e}")
+            logger.error(f"❌ Error setting multiple cache keys: {e}")
             return False
     
     # News-specific cache methods
-    async def get_news_latest(self, topics: List[str], limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+    @staticmethod
+    def _news_latest_key(
+        topics: List[str],
+        limit: int,
+        breaking_only: bool = False,
+        category: Optional[str] = None
+    ) -> str:
+        """Build the latest-news key from every filter that shapes the result.
+
+        Topics are deduplicated, sorted and hashed so the key stays a fixed
+        length however many topics are requested.
+        """
+        topics_digest = xxhash.xxh3_64_hexdigest(b"\0".join(sorted({t.encode() for t in topics})))
+        return f"news:latest:{topics_digest}:{limit}:{int(breaking_only)}:{category or ''}"
+
+    async def get_news_latest(
+        self,
+        topics: List[str],
+        limit: int = 10,
+        breaking_only: bool = False,
+        category: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
         """Get cached latest news."""
-        key = f"news:latest:{':'.join(sorted(topics))}:{limit}"
-        return await self.get(key)
+        return await self.get(self._news_latest_key(topics, limit, breaking_only, category))
     
-    async def set_news_latest(self, topics: List[str], news: List[Dict[str, Any]], ttl: int = 900):
-        """Cache latest news for 15 minutes."""
-        key = f"news:latest:{':'.join(sorted(topics))}:{len(news)}"
+    async def set_news_latest(
+        self,
+        topics: List[str],
+        news: List[Dict[str, Any]],
+        limit: int,
+        ttl: int = 900,
+        breaking_only: bool = False,
+        category: Optional[str] = None
+    ):
+        """Cache latest news for 15 minutes under the limit it was requested with."""
+        key = self._news_latest_key(topics, limit, breaking_only, category)
         await self.set(key, news, ttl)
     
     async def get_news_article(self, article_id: str) -> Optional[Dict[str, Any]]:
@@ -176,17 +388,18 @@ class CacheManager:
         await self.set(key, article, ttl)
     
     # AI response cache methods
+    @staticmethod
+    def _ai_response_key(prompt: str) -> str:
+        """Key an AI response by a fast non-cryptographic 128-bit hash of the prompt."""
+        return f"ai:response:{xxhash.xxh3_128_hexdigest(prompt.encode())}"
+
     async def get_ai_response(self, prompt: str) -> Optional[str]:
         """Get cached AI response."""
-        prompt_hash = hashlib.md5(prompt.encode()).hexdigest()
-        key = f"ai:response:{prompt_hash}"
-        return await self.get(key)
+        return await self.get(self._ai_response_key(prompt))
     
     async def set_ai_response(self, prompt: str, response: str, ttl: int = 3600):
         """Cache AI response for 1 hour."""
-        prompt_hash = hashlib.md5(prompt.encode()).hexdigest()
-        key = f"ai:response:{prompt_hash}"
-        await self.set(key, response, ttl)
+        await self.set(self._ai_response_key(prompt), response, ttl)
     
     # User session cache methods
     async def get_user_session(self, user_id: str) -> Optional[Dict[str, Any]]:
@@ -209,6 +422,10 @@ class CacheManager:
         key = f"user:preferences:{user_id}"
         await self.set(key, preferences, ttl)
     
+    async def delete_user_preferences(self, user_id: str):
+        """Drop cached user preferences after a write."""
+        await self.delete(f"user:preferences:{user_id}")
+    
     # Stock data cache methods
     async def get_stock_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get cached stock price."""
@@ -254,15 +471,12 @@ class CacheManager:
     # Cache management methods
     async def invalidate_user_cache(self, user_id: str):
         """Invalidate all user-related cache."""
-        patterns = [
+        await self.delete_many([
             f"user:session:{user_id}",
             f"user:preferences:{user_id}",
             f"user:watchlist:{user_id}",
             f"user:conversation:{user_id}"
-        ]
-        
-        for pattern in patterns:
-            await self.delete(pattern)
+        ])
     
     async def invalidate_news_cache(self):
         """Invalidate news-related cache."""
@@ -1,21 +1,40 @@
 """Configuration management for Voice News Agent Backend."""
 import os
-from typing import List, Optional
+import threading
+from concurrent.futures import Future
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
 from pathlib import Path
-from pydantic_settings import BaseSettings
+from dotenv import dotenv_values
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict
 from pydantic import Field
 
+# Env files layered in order (later files win); live environment variables override all of them
+ENV_FILES = ("backend/.env", "env_files/supabase.env", "env_files/upstash.env", "env_files/render.env")
 
+# Files that only exist in a complete SenseVoiceSmall snapshot
+SENSEVOICE_SENTINEL_FILES = ("config.yaml", "model.pt")
+
+
+@lru_cache(maxsize=1)
 def get_sensevoice_model_path() -> str:
-    """Get the SenseVoice model path, auto-detecting if not set."""
+    """Get the SenseVoice model path, auto-detecting if not set.
+
+    Resolved once per process; a complete snapshot already in the ModelScope
+    cache is returned without importing modelscope or contacting the hub.
+    """
     # Check if explicitly set via environment variable
     if os.getenv("SENSEVOICE_MODEL_PATH"):
         return os.getenv("SENSEVOICE_MODEL_PATH")
     
-    # Try to find the model in ModelScope cache
+    cache_dir = Path.home() / ".cache" / "modelscope" / "hub"
+    expected = cache_dir / "iic" / "SenseVoiceSmall"
+    if all((expected / name).is_file() for name in SENSEVOICE_SENTINEL_FILES):
+        return str(expected)
+
+    # Try to download the model into the ModelScope cache
     try:
         from modelscope.hub.snapshot_download import snapshot_download
-        cache_dir = Path.home() / ".cache" / "modelscope" / "hub"
         model_path = snapshot_download(
             model_id="iic/SenseVoiceSmall",
             cache_dir=str(cache_dir),
@@ -27,6 +46,60 @@ def get_sensevoice_model_path() -> str:
         return "/app/models/SenseVoiceSmall"
 
 
+@lru_cache(maxsize=1)
+def _read_env_files() -> Dict[str, str]:
+    """Parse ENV_FILES once per process, keyed by lower-cased variable name."""
+    values: Dict[str, str] = {}
+    for path in ENV_FILES:
+        if os.path.isfile(path):
+            values.update({key.lower(): value for key, value in dotenv_values(path).items() if value is not None})
+    return values
+
+
+def _start_sensevoice_path_resolution() -> Optional[Future]:
+    """Resolve the SenseVoice path on a daemon thread so Settings() rarely waits on it.
+
+    Returns None when the path is configured explicitly: Settings() reads it
+    from the environment and never calls the default factory.
+    """
+    if os.getenv("SENSEVOICE_MODEL_PATH") or "sensevoice_model_path" in _read_env_files():
+        return None
+
+    future: Future = Future()
+
+    def resolve():
+        try:
+            future.set_result(get_sensevoice_model_path())
+        except BaseException as e:
+            future.set_exception(e)
+
+    # Daemon so a slow download never holds up interpreter exit
+    threading.Thread(target=resolve, name="sensevoice-path", daemon=True).start()
+    return future
+
+
+_sensevoice_path_future = _start_sensevoice_path_resolution()
+
+
+def _default_sensevoice_model_path() -> str:
+    """Default factory: the background result, blocking only if it is still running."""
+    if _sensevoice_path_future is not None:
+        return _sensevoice_path_future.result()
+    return get_sensevoice_model_path()
+
+
+class CachedEnvFilesSource(PydanticBaseSettingsSource):
+    """Settings source over the env files, reusing the parse from _read_env_files()."""
+
+    def get_field_value(self, field, field_name):
+        # Unused: __call__ resolves every field from the cached mapping at once
+        return None, field_name, False
+
+    def __call__(self) -> Dict[str, Any]:
+        values = _read_env_files()
+        return {name: values[name] for name in self.settings_cls.model_fields if name in values}
+
+
 class Settings(BaseSettings):
     """Application settings."""
     
@@ -50,6 +123,9 @@ class Settings(BaseSettings):
     upstash_redis_rest_token: str = Field(default="", env="UPSTASH_REDIS_REST_TOKEN")
     upstash_redis_rest_read_only_url: Optional[str] = Field(default=None, env="UPSTASH_REDIS_REST_READ_ONLY_URL")
     upstash_redis_rest_read_only_token: Optional[str] = Field(default=None, env="UPSTASH_REDIS_REST_READ_ONLY_TOKEN")
+    # Native RESP endpoint (e.g. rediss://default:<token>@<host>:6379); preferred over the REST API when set
+    redis_url: Optional[str] = Field(default=None, env="REDIS_URL")
+    redis_max_connections: int = Field(default=50, env="REDIS_MAX_CONNECTIONS")
     
     # AI Services
     zhipuai_api_key: str = Field(default="placeholder", env="ZHIPUAI_API_KEY")
@@ -67,13 +143,18 @@ class Settings(BaseSettings):
         env="POPULAR_STOCKS"
     )
 
+    @cached_property
+    def popular_stocks_list(self) -> List[str]:
+        """Popular stock symbols parsed once from the comma-separated setting."""
+        return [s.strip() for s in self.popular_stocks.split(',') if s.strip()]
+
     # Scheduler Configuration
     stock_update_interval_minutes: int = Field(default=5, env="STOCK_UPDATE_INTERVAL_MINUTES")
     news_update_interval_minutes: int = Field(default=5, env="NEWS_UPDATE_INTERVAL_MINUTES")
     enable_scheduler: bool = Field(default=True, env="ENABLE_SCHEDULER")
     
     # Voice Services
-    sensevoice_model_path: str = Field(default_factory=get_sensevoice_model_path, env="SENSEVOICE_MODEL_PATH")
+    sensevoice_model_path: str = Field(default_factory=_default_sensevoice_model_path, env="SENSEVOICE_MODEL_PATH")
     use_local_asr: bool = Field(default=True, env="USE_LOCAL_ASR")  # False on Render (use HF Space only)
     hf_token: Optional[str] = Field(default=None, env="HF_TOKEN")  # HuggingFace token for Space API
     hf_space_name: str = Field(default="hz6666/SenseVoiceSmall", env="HF_SPACE_NAME")
@@ -161,8 +242,9 @@ class Settings(BaseSettings):
     )
     cors_credentials: bool = Field(default=True, env="CORS_CREDENTIALS")
 
-    def get_cors_origins(self) -> List[str]:
-        """Parse CORS origins from string (supports '*' for all origins)."""
+    @cached_property
+    def cors_origins_list(self) -> List[str]:
+        """CORS origins parsed once from the raw string (supports '*' for all origins)."""
         if self.cors_origins == '*':
             return ['*']
         # Support comma-separated list or JSON array format
@@ -170,6 +252,10 @@ class Settings(BaseSettings):
             import json
             return json.loads(self.cors_origins)
         return [origin.strip() for origin in self.cors_origins.split(',')]
+
+    def get_cors_origins(self) -> List[str]:
+        """Parse CORS origins from string (supports '*' for all origins)."""
+        return self.cors_origins_list
     
     # Security
     secret_key: str = Field(default="dev-secret-key-change-in-production", env="SECRET_KEY")
@@ -188,6 +274,15 @@ class Settings(BaseSettings):
     # Performance & Limits
     rate_limit_requests_per_minute: int = Field(default=100, env="RATE_LIMIT_REQUESTS_PER_MINUTE")
     rate_limit_burst: int = Field(default=20, env="RATE_LIMIT_BURST")
+
+    # Database connection pool (shared HTTP/2 client for Supabase PostgREST requests)
+    db_pool_max_connections: int = Field(default=25, env="DB_POOL_MAX_CONNECTIONS")
+    db_pool_max_keepalive: int = Field(default=10, env="DB_POOL_MAX_KEEPALIVE")
+    db_pool_keepalive_expiry_seconds: float = Field(default=300.0, env="DB_POOL_KEEPALIVE_EXPIRY_SECONDS")
+
+    # Response compression (small bodies are not worth the CPU)
+    gzip_minimum_size: int = Field(default=1024, env="GZIP_MINIMUM_SIZE")
+    gzip_compress_level: int = Field(default=4, env="GZIP_COMPRESS_LEVEL")
     
     # WebSocket Configuration
     max_websocket_connections: int = Field(default=50, env="MAX_WEBSOCKET_CONNECTIONS")
@@ -223,19 +318,35 @@ class Settings(BaseSettings):
     
     def is_cache_configured(self) -> bool:
         """Check if cache is properly configured."""
-        return bool(self.upstash_redis_rest_url and self.upstash_redis_rest_token)
+        return bool(self.redis_url or (self.upstash_redis_rest_url and self.upstash_redis_rest_token))
     
-    class Config:
-        env_file = ["backend/.env", "env_files/supabase.env", "env_files/upstash.env", "env_files/render.env"]
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-        extra = "ignore"  # Ignore extra fields from .env
-
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        extra="ignore",  # Ignore extra fields from .env
+        defer_build=True  # Build the validator on first Settings(), not at class definition
+    )
 
-# Global settings instance
-settings = Settings()
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        """Same precedence as the default sources, with the env files parsed once per process."""
+        return init_settings, env_settings, CachedEnvFilesSource(settings_cls), file_secret_settings
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings."""
-    return settings
+    """Get application settings, built on first use and shared thereafter."""
+    return Settings()
+
+
+def __getattr__(name: str):
+    """Resolve the legacy module-level ``settings`` lazily (PEP 562)."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
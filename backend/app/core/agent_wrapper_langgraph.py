@@ -8,12 +8,98 @@ ASR and TTS functionality.
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, List, Callable, Set
 from datetime import datetime
+from operator import attrgetter
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Latest/breaking news changes quickly; keep the shared cache entry short-lived
+NEWS_LATEST_TTL_SECONDS = 60
+
+# Chat history kept per session (5 conversation turns) to avoid context overflow
+CHAT_HISTORY_MAX_MESSAGES = 10
+
+# Caps on per-process state so long-running workers don't grow with every user/session seen
+MAX_USER_MEMORIES = 1024
+MAX_SESSION_HISTORIES = 10_000
+
+# Lock stripes guarding per-user memory creation (power of two, indexed by hash & mask)
+MEMORY_LOCK_STRIPES = 16
+
+# Per-request llm_agent helpers, bound once by LangGraphAgentWrapper.initialize()
+# so process_text_command doesn't go through the import machinery on every call
+_agent_logger = None
+_get_session_logger = None
+_MarketState = None
+_ChatMessage = None
+
+
+def _get_agent_logger():
+    """Return the agent logger, importing it here if initialize() hasn't bound it yet."""
+    global _agent_logger
+
+    if _agent_logger is None:
+        from ..llm_agent.logger import agent_logger as _agent_logger
+    return _agent_logger
+
+
+class BoundedLRUDict(OrderedDict):
+    """Dict capped at ``maxsize`` entries that evicts the least recently used.
+
+    Item reads (``d[key]`` / ``d.get(key)``) mark an entry as recently used;
+    ``on_evict(key, value)`` is called for each entry pushed out.
+    """
+
+    def __init__(self, maxsize: int, on_evict: Optional[Callable[[Any, Any], None]] = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            evicted_key, evicted_value = self.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(evicted_key, evicted_value)
+
+
+# Reads intent/symbols/timeframe off an IntentItem in one C-level call
+_intent_fields = attrgetter("intent", "symbols", "timeframe")
+
+
+def _serialize_intents(intents: List[Any]) -> List[Dict[str, Any]]:
+    """Flatten graph intents (all dicts or all IntentItem) to API dicts.
+
+    The graph emits a homogeneous list, so the element type is checked once.
+    """
+    if not intents:
+        return []
+    if isinstance(intents[0], dict):
+        return [
+            {"intent": i.get("intent"), "symbols": i.get("symbols", []), "timeframe": i.get("timeframe")}
+            for i in intents
+        ]
+    return [
+        {"intent": intent, "symbols": symbols, "timeframe": timeframe}
+        for intent, symbols, timeframe in map(_intent_fields, intents)
+    ]
+
 
 class LangGraphAgentWrapper:
     """Wrapper for LangGraph market agent with database and cache integration."""
@@ -23,26 +109,46 @@ class LangGraphAgentWrapper:
         self.db = None
         self.cache = None
         self._initialized = False
-        self.user_memories: Dict[str, Any] = {}  # user_id -> LongTermMemory instance
-        self.session_chat_history: Dict[str, List] = {}  # session_id -> List[ChatMessage]
+        self._init_lock = asyncio.Lock()
+        # user_id -> LongTermMemory instance; evicted memories are finalized first
+        self.user_memories: Dict[str, Any] = BoundedLRUDict(MAX_USER_MEMORIES, on_evict=self._finalize_evicted_memory)
+        # session_id -> last CHAT_HISTORY_MAX_MESSAGES ChatMessages
+        self.session_chat_history: Dict[str, deque] = BoundedLRUDict(MAX_SESSION_HISTORIES)
+        self._finalize_tasks: Set[asyncio.Task] = set()
+        self._memory_locks = [asyncio.Lock() for _ in range(MEMORY_LOCK_STRIPES)]
 
     async def initialize(self):
-        """Initialize the agent wrapper with database, cache, and graph."""
+        """Initialize the agent wrapper with database, cache, and graph.
+
+        Concurrent callers share a single initialization behind a lock.
+        """
         if self._initialized:
             return
 
+        async with self._init_lock:
+            if self._initialized:
+                return
+            await self._initialize()
+
+    async def _initialize(self):
+        """Connect dependencies and compile the graph."""
         try:
+            global _agent_logger, _get_session_logger, _MarketState, _ChatMessage
+
             # Import here to avoid circular dependencies
             from ..database import get_database
             from ..cache import get_cache
             from ..llm_agent.graph import compile_graph
-
-            # Initialize database and cache
-            self.db = await get_database()
-            self.cache = await get_cache()
-
-            # Initialize LangGraph agent
-            self.graph = compile_graph()
+            from ..llm_agent.logger import agent_logger as _agent_logger
+            from ..llm_agent.session_logger import get_session_logger as _get_session_logger
+            from ..llm_agent.state import MarketState as _MarketState, ChatMessage as _ChatMessage
+
+            # Connect database and cache while the LangGraph agent compiles off the event loop
+            self.db, self.cache, self.graph = await asyncio.gather(
+                get_database(),
+                get_cache(),
+                asyncio.to_thread(compile_graph)
+            )
 
             self._initialized = True
             logger.info("✅ LangGraph agent wrapper initialized successfully")
@@ -51,6 +157,18 @@ class LangGraphAgentWrapper:
             logger.error(f"❌ Failed to initialize LangGraph agent wrapper: {e}", exc_info=True)
             raise
 
+    def _finalize_evicted_memory(self, user_id: str, memory: Any):
+        """Flush an evicted user's memory in the background so its session updates aren't lost."""
+        async def finalize():
+            try:
+                await memory.finalize_session()
+            except Exception as e:
+                logger.error(f"❌ Error finalizing evicted memory for user {user_id[:8]}...: {e}")
+
+        task = asyncio.create_task(finalize())
+        self._finalize_tasks.add(task)
+        task.add_done_callback(self._finalize_tasks.discard)
+
     async def _get_memory_for_user(self, user_id: str):
         """Get or create memory instance for user.
 
@@ -60,14 +178,22 @@ class LangGraphAgentWrapper:
         Returns:
             LongTermMemory instance
         """
-        from ..llm_agent.long_term_memory_supabase import get_memory_for_user
+        memory = self.user_memories.get(user_id)
+        if memory is not None:
+            return memory
+
+        # Concurrent first requests for a user must share one instance, or turns tracked on
+        # the loser are lost; striping keeps other users' loads from queueing behind it
+        async with self._memory_locks[hash(user_id) & (MEMORY_LOCK_STRIPES - 1)]:
+            memory = self.user_memories.get(user_id)
+            if memory is None:
+                from ..llm_agent.long_term_memory_supabase import get_memory_for_user
 
-        if user_id not in self.user_memories:
-            memory = await get_memory_for_user(user_id)
-            self.user_memories[user_id] = memory
-            logger.info(f"✅ Created memory instance for user {user_id[:8]}...")
+                memory = await get_memory_for_user(user_id)
+                self.user_memories[user_id] = memory
+                logger.info(f"✅ Created memory instance for user {user_id[:8]}...")
 
-        return self.user_memories[user_id]
+        return memory
 
     async def process_text_command(
         self,
@@ -93,19 +219,15 @@ class LangGraphAgentWrapper:
             session_id = str(uuid.uuid4())
 
         try:
-            # Import logging system
-            from ..llm_agent.logger import agent_logger
-            from ..llm_agent.session_logger import get_session_logger
-
             # Start session logging (both JSONL and detailed session logs)
-            agent_logger.start_session(
+            _agent_logger.start_session(
                 session_id=session_id,
                 user_id=user_id,
                 metadata={"source": "text_command"}
             )
 
             # Start detailed session log
-            session_logger = get_session_logger()
+            session_logger = _get_session_logger()
             session_logger.start_session(
                 session_id=session_id,
                 user_id=user_id,
@@ -113,8 +235,7 @@ class LangGraphAgentWrapper:
                 metadata={"source": "text_command"}
             )
 
-            # Log query received
-            agent_logger.log_query_received(query, source="api")
+            # Log query received (the JSONL turn entry is written once the response is ready)
             session_logger.log_user_query(
                 session_id=session_id,
                 query=query,
@@ -129,36 +250,35 @@ class LangGraphAgentWrapper:
                 memory.start_session(session_id)
 
             # Get or create chat history for this session
-            if session_id not in self.session_chat_history:
-                self.session_chat_history[session_id] = []
-
-            chat_history = self.session_chat_history[session_id]
+            chat_history = self.session_chat_history.get(session_id)
+            if chat_history is None:
+                chat_history = deque(maxlen=CHAT_HISTORY_MAX_MESSAGES)
+                self.session_chat_history[session_id] = chat_history
 
             # Prepare state with chat history
-            from ..llm_agent.state import MarketState, ChatMessage
-            initial_state = MarketState(
+            initial_state = _MarketState(
                 query=query,
                 user_id=user_id,
-                chat_history=chat_history,
+                chat_history=list(chat_history),
                 thread_id=session_id
             )
 
             # Invoke graph
-            start_time = asyncio.get_event_loop().time()
+            start_ns = time.perf_counter_ns()
             result = await self.graph.ainvoke(initial_state)
-            processing_time_ms = int((asyncio.get_event_loop().time() - start_time) * 1000)
+            processing_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-            # Update chat history with this conversation turn
+            # Read each result field once; they're reused across logging and the response
             response_text = result.get("summary", "")
-            chat_history.append(ChatMessage(role="user", content=query))
-            chat_history.append(ChatMessage(role="assistant", content=response_text))
+            intent_value = result.get("intent", "unknown")
+            symbols = result.get("symbols", [])
+            intents = result.get("intents", [])
 
-            # Keep only last 10 messages (5 conversation turns) to avoid context overflow
-            if len(chat_history) > 10:
-                self.session_chat_history[session_id] = chat_history[-10:]
+            # Update chat history with this conversation turn
+            chat_history.append(_ChatMessage(role="user", content=query))
+            chat_history.append(_ChatMessage(role="assistant", content=response_text))
 
             # Track in memory (if not chat/unknown intent)
-            intent_value = result.get("intent", "unknown")
             logger.info(f"📊 Checking memory tracking: intent={intent_value}, result_keys={list(result.keys())[:10]}")
 
             if intent_value not in ["chat", "unknown"]:
@@ -166,20 +286,22 @@ class LangGraphAgentWrapper:
                 memory.track_conversation(
                     query=query,
                     intent=intent_value,
-                    symbols=result.get("symbols", []),
+                    symbols=symbols,
                     summary=response_text
                 )
             else:
                 logger.info(f"⏭️  Skipping memory tracking (intent={intent_value})")
 
-            # Log response
-            agent_logger.log_response_sent(
-                response=result.get("summary", ""),
+            # Log the query and response as one turn entry
+            _agent_logger.log_turn(
+                query=query,
+                response=response_text,
                 processing_time_ms=processing_time_ms,
+                source="api",
                 metadata={
-                    "intent": result.get("intent"),
-                    "symbols": result.get("symbols", []),
-                    "num_intents": len(result.get("intents", []))
+                    "intent": intent_value,
+                    "symbols": symbols,
+                    "num_intents": len(intents)
                 }
             )
 
@@ -193,21 +315,14 @@ class LangGraphAgentWrapper:
             )
 
             return {
-                "response": result.get("summary", ""),
+                "response": response_text,
                 "response_text": response_text,  # For API compatibility
-                "response_type": "market_data" if result.get("symbols") else "general",
+                "response_type": "market_data" if symbols else "general",
                 "timestamp": datetime.utcnow().isoformat() + "Z",
-                "intent": result.get("intent", "unknown"),
-                "symbols": result.get("symbols", []),
+                "intent": intent_value,
+                "symbols": symbols,
                 "raw_data": result.get("raw_data", {}),
-                "intents": [
-                    {
-                        "intent": intent.get("intent") if isinstance(intent, dict) else intent.intent,
-                        "symbols": intent.get("symbols", []) if isinstance(intent, dict) else intent.symbols,
-                        "timeframe": intent.get("timeframe") if isinstance(intent, dict) else intent.timeframe
-                    }
-                    for intent in result.get("intents", [])
-                ],
+                "intents": _serialize_intents(intents),
                 "processing_time_ms": processing_time_ms,
                 "session_id": session_id
             }
@@ -216,8 +331,7 @@ class LangGraphAgentWrapper:
             logger.error(f"❌ Error processing text command: {e}", exc_info=True)
 
             # Log error
-            from ..llm_agent.logger import agent_logger
-            agent_logger.log_error(
+            _agent_logger.log_error(
                 error_type="text_command_error",
                 error_message=str(e),
                 traceback=None,
@@ -276,8 +390,7 @@ class LangGraphAgentWrapper:
                 logger.info(f"✅ Cleared chat history for session {session_id[:8]}...")
 
             # End session logging
-            from ..llm_agent.logger import agent_logger
-            agent_logger.end_session(
+            _get_agent_logger().end_session(
                 summary={"user_id": user_id, "session_id": session_id}
             )
 
@@ -317,6 +430,78 @@ class LangGraphAgentWrapper:
             logger.error(f"❌ Error getting watchlist: {e}")
             return []
 
+    async def get_news_latest(
+        self,
+        topics: List[str] = None,
+        limit: int = 10,
+        breaking_only: bool = False,
+        category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get latest news articles with filters applied by the database.
+
+        Args:
+            topics: Topics to match (any overlap)
+            limit: Maximum number of articles
+            breaking_only: Only return breaking news
+            category: Source category filter
+
+        Returns:
+            List of news article dicts
+        """
+        await self.initialize()
+        topics = topics or []
+
+        try:
+            # /latest and /breaking share this entry, so a burst of polls hits the DB once per TTL
+            cached = await self.cache.get_news_latest(topics, limit, breaking_only, category)
+            if cached is not None:
+                return cached
+
+            news_items = await self.db.get_latest_news(
+                topics,
+                limit,
+                breaking_only=breaking_only,
+                category=category
+            )
+            await self.cache.set_news_latest(
+                topics,
+                news_items,
+                ttl=NEWS_LATEST_TTL_SECONDS,
+                limit=limit,
+                breaking_only=breaking_only,
+                category=category
+            )
+            return news_items
+        except Exception as e:
+            logger.error(f"❌ Error getting latest news: {e}")
+            return []
+
+    async def search_news(
+        self,
+        query: str,
+        limit: int = 10,
+        category: Optional[str] = None,
+        topics: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search news articles with filters applied by the database.
+
+        Args:
+            query: Full-text search query
+            limit: Maximum number of articles
+            category: Source category filter
+            topics: Topics to match (any overlap)
+
+        Returns:
+            List of news article dicts
+        """
+        await self.initialize()
+
+        try:
+            return await self.db.search_news(query, limit, category=category, topics=topics)
+        except Exception as e:
+            logger.error(f"❌ Error searching news: {e}")
+            return []
+
     async def update_watchlist(
         self,
         user_id: str,
@@ -358,18 +543,37 @@ class LangGraphAgentWrapper:
 
 # ====== SINGLETON INSTANCE ======
 _agent_wrapper_instance: Optional[LangGraphAgentWrapper] = None
+_agent_init_task: Optional[asyncio.Task] = None
+
+
+async def _create_agent() -> LangGraphAgentWrapper:
+    """Build the shared agent and publish it once initialized."""
+    global _agent_wrapper_instance
+
+    agent = LangGraphAgentWrapper()
+    await agent.initialize()
+    _agent_wrapper_instance = agent
+    return agent
 
 
 async def get_agent() -> LangGraphAgentWrapper:
     """Get or create singleton agent wrapper instance.
 
+    The first caller starts a single build task that every other caller
+    awaits (the lifespan warms it at startup). It is shielded, so a caller
+    that goes away mid-build doesn't cancel it for the rest; a failed build
+    is retried by the next caller.
+
     Returns:
         LangGraphAgentWrapper instance
     """
-    global _agent_wrapper_instance
+    global _agent_init_task
+
+    if _agent_wrapper_instance is not None:
+        return _agent_wrapper_instance
 
-    if _agent_wrapper_instance is None:
-        _agent_wrapper_instance = LangGraphAgentWrapper()
-        await _agent_wrapper_instance.initialize()
+    task = _agent_init_task
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = _agent_init_task = asyncio.create_task(_create_agent())
 
-    return _agent_wrapper_instance
+    return await asyncio.shield(task)
@@ -11,11 +11,30 @@ Features:
 - Graceful shutdown with queue flush
 """
 import asyncio
-from typing import Optional, Dict, Any
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
 from asyncio import Queue
 from datetime import datetime
 from loguru import logger
-from ..database import db_manager
+from ..database import db_manager, run_background_query
+
+# A batch is written once it holds this many messages or its first message has waited this long
+MESSAGE_BATCH_MAX_SIZE = 500
+MESSAGE_BATCH_MAX_LATENCY_MS = 200
+
+
+@dataclass(slots=True)
+class SessionState:
+    """In-memory state for one tracked session."""
+    user_id: str
+    session_start: datetime
+    is_active: bool = True
+    message_count: int = 0
+    db_id: Optional[str] = None  # conversation_sessions.id, set once the row is inserted
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    discussed_news: List[Dict[str, Any]] = field(default_factory=list)  # News discussed in this session
+    discussed_stocks: set = field(default_factory=set)  # Stock symbols mentioned
 
 
 class ConversationTracker:
@@ -29,9 +48,15 @@ class ConversationTracker:
     - Graceful shutdown with flush
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        batch_max_size: int = MESSAGE_BATCH_MAX_SIZE,
+        batch_max_latency_ms: int = MESSAGE_BATCH_MAX_LATENCY_MS
+    ):
+        self.batch_max_size = batch_max_size
+        self.batch_max_latency = batch_max_latency_ms / 1000
         self.message_queue: Queue = Queue(maxsize=10000)
-        self.session_states: Dict[str, Dict[str, Any]] = {}
+        self.session_states: Dict[str, SessionState] = {}
         self._worker_task: Optional[asyncio.Task] = None
         self._running = False
 
@@ -89,6 +114,13 @@ class ConversationTracker:
             "created_at": datetime.utcnow()
         }
 
+        # Resolve the session's ids now so saving doesn't depend on state that
+        # _cleanup_session_state may already have dropped
+        state = self.session_states.get(session_id)
+        if state:
+            message["_user_id"] = state.user_id
+            message["_db_id"] = state.db_id
+
         try:
             # Non-blocking queue put (~1ms)
             self.message_queue.put_nowait(message)
@@ -114,15 +146,15 @@ class ConversationTracker:
             user_id: User ID
             metadata: Optional metadata (e.g., client_ip, device)
         """
-        self.session_states[session_id] = {
-            "user_id": user_id,
-            "session_start": datetime.utcnow(),
-            "is_active": True,
-            "message_count": 0,
-            "metadata": metadata or {},
-            "discussed_news": [],  # Track news discussed in this session
-            "discussed_stocks": set()  # Track stock symbols mentioned
-        }
+        # One timestamp for the in-memory state and both DB columns
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+
+        state = self.session_states[session_id] = SessionState(
+            user_id=user_id,
+            session_start=now,
+            metadata=metadata or {}
+        )
 
         # Save to database
         try:
@@ -134,18 +166,18 @@ class ConversationTracker:
                 return db_manager.client.table("conversation_sessions").insert({
                     "session_id": session_id,
                     "user_id": user_id,
-                    "session_start": datetime.utcnow().isoformat(),  # DB column is session_start
-                    "started_at": datetime.utcnow().isoformat(),  # Also set alias
+                    "session_start": now_iso,  # DB column is session_start
+                    "started_at": now_iso,  # Also set alias
                     "is_active": True,
                     "metadata": metadata or {}
                 }).execute()
 
-            result = await asyncio.to_thread(_insert)
+            result = await run_background_query(_insert)
 
             # CRITICAL: Store the database id (used for FK in messages table)
             if result.data and len(result.data) > 0:
                 db_id = result.data[0]['id']
-                self.session_states[session_id]["db_id"] = db_id
+                state.db_id = db_id
                 logger.info(f"✅ Started session {session_id[:8]}... (db_id={db_id[:8]}...) for user {user_id}")
             else:
                 logger.error(f"❌ Session created but no id returned")
@@ -166,35 +198,30 @@ class ConversationTracker:
             return
 
         # Update state
-        self.session_states[session_id]["is_active"] = False
+        state = self.session_states[session_id]
+        state.is_active = False
         session_end = datetime.utcnow()
+        session_end_iso = session_end.isoformat()
 
         # Calculate duration
-        session_start = self.session_states[session_id]["session_start"]
-        duration_seconds = (session_end - session_start).total_seconds()
-        message_count = self.session_states[session_id]["message_count"]
+        duration_seconds = (session_end - state.session_start).total_seconds()
+        message_count = state.message_count
 
         # Update database
         try:
             if not db_manager._initialized:
                 await db_manager.initialize()
 
-            # Debug: Check if session exists before updating
-            def _check():
-                return db_manager.client.table("conversation_sessions").select("id, session_id").eq("session_id", session_id).execute()
-
-            check_result = await asyncio.to_thread(_check)
-            logger.debug(f"Session check before update: found {len(check_result.data) if check_result.data else 0} rows for session_id={session_id[:8]}...")
-
+            # The update returns the affected rows, so it doubles as the existence check
             def _update():
                 return db_manager.client.table("conversation_sessions").update({
-                    "session_end": session_end.isoformat(),  # DB column is session_end
-                    "ended_at": session_end.isoformat(),  # Also set alias
+                    "session_end": session_end_iso,  # DB column is session_end
+                    "ended_at": session_end_iso,  # Also set alias
                     "is_active": False,
                     "duration_seconds": duration_seconds
                 }).eq("session_id", session_id).execute()
 
-            result = await asyncio.to_thread(_update)
+            result = await run_background_query(_update)
 
             # Check if update succeeded
             if result.data and len(result.data) > 0:
@@ -225,7 +252,7 @@ class ConversationTracker:
             logger.debug(f"🧹 Cleaned up session state for {session_id[:8]}...")
 
     async def _worker(self):
-        """Background worker that processes message queue."""
+        """Background worker that saves queued messages in bulk batches."""
         logger.info("🔄 Message worker started")
 
         while self._running:
@@ -239,19 +266,126 @@ class ConversationTracker:
                 except asyncio.TimeoutError:
                     continue
 
-                # Save to database with retry
-                await self._save_message_with_retry(message)
-
-                # Update session message count
-                session_id = message["session_id"]
-                if session_id in self.session_states:
-                    self.session_states[session_id]["message_count"] += 1
+                await self._save_messages(await self._collect_batch(message))
 
             except Exception as e:
                 logger.error(f"❌ Worker error: {e}")
 
         logger.info("🛑 Message worker stopped")
 
+    async def _collect_batch(self, first: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Gather messages to write with ``first``.
+
+        Already-queued messages are taken immediately; after that the batch
+        waits for more until it is full or ``first`` has waited
+        ``batch_max_latency``, so no message sits unsaved longer than that.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_max_latency
+        batch = [first]
+
+        while len(batch) < self.batch_max_size:
+            try:
+                batch.append(self.message_queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.message_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    def _message_row(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build the conversation_messages row for a queued message (None if its session has no db_id)."""
+        session_id = message["session_id"]
+        db_id = message.get("_db_id")  # FK references conversation_sessions.id, not session_id
+        user_id = message.get("_user_id")
+
+        if not db_id:
+            # Queued before the session row was inserted; its db_id may have arrived since
+            state = self.session_states.get(session_id)
+            if state:
+                db_id, user_id = state.db_id, state.user_id
+
+        if not db_id:
+            logger.error(f"❌ Cannot save message: db_id not found for session {session_id[:8]}...")
+            return None
+
+        return {
+            "session_id": db_id,  # FK points to conversation_sessions.id
+            "user_id": user_id,  # Include user_id from session
+            "role": message["role"],
+            "content": message["content"],
+            "audio_url": message.get("audio_url"),
+            "metadata": message.get("metadata"),
+            "created_at": message["created_at"].isoformat()
+        }
+
+    async def _save_messages(self, messages: List[Dict[str, Any]], max_retries: int = 3):
+        """
+        Save a batch of queued messages and update the sessions' message counts.
+
+        Args:
+            messages: Queued message dicts
+            max_retries: Maximum bulk insert attempts (default: 3)
+        """
+        rows = [row for row in map(self._message_row, messages) if row]
+        if rows:
+            await self._insert_messages_with_retry(messages, rows, max_retries)
+
+        # Update session message counts
+        for session_id, count in Counter(message["session_id"] for message in messages).items():
+            state = self.session_states.get(session_id)
+            if state:
+                state.message_count += count
+
+    async def _insert_messages_with_retry(
+        self,
+        messages: List[Dict[str, Any]],
+        rows: List[Dict[str, Any]],
+        max_retries: int
+    ):
+        """
+        Insert rows with one bulk insert, retrying with exponential backoff.
+
+        A bulk insert is all-or-nothing, so if it still fails after the retries
+        the messages are saved one by one to keep everything but the bad rows.
+        """
+        for attempt in range(max_retries):
+            try:
+                if not db_manager._initialized:
+                    await db_manager.initialize()
+
+                def _insert_messages():
+                    return db_manager.client.table("conversation_messages").insert(rows).execute()
+
+                await run_background_query(_insert_messages)
+                logger.debug(f"✅ Saved {len(rows)} messages in one insert")
+                return  # Success!
+
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
+                    logger.warning(
+                        f"⚠️ Batch save of {len(rows)} messages failed (attempt {attempt + 1}/{max_retries}), "
+                        f"retrying in {wait_time}s: {e}"
+                    )
+                    await asyncio.sleep(wait_time)
+                elif len(rows) > 1:
+                    logger.error(f"❌ Batch save failed after {max_retries} attempts, saving rows individually: {e}")
+                    for message in messages:
+                        await self._save_message_with_retry(message, max_retries=1)
+                else:
+                    logger.error(f"❌ Failed to save message after {max_retries} attempts: {e}")
+                    # Could write to dead-letter queue here
+
     async def _save_message_with_retry(
         self,
         message: Dict[str, Any],
@@ -269,30 +403,14 @@ class ConversationTracker:
                 if not db_manager._initialized:
                     await db_manager.initialize()
 
-                # Get user_id and db_id from session state
-                session_id = message["session_id"]
-                user_id = None
-                db_id = None  # FK references conversation_sessions.id, not session_id
-                if session_id in self.session_states:
-                    user_id = self.session_states[session_id].get("user_id")
-                    db_id = self.session_states[session_id].get("db_id")
-
-                if not db_id:
-                    logger.error(f"❌ Cannot save message: db_id not found for session {session_id[:8]}...")
+                row = self._message_row(message)
+                if not row:
                     return
 
                 def _insert_message():
-                    return db_manager.client.table("conversation_messages").insert({
-                        "session_id": db_id,  # FK points to conversation_sessions.id
-                        "user_id": user_id,  # Include user_id from session
-                        "role": message["role"],
-                        "content": message["content"],
-                        "audio_url": message.get("audio_url"),
-                        "metadata": message.get("metadata"),
-                        "created_at": message["created_at"].isoformat()
-                    }).execute()
-
-                await asyncio.to_thread(_insert_message)
+                    return db_manager.client.table("conversation_messages").insert(row).execute()
+
+                await run_background_query(_insert_message)
 
                 logger.debug(
                     f"✅ Saved {message['role']} message "
@@ -320,12 +438,14 @@ class ConversationTracker:
         count = 0
 
         while not self.message_queue.empty():
+            batch = []
+            while len(batch) < self.batch_max_size and not self.message_queue.empty():
+                batch.append(self.message_queue.get_nowait())
             try:
-                message = self.message_queue.get_nowait()
-                await self._save_message_with_retry(message)
-                count += 1
+                await self._save_messages(batch)
+                count += len(batch)
             except Exception as e:
-                logger.error(f"❌ Error flushing message: {e}")
+                logger.error(f"❌ Error flushing messages: {e}")
 
         if count > 0:
             logger.info(f"✅ Flushed {count} messages")
@@ -338,7 +458,7 @@ class ConversationTracker:
         """Get number of active sessions."""
         return sum(
             1 for state in self.session_states.values()
-            if state["is_active"]
+            if state.is_active
         )
 
     def get_stats(self) -> Dict[str, Any]:
@@ -371,7 +491,8 @@ class ConversationTracker:
             news_source: Optional news source
             published_at: Optional publication timestamp
         """
-        if session_id not in self.session_states:
+        state = self.session_states.get(session_id)
+        if not state:
             logger.warning(f"⚠️ Cannot track news: session {session_id[:8]}... not found")
             return
 
@@ -385,12 +506,12 @@ class ConversationTracker:
             "discussed_at": datetime.utcnow().isoformat()
         }
 
-        self.session_states[session_id]["discussed_news"].append(news_item)
-        self.session_states[session_id]["discussed_stocks"].add(stock_symbol.upper())
+        state.discussed_news.append(news_item)
+        state.discussed_stocks.add(stock_symbol.upper())
 
         logger.info(
             f"📰 Tracked news for {stock_symbol} in session {session_id[:8]}... "
-            f"(total: {len(self.session_states[session_id]['discussed_news'])})"
+            f"(total: {len(state.discussed_news)})"
         )
 
     async def _save_discussed_news(self, session_id: str):
@@ -402,10 +523,11 @@ class ConversationTracker:
         Args:
             session_id: Session ID
         """
-        if session_id not in self.session_states:
+        state = self.session_states.get(session_id)
+        if not state:
             return
 
-        discussed_news = self.session_states[session_id].get("discussed_news", [])
+        discussed_news = state.discussed_news
 
         if not discussed_news:
             logger.debug(f"No news discussed in session {session_id[:8]}...")
@@ -416,33 +538,43 @@ class ConversationTracker:
                 await db_manager.initialize()
 
             # Get database id for FK
-            db_id = self.session_states[session_id].get("db_id")
+            db_id = state.db_id
             if not db_id:
                 logger.error(f"❌ Cannot save news: db_id not found for session {session_id[:8]}...")
                 return
 
-            # Save each news item with session link
-            for news in discussed_news:
-                def _insert_news():
-                    return db_manager.client.table("session_news").insert({
-                        "session_id": db_id,  # FK to conversation_sessions.id
-                        "stock_symbol": news["stock_symbol"],
-                        "news_title": news["title"],
-                        "news_url": news.get("url"),
-                        "news_source": news.get("source"),
-                        "published_at": news.get("published_at"),
-                        "discussed_at": news["discussed_at"]
-                    }).execute()
-
-                try:
-                    await asyncio.to_thread(_insert_news)
-                except Exception as e:
-                    logger.error(f"❌ Failed to save news item: {e}")
-                    # Continue with other items
+            rows = [
+                {
+                    "session_id": db_id,  # FK to conversation_sessions.id
+                    "stock_symbol": news["stock_symbol"],
+                    "news_title": news["title"],
+                    "news_url": news.get("url"),
+                    "news_source": news.get("source"),
+                    "published_at": news.get("published_at"),
+                    "discussed_at": news["discussed_at"]
+                }
+                for news in discussed_news
+            ]
+
+            def _insert_news(payload):
+                return db_manager.client.table("session_news").insert(payload).execute()
+
+            # Save every news item with one bulk insert
+            try:
+                await run_background_query(lambda: _insert_news(rows))
+            except Exception as e:
+                # The bulk insert is all-or-nothing; retry row by row so one bad item doesn't lose the rest
+                logger.warning(f"⚠️ Bulk save of {len(rows)} news items failed, saving individually: {e}")
+                for row in rows:
+                    try:
+                        await run_background_query(lambda: _insert_news(row))
+                    except Exception as e:
+                        logger.error(f"❌ Failed to save news item: {e}")
+                        # Continue with other items
 
             logger.info(
                 f"✅ Saved {len(discussed_news)} news items for session {session_id[:8]}... "
-                f"(stocks: {', '.join(self.session_states[session_id]['discussed_stocks'])})"
+                f"(stocks: {', '.join(state.discussed_stocks)})"
             )
 
         except Exception as e:
@@ -8,10 +8,10 @@ This module provides a background task that:
 4. Updates session_end timestamp and duration
 """
 import asyncio
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 from loguru import logger
-from ..database import db_manager
+from ..database import db_manager, run_background_query
 
 
 class HeartbeatMonitor:
@@ -86,7 +86,10 @@ class HeartbeatMonitor:
             if not db_manager._initialized:
                 await db_manager.initialize()
 
-            # Find sessions that are active but have stale heartbeats
+            # Find sessions that are active but have stale heartbeats; the timeout
+            # is applied in SQL so fresh sessions never leave the database
+            cutoff = (datetime.now(timezone.utc) - timedelta(seconds=self.timeout_seconds)).isoformat()
+
             # Use retry logic with exponential backoff for transient connection errors
             max_retries = 3
             retry_delay = 1.0
@@ -95,10 +98,10 @@ class HeartbeatMonitor:
                 try:
                     def _find_stale():
                         return db_manager.client.table("conversation_sessions").select(
-                            "id, session_id, user_id, session_start, last_heartbeat_at"
-                        ).eq("is_active", True).execute()
+                            "session_id, last_heartbeat_at"
+                        ).eq("is_active", True).lt("last_heartbeat_at", cutoff).execute()
 
-                    result = await asyncio.to_thread(_find_stale)
+                    result = await run_background_query(_find_stale)
                     break  # Success
                 except Exception as db_error:
                     if attempt < max_retries - 1:
@@ -108,37 +111,14 @@ class HeartbeatMonitor:
                     else:
                         raise  # Re-raise on final attempt
 
-            if not result.data:
-                return
-
-            # Filter for sessions with heartbeat timeout (>100s)
-            now = datetime.utcnow()
-            stale_sessions = []
-
-            for session in result.data:
-                last_heartbeat = session.get("last_heartbeat_at")
-                if not last_heartbeat:
-                    continue
-
-                # Parse ISO timestamp
-                last_heartbeat_dt = datetime.fromisoformat(last_heartbeat.replace("Z", "+00:00"))
-                seconds_since_heartbeat = (now - last_heartbeat_dt).total_seconds()
-
-                if seconds_since_heartbeat > self.timeout_seconds:
-                    stale_sessions.append({
-                        "session_id": session["session_id"],
-                        "user_id": session["user_id"],
-                        "session_start": session["session_start"],
-                        "seconds_stale": seconds_since_heartbeat
-                    })
+            stale_sessions = result.data
 
             if not stale_sessions:
                 logger.debug("💓 All active sessions have recent heartbeats")
                 return
 
             # Mark stale sessions as inactive
-            for session in stale_sessions:
-                await self._close_stale_session(session)
+            await self._close_stale_sessions(stale_sessions)
 
             logger.info(
                 f"💤 Marked {len(stale_sessions)} stale sessions as inactive "
@@ -148,53 +128,62 @@ class HeartbeatMonitor:
         except Exception as e:
             logger.error(f"❌ Failed to check stale sessions: {e}")
 
-    async def _close_stale_session(self, session_info: dict):
+    async def _close_stale_sessions(self, stale_sessions: List[dict]):
         """
-        Mark a single stale session as inactive.
+        Mark all stale sessions inactive in two round-trips.
+
+        Every stale session gets the same is_active/session_end/ended_at values,
+        so they are closed with one ``.in_()`` UPDATE. Durations differ per
+        session, so they are then filled in server-side by the
+        `set_session_durations` RPC (database/functions.sql).
 
         Args:
-            session_info: Dict with session_id, user_id, session_start, seconds_stale
+            stale_sessions: Rows with session_id and last_heartbeat_at
         """
-        try:
-            session_id = session_info["session_id"]
-            session_start = datetime.fromisoformat(
-                session_info["session_start"].replace("Z", "+00:00")
-            )
-            session_end = datetime.utcnow()
-            duration_seconds = (session_end - session_start).total_seconds()
+        session_ids = [session["session_id"] for session in stale_sessions]
+        session_end = datetime.now(timezone.utc).isoformat()
 
-            # Retry update with exponential backoff
-            max_retries = 3
-            retry_delay = 1.0
+        # Retry update with exponential backoff
+        max_retries = 3
+        retry_delay = 1.0
 
-            for attempt in range(max_retries):
-                try:
-                    def _update():
-                        return db_manager.client.table("conversation_sessions").update({
-                            "is_active": False,
-                            "session_end": session_end.isoformat(),
-                            "ended_at": session_end.isoformat(),
-                            "duration_seconds": duration_seconds
-                        }).eq("session_id", session_id).execute()
-
-                    await asyncio.to_thread(_update)
-                    break  # Success
-                except Exception as db_error:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"⚠️ DB update failed for {session_id[:8]}... (attempt {attempt + 1}/{max_retries}), retrying in {retry_delay}s")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 2
-                    else:
-                        raise  # Re-raise on final attempt
+        for attempt in range(max_retries):
+            try:
+                def _update():
+                    return db_manager.client.table("conversation_sessions").update({
+                        "is_active": False,
+                        "session_end": session_end,
+                        "ended_at": session_end
+                    }).in_("session_id", session_ids).execute()
+
+                await run_background_query(_update)
+                break  # Success
+            except Exception as db_error:
+                if attempt < max_retries - 1:
+                    logger.warning(f"⚠️ DB update failed for {len(session_ids)} stale sessions (attempt {attempt + 1}/{max_retries}), retrying in {retry_delay}s")
+                    await asyncio.sleep(retry_delay)
+                    retry_delay *= 2
+                else:
+                    raise  # Re-raise on final attempt
+
+        # Sessions are already closed; a missing duration is not worth failing the sweep
+        try:
+            def _set_durations():
+                return db_manager.client.rpc(
+                    "set_session_durations", {"p_session_ids": session_ids}
+                ).execute()
 
-            logger.info(
-                f"💤 Closed stale session {session_id[:8]}... "
-                f"(stale for {session_info['seconds_stale']:.0f}s, duration: {duration_seconds:.1f}s)"
+            await run_background_query(_set_durations)
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Failed to set durations for {len(session_ids)} stale sessions "
+                f"(is database/functions.sql applied?): {e}"
             )
 
-        except Exception as e:
-            logger.error(
-                f"❌ Failed to close stale session {session_info['session_id'][:8]}...: {e}"
+        for session in stale_sessions:
+            logger.info(
+                f"💤 Closed stale session {session['session_id'][:8]}... "
+                f"(last heartbeat {session['last_heartbeat_at']})"
             )
 
 
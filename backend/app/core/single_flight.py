@@ -0,0 +1,52 @@
+"""Single-flighting of concurrent agent commands."""
+import asyncio
+import logging
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Dispatch agent commands immediately, sharing identical ones that overlap.
+
+    Each request runs as soon as it arrives. Identical requests - same handler
+    and arguments, e.g. a client retry or double submit - are single-flighted:
+    while one is running, later callers await the same result (or exception)
+    instead of starting another agent call.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Any, asyncio.Future] = {}
+
+    async def submit(self, handler: Callable[..., Awaitable[Dict[str, Any]]], **kwargs: Any) -> Dict[str, Any]:
+        """Run ``handler(**kwargs)`` now, or join an identical call already in flight."""
+        key = (handler, tuple(sorted(kwargs.items())))
+        future = self._inflight.get(key)
+        # A call left over from another event loop (e.g. a previous test) can't be awaited here
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            future = asyncio.ensure_future(self._call(handler, kwargs))
+            self._inflight[key] = future
+            future.add_done_callback(partial(self._release, key))
+        else:
+            logger.info("Joining in-flight agent call for a duplicate request")
+        # Shielded so one caller disconnecting doesn't cancel the result for the others
+        return await asyncio.shield(future)
+
+    @staticmethod
+    async def _call(handler: Callable[..., Awaitable[Dict[str, Any]]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke inside a coroutine so errors raised at call time reach the shared future too."""
+        return await handler(**kwargs)
+
+    def _release(self, key: Any, future: asyncio.Future):
+        """Drop a settled call so the next identical request runs again."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Retrieve the error here instead of relying on a caller (who may have been
+        # cancelled) to read it, so asyncio never logs "exception was never retrieved"
+        if not future.cancelled():
+            future.exception()
+
+
+# Shared single-flight map for the voice/text command endpoints
+single_flight = SingleFlight()
@@ -1,14 +1,17 @@
 """Complete WebSocket manager with audio processing."""
 import asyncio
-import json
+import logging
 import uuid
 import base64
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from datetime import datetime
+import orjson
 from fastapi import WebSocket
 from starlette.websockets import WebSocketState
 from .conversation_tracker import get_conversation_tracker
 
+logger = logging.getLogger("voice_news_agent.ws")
+
 
 class AudioWebSocketManager:
     """WebSocket manager with full audio pipeline."""
@@ -42,7 +45,7 @@ class AudioWebSocketManager:
         self.user_sessions[user_id] = session_id
         self.session_users[session_id] = user_id
 
-        print(f"✅ [CONNECT] session={session_id[:8]}..., user={user_id[:8]}...")
+        logger.debug(f"✅ [CONNECT] session={session_id[:8]}..., user={user_id[:8]}...")
 
         # Start conversation session tracking in database (non-blocking)
         # Run in background to avoid blocking the connection handshake
@@ -53,9 +56,9 @@ class AudioWebSocketManager:
                     user_id=user_id,
                     metadata={"endpoint": "audio_websocket_v2"}
                 )
-                print(f"✅ [SESSION] Started tracking for session={session_id[:8]}...")
+                logger.debug(f"✅ [SESSION] Started tracking for session={session_id[:8]}...")
             except Exception as e:
-                print(f"⚠️ [SESSION] Failed to start session tracking: {e}")
+                logger.warning(f"⚠️ [SESSION] Failed to start session tracking: {e}")
 
         asyncio.create_task(_start_session_bg())
 
@@ -79,7 +82,7 @@ class AudioWebSocketManager:
             # Remove from connections
             if session_id in self.connections:
                 del self.connections[session_id]
-                print(f"🔌 [DISCONNECT] session={session_id[:8]}...")
+                logger.debug(f"🔌 [DISCONNECT] session={session_id[:8]}...")
 
             # Remove from user_sessions mapping
             if user_id and user_id in self.user_sessions:
@@ -92,40 +95,49 @@ class AudioWebSocketManager:
             # End conversation session in database (sets is_active=False)
             try:
                 await self.conversation_tracker.end_session(session_id)
-                print(f"✅ [SESSION] Ended session tracking for session={session_id[:8]}...")
+                logger.debug(f"✅ [SESSION] Ended session tracking for session={session_id[:8]}...")
             except Exception as e:
-                print(f"❌ [SESSION] Failed to end session: {e}")
+                logger.error(f"❌ [SESSION] Failed to end session: {e}")
 
             # Finalize agent session (long-term memory)
             if user_id and self.agent:
                 try:
                     await self.agent.finalize_session(user_id, session_id)
-                    print(f"✅ [MEMORY] Finalized long-term memory for session={session_id[:8]}...")
+                    logger.debug(f"✅ [MEMORY] Finalized long-term memory for session={session_id[:8]}...")
                 except Exception as e:
-                    print(f"⚠️ [MEMORY] Failed to finalize memory: {e}")
+                    logger.warning(f"⚠️ [MEMORY] Failed to finalize memory: {e}")
 
         except Exception as e:
-            print(f"❌ [DISCONNECT ERROR] session={session_id[:8]}...: {e}")
+            logger.error(f"❌ [DISCONNECT ERROR] session={session_id[:8]}...: {e}")
     
     async def send(self, session_id: str, message: dict):
         """Send message to WebSocket."""
         if not self.is_connected(session_id):
-            print(f"⚠️  [SEND] Cannot send - not connected: {session_id[:8]}...")
+            logger.warning(f"⚠️  [SEND] Cannot send - not connected: {session_id[:8]}...")
             return
         
         try:
             websocket = self.connections[session_id]
-            await websocket.send_text(json.dumps(message))
+            await websocket.send_text(orjson.dumps(message).decode())
             event = message.get('event', 'unknown')
-            print(f"📤 [SEND] {event} → session={session_id[:8]}...")
+            logger.debug(f"📤 [SEND] {event} → session={session_id[:8]}...")
         except Exception as e:
-            print(f"❌ [SEND ERROR] session={session_id[:8]}...: {e}")
+            logger.error(f"❌ [SEND ERROR] session={session_id[:8]}...: {e}")
             await self.disconnect(session_id)
     
     async def handle_audio_chunk(self, session_id: str, data: dict):
+        """Decode a base64 audio_chunk event and run it through the pipeline."""
+        audio_b64 = data.get("audio_chunk", "")
+        if not audio_b64:
+            logger.error(f"❌ [AUDIO] No audio data in chunk")
+            return
+
+        await self.process_audio(session_id, base64.b64decode(audio_b64), data.get("format", "webm"))
+
+    async def process_audio(self, session_id: str, audio_bytes: bytes, audio_format: str = "webm"):
         """Process audio chunk through full pipeline."""
         try:
-            print(f"🎤 [AUDIO IN] Processing chunk from session={session_id[:8]}...")
+            logger.debug(f"🎤 [AUDIO IN] Processing chunk from session={session_id[:8]}...")
             
             # Get user ID
             user_id = "anonymous"
@@ -134,23 +146,15 @@ class AudioWebSocketManager:
                     user_id = uid
                     break
             
-            # Decode audio
-            audio_b64 = data.get("audio_chunk", "")
-            if not audio_b64:
-                print(f"❌ [AUDIO] No audio data in chunk")
-                return
-                
-            audio_bytes = base64.b64decode(audio_b64)
-            audio_format = data.get("format", "webm")
-            print(f"📊 [AUDIO] Received {len(audio_bytes)} bytes, format={audio_format}")
+            logger.debug(f"📊 [AUDIO] Received {len(audio_bytes)} bytes, format={audio_format}")
             
             # Step 1: Transcribe audio
-            print(f"🔄 [ASR] Starting transcription...")
+            logger.debug(f"🔄 [ASR] Starting transcription...")
             transcription = await self.streaming_handler.transcribe_chunk(
                 audio_bytes, 
                 format=audio_format
             )
-            print(f"📝 [ASR] Transcribed: '{transcription}'")
+            logger.debug(f"📝 [ASR] Transcribed: '{transcription}'")
             
             # Send transcription to frontend
             await self.send(session_id, {
@@ -162,14 +166,14 @@ class AudioWebSocketManager:
             })
             
             # Step 2: Get agent response
-            print(f"🤖 [AGENT] Getting response...")
+            logger.debug(f"🤖 [AGENT] Getting response...")
             response_result = await self.agent.process_text_command(
                 user_id=user_id,
                 query=transcription,
                 session_id=session_id
             )
             response_text = response_result.get("response", "I didn't understand that.")
-            print(f"💬 [AGENT] Response: '{response_text[:50]}...'")
+            logger.debug(f"💬 [AGENT] Response: '{response_text[:50]}...'")
             
             # Send agent response text
             await self.send(session_id, {
@@ -181,7 +185,7 @@ class AudioWebSocketManager:
             })
             
             # Step 3: Generate and stream TTS audio
-            print(f"🔊 [TTS] Generating speech...")
+            logger.debug(f"🔊 [TTS] Generating speech...")
             chunk_count = 0
             async for audio_chunk in self.streaming_handler.stream_tts_audio(response_text):
                 await self.send(session_id, {
@@ -195,7 +199,7 @@ class AudioWebSocketManager:
                 })
                 chunk_count += 1
             
-            print(f"✅ [TTS] Sent {chunk_count} audio chunks")
+            logger.debug(f"✅ [TTS] Sent {chunk_count} audio chunks")
             
             # Send completion event
             await self.send(session_id, {
@@ -206,12 +210,10 @@ class AudioWebSocketManager:
                 }
             })
             
-            print(f"🎉 [COMPLETE] Full audio pipeline finished for session={session_id[:8]}...")
+            logger.debug(f"🎉 [COMPLETE] Full audio pipeline finished for session={session_id[:8]}...")
             
         except Exception as e:
-            print(f"❌ [AUDIO ERROR] session={session_id[:8]}...: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ [AUDIO ERROR] session={session_id[:8]}...: {e}")
             await self.send(session_id, {
                 "event": "error",
                 "data": {
@@ -225,7 +227,7 @@ class AudioWebSocketManager:
         try:
             # Get database ID from session state
             if session_id not in self.session_users:
-                print(f"⚠️  [HEARTBEAT] Session not found: {session_id[:8]}...")
+                logger.warning(f"⚠️  [HEARTBEAT] Session not found: {session_id[:8]}...")
                 return
 
             # Update last_heartbeat_at in database (non-blocking)
@@ -242,22 +244,31 @@ class AudioWebSocketManager:
                         }).eq("session_id", session_id).execute()
 
                     await asyncio.to_thread(_update)
-                    print(f"💓 [HEARTBEAT] Updated for session={session_id[:8]}...")
+                    logger.debug(f"💓 [HEARTBEAT] Updated for session={session_id[:8]}...")
                 except Exception as e:
-                    print(f"❌ [HEARTBEAT ERROR] Failed to update: {e}")
+                    logger.error(f"❌ [HEARTBEAT ERROR] Failed to update: {e}")
 
             # Run in background (don't block message processing)
             asyncio.create_task(_update_heartbeat())
 
         except Exception as e:
-            print(f"❌ [HEARTBEAT ERROR]: {e}")
+            logger.error(f"❌ [HEARTBEAT ERROR]: {e}")
+
+    async def handle_binary(self, session_id: str, payload: bytes):
+        """Handle a binary frame, which is always raw audio.
+
+        Control messages travel on text frames only; audio bytes can start with
+        any value, so the payload is never sniffed for JSON. Raw frames skip the
+        base64 and text round-trip of audio_chunk events.
+        """
+        await self.process_audio(session_id, payload)
 
-    async def handle_message(self, session_id: str, message: str):
+    async def handle_message(self, session_id: str, message: Union[str, bytes]):
         """Handle incoming WebSocket message."""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
             event = data.get("event")
-            print(f"📥 [RECV] {event} from session={session_id[:8]}...")
+            logger.debug(f"📥 [RECV] {event} from session={session_id[:8]}...")
             
             if event == "audio_chunk":
                 await self.handle_audio_chunk(session_id, data.get("data", {}))
@@ -274,12 +285,10 @@ class AudioWebSocketManager:
                     }
                 })
             else:
-                print(f"⚠️  [RECV] Unknown event: {event}")
+                logger.warning(f"⚠️  [RECV] Unknown event: {event}")
                 
         except Exception as e:
-            print(f"❌ [MESSAGE ERROR]: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ [MESSAGE ERROR]: {e}")
 
 
 # Global instance
@@ -1,16 +1,36 @@
 """Database connection and management for Supabase."""
 import asyncio
-from typing import Optional, Dict, Any, List
-from supabase import create_client
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, TypeVar
+import httpx
+from supabase import create_client, acreate_client, AsyncClient, AsyncClientOptions, ClientOptions
 from .config import get_settings
 
 settings = get_settings()
 
+T = TypeVar("T")
+
+# Dedicated threads for background session bookkeeping (conversation tracker, heartbeat monitor)
+# and user array RPCs, so their writes don't compete with request-path queries for the default to_thread pool
+BACKGROUND_DB_THREADS = 2
+_background_db_executor = ThreadPoolExecutor(
+    max_workers=BACKGROUND_DB_THREADS,
+    thread_name_prefix="db-background"
+)
+
+
+async def run_background_query(fn: Callable[[], T]) -> T:
+    """Run a synchronous Supabase call on the background DB threads."""
+    return await asyncio.get_running_loop().run_in_executor(_background_db_executor, fn)
+
 class DatabaseManager:
     """Supabase database manager."""
     
     def __init__(self):
         self.client = None
+        self.async_client: Optional[AsyncClient] = None
+        self.http_client: Optional[httpx.Client] = None
+        self.async_http_client: Optional[httpx.AsyncClient] = None
         self._initialized = False
     
     async def initialize(self):
@@ -22,9 +42,36 @@ class DatabaseManager:
             # Use service_role key for backend operations (bypasses RLS)
             # This is required for operations like updating user_notes with RLS enabled
             key = settings.supabase_service_key or settings.supabase_key
+
+            # Pooled keep-alive connections shared by every query (including to_thread calls)
+            limits = httpx.Limits(
+                max_connections=settings.db_pool_max_connections,
+                max_keepalive_connections=settings.db_pool_max_keepalive,
+                keepalive_expiry=settings.db_pool_keepalive_expiry_seconds
+            )
+            self.http_client = httpx.Client(
+                timeout=120.0,
+                follow_redirects=True,
+                http2=True,
+                limits=limits
+            )
             self.client = create_client(
                 settings.supabase_url,
-                key
+                key,
+                options=ClientOptions(httpx_client=self.http_client)
+            )
+
+            # Native async client for endpoints that await queries on the event loop (no threadpool hop)
+            self.async_http_client = httpx.AsyncClient(
+                timeout=120.0,
+                follow_redirects=True,
+                http2=True,
+                limits=limits
+            )
+            self.async_client = await acreate_client(
+                settings.supabase_url,
+                key,
+                options=AsyncClientOptions(httpx_client=self.async_http_client)
             )
             self._initialized = True
             print("✅ Supabase client initialized successfully")
@@ -39,7 +86,7 @@ class DatabaseManager:
                 await self.initialize()
             
             # Simple query to test connection
-            result = self.client.table('users').select('id').limit(1).execute()
+            await asyncio.to_thread(self.client.table('users').select('id').limit(1).execute)
             return True
         except Exception as e:
             print(f"❌ Database health check failed: {e}")
@@ -114,6 +161,86 @@ class DatabaseManager:
             print(f"❌ Error getting user preferences: {e}")
             return None
     
+    async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get preferences and voice settings for a user in one query.
+
+        Embeds user_voice_settings (FK user_id -> users.id) into the users row,
+        so PostgREST resolves the left join server-side.
+
+        Returns None only if the user doesn't exist; query errors are raised.
+        """
+        try:
+            def _fetch():
+                return (
+                    self.client
+                    .table('users')
+                    .select('preferred_topics, watchlist_stocks, user_voice_settings(*)')
+                    .eq('id', user_id)
+                    .execute()
+                )
+
+            result = await asyncio.to_thread(_fetch)
+        except Exception as e:
+            # Don't report a failed query as a missing user; let the route return a 500
+            print(f"❌ Error getting user profile: {e}")
+            raise
+
+        if not result.data:
+            return None
+
+        row = result.data[0]
+        voice_settings = row.get('user_voice_settings')
+        # One-to-one embeds come back as an object; fall back for a list-shaped relationship
+        if isinstance(voice_settings, list):
+            voice_settings = voice_settings[0] if voice_settings else None
+        return {
+            'preferences': {
+                'preferred_topics': row.get('preferred_topics') or [],
+                'watchlist_stocks': row.get('watchlist_stocks') or [],
+            },
+            'voice_settings': voice_settings,
+        }
+    
+    async def mutate_user_array(self, user_id: str, column: str, value: str,
+                                remove: bool = False) -> Optional[Dict[str, Any]]:
+        """Atomically add or remove one value in a users array column.
+
+        Runs the `mutate_user_array` RPC (database/functions.sql), so the
+        read-modify-write is a single UPDATE ... RETURNING and concurrent edits
+        cannot overwrite each other.
+
+        Args:
+            user_id: User UUID
+            column: 'preferred_topics' or 'watchlist_stocks'
+            value: Item to add or remove
+            remove: Remove the item instead of adding it
+
+        Returns:
+            {"items": [...], "changed": bool}, or None if the user doesn't exist
+
+        Raises:
+            Exception: If the RPC call fails (e.g. database unreachable or function missing)
+        """
+        try:
+            def _mutate():
+                return self.client.rpc('mutate_user_array', {
+                    'p_user_id': user_id,
+                    'p_column': column,
+                    'p_value': value,
+                    'p_remove': remove,
+                }).execute()
+
+            result = await run_background_query(_mutate)
+        except Exception as e:
+            # Don't report a failed call as a missing user; let the route return a 500
+            print(f"❌ Error updating {column} for user {user_id}: {e}")
+            raise
+
+        if not result.data:
+            return None
+        row = result.data[0]
+        return {'items': row.get('items') or [], 'changed': bool(row.get('changed'))}
+    
     async def create_conversation_session(self, user_id: str, session_id: str = None) -> Optional[Dict[str, Any]]:
         """Create new conversation session with required session_id."""
         import uuid
@@ -155,38 +282,91 @@ class DatabaseManager:
             print(f"❌ Error adding conversation message: {e}")
             return None
     
-    async def get_conversation_messages(self, session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get conversation messages for a session."""
+    async def get_conversation_messages(self, session_id: str, limit: int = 50,
+                                        role: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get conversation messages for a session, optionally filtered by role."""
         try:
-            result = self.client.table('conversation_messages').select('*').eq('session_id', session_id).order('created_at', desc=True).limit(limit).execute()
+            def _fetch():
+                query = self.client.table('conversation_messages').select('*').eq('session_id', session_id)
+
+                if role:
+                    query = query.eq('role', role)
+
+                return query.order('created_at', desc=True).limit(limit).execute()
+
+            result = await asyncio.to_thread(_fetch)
             return result.data or []
         except Exception as e:
             print(f"❌ Error getting conversation messages: {e}")
             return []
     
-    async def get_latest_news(self, topics: List[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get latest news articles."""
+    async def get_latest_news(self, topics: List[str] = None, limit: int = 10,
+                              breaking_only: bool = False,
+                              category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get latest news articles, filtering by topics/breaking/category in SQL."""
         try:
-            query = self.client.table('news_articles').select('*, news_sources(*)').order('published_at', desc=True).limit(limit)
+            # Inner-join the source when filtering on its category so non-matching rows are dropped
+            sources = 'news_sources!inner(*)' if category else 'news_sources(*)'
+            query = self.client.table('news_articles').select(f'*, {sources}')
             
             if topics:
                 query = query.overlaps('topics', topics)
+            if breaking_only:
+                query = query.eq('is_breaking', True)
+            if category:
+                query = query.eq('news_sources.category', category)
             
-            result = query.execute()
+            result = await asyncio.to_thread(query.order('published_at', desc=True).limit(limit).execute)
             return result.data or []
         except Exception as e:
             print(f"❌ Error getting latest news: {e}")
             return []
     
-    async def search_news(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search news articles."""
+    async def search_news(self, query: str, limit: int = 10,
+                          category: Optional[str] = None,
+                          topics: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Search news articles, filtering by category/topics in SQL."""
         try:
-            result = self.client.table('news_articles').select('*, news_sources(*)').text_search('title,summary', query).limit(limit).execute()
+            # Both filters compile into the one PostgREST request, so rows are matched in a single pass
+            sources = 'news_sources!inner(*)' if category else 'news_sources(*)'
+            request = self.client.table('news_articles').select(f'*, {sources}').text_search('title,summary', query)
+
+            if category:
+                request = request.eq('news_sources.category', category)
+            if topics:
+                request = request.overlaps('topics', topics)
+
+            result = await asyncio.to_thread(request.limit(limit).execute)
             return result.data or []
         except Exception as e:
             print(f"❌ Error searching news: {e}")
             return []
     
+    async def get_news_article(self, article_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single news article by ID."""
+        articles = await self.get_news_articles([article_id])
+        return articles[0] if articles else None
+    
+    async def get_news_articles(self, article_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several news articles by ID in a single query."""
+        if not article_ids:
+            return []
+        try:
+            def _fetch():
+                return (
+                    self.client
+                    .table('news_articles')
+                    .select('*, news_sources(*)')
+                    .in_('id', article_ids)
+                    .execute()
+                )
+
+            result = await asyncio.to_thread(_fetch)
+            return result.data or []
+        except Exception as e:
+            print(f"❌ Error getting news articles: {e}")
+            return []
+    
     async def get_stock_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get stock data for symbol."""
         try:
@@ -1,5 +1,5 @@
 """Database operations for stock prices."""
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from datetime import datetime
 import asyncio
 from supabase import Client
@@ -109,6 +109,77 @@ class StockPriceDB:
             print(f"❌ Error getting price history for {symbol}: {e}")
             return []
 
+    async def iter_price_history(
+        self,
+        symbol: str,
+        limit: int = 100,
+        before: Optional[datetime] = None,
+        page_size: int = 250,
+        before_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield historical price records page by page (newest first).
+
+        Pages are fetched by keyset on (last_updated, id) rather than OFFSET, so
+        each round-trip is an index range scan no matter how deep the client
+        pages, and rows sharing a timestamp are never skipped at a page edge.
+
+        Args:
+            symbol: Stock ticker symbol
+            limit: Maximum number of records
+            before: Only return records older than this (the previous page's oldest row)
+            page_size: Rows fetched per round-trip
+            before_id: id of that oldest row; rows at exactly ``before`` with a lower id follow it
+
+        Yields:
+            Price records
+
+        Raises:
+            Exception: If a page fetch fails, so callers can tell a cut-off history from a complete one
+        """
+        cursor = (before.isoformat() if before else None, before_id)
+        remaining = limit
+        while remaining > 0:
+            size = min(page_size, remaining)
+            cursor_ts, cursor_id = cursor
+
+            def _fetch():
+                query = (
+                    self.client
+                    .table('stock_prices')
+                    .select('*')
+                    .eq('symbol', symbol.upper())
+                )
+                if cursor_ts and cursor_id:
+                    query = query.or_(
+                        f'last_updated.lt."{cursor_ts}",'
+                        f'and(last_updated.eq."{cursor_ts}",id.lt.{cursor_id})'
+                    )
+                elif cursor_ts:
+                    query = query.lt('last_updated', cursor_ts)
+                return (
+                    query
+                    .order('last_updated', desc=True)
+                    .order('id', desc=True)
+                    .limit(size)
+                    .execute()
+                )
+
+            try:
+                result = await asyncio.to_thread(_fetch)
+            except Exception as e:
+                print(f"❌ Error getting price history for {symbol}: {e}")
+                raise
+
+            rows = result.data or []
+            for row in rows:
+                yield row
+
+            if len(rows) < size:
+                return
+            remaining -= len(rows)
+            cursor = (rows[-1]['last_updated'], rows[-1].get('id'))
+
     async def get_multiple_latest_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
         """
         Get latest prices for multiple symbols.
@@ -189,22 +189,18 @@ class LFUCacheManager:
 
         try:
             # Get keys with lowest LFU scores from Redis
-            response = await self.client.post(
-                f"{self.base_url}/zrange/{cache_type}:lfu/0/{limit - 1}/WITHSCORES"
-            )
-
-            if response.status_code == 200:
-                result = response.json().get("result", [])
-                # Result is [key1, score1, key2, score2, ...]
-                candidates = []
-                for i in range(0, len(result), 2):
-                    if i + 1 < len(result):
-                        cache_key = result[i]
-                        score = float(result[i + 1])
-                        candidates.append((cache_key, score))
-                return candidates
-
-            return []
+            result = await self._command(
+                "ZRANGE", f"{cache_type}:lfu", 0, limit - 1, "WITHSCORES"
+            ) or []
+
+            # Result is [key1, score1, key2, score2, ...]
+            candidates = []
+            for i in range(0, len(result), 2):
+                if i + 1 < len(result):
+                    cache_key = result[i]
+                    score = float(result[i + 1])
+                    candidates.append((cache_key, score))
+            return candidates
 
         except Exception as e:
             print(f"❌ Error getting LFU candidates: {e}")
@@ -225,13 +221,17 @@ class LFUCacheManager:
             # Get candidates for eviction
             candidates = await self.get_lfu_candidates_for_eviction(cache_type, count)
 
-            for cache_key, score in candidates:
-                # Remove from cache
-                await self._redis_delete(cache_key)
+            if not candidates:
+                return
 
-                # Remove from LFU tracking
-                await self._redis_zrem(f"{cache_type}:lfu", cache_key)
+            # Drop the cached values and their LFU tracking in one round-trip
+            keys = [cache_key for cache_key, _ in candidates]
+            await self._pipeline([
+                ["DEL", *keys],
+                ["ZREM", f"{cache_type}:lfu", *keys]
+            ])
 
+            for cache_key, score in candidates:
                 print(f"🗑️  Evicted LFU entry: {cache_key} (score: {score:.4f})")
 
         except Exception as e:
@@ -253,21 +253,17 @@ class LFUCacheManager:
 
         try:
             # Get keys with highest LFU scores from Redis
-            response = await self.client.post(
-                f"{self.base_url}/zrevrange/{cache_type}:lfu/0/{limit - 1}/WITHSCORES"
-            )
-
-            if response.status_code == 200:
-                result = response.json().get("result", [])
-                hot_keys = []
-                for i in range(0, len(result), 2):
-                    if i + 1 < len(result):
-                        cache_key = result[i]
-                        score = float(result[i + 1])
-                        hot_keys.append((cache_key, score))
-                return hot_keys
-
-            return []
+            result = await self._command(
+                "ZREVRANGE", f"{cache_type}:lfu", 0, limit - 1, "WITHSCORES"
+            ) or []
+
+            hot_keys = []
+            for i in range(0, len(result), 2):
+                if i + 1 < len(result):
+                    cache_key = result[i]
+                    score = float(result[i + 1])
+                    hot_keys.append((cache_key, score))
+            return hot_keys
 
         except Exception as e:
             print(f"❌ Error getting hot keys: {e}")
@@ -302,10 +298,7 @@ class LFUCacheManager:
                 hot_keys = await self.get_hot_keys(ct, 10)
 
                 # Get total keys count
-                response = await self.client.get(f"{self.base_url}/zcard/{ct}:lfu")
-                total_keys = 0
-                if response.status_code == 200:
-                    total_keys = response.json().get("result", 0)
+                total_keys = await self._command("ZCARD", f"{ct}:lfu") or 0
 
                 # Get database stats
                 db_stats_query = """
@@ -341,14 +334,28 @@ class LFUCacheManager:
 
     # ==================== Redis Helper Methods ====================
 
+    async def _command(self, *command: Any) -> Any:
+        """
+        Run one Redis command against the Upstash REST API.
+
+        The command is POSTed as a JSON array to the base URL, so keys and
+        members travel in the body and never need URL-encoding.
+        """
+        response = await self.client.post(self.base_url, json=list(command))
+        response.raise_for_status()
+        return response.json().get("result")
+
+    async def _pipeline(self, commands: List[List[Any]]) -> List[Any]:
+        """Run several Redis commands in one round-trip via Upstash /pipeline."""
+        response = await self.client.post(f"{self.base_url}/pipeline", json=commands)
+        response.raise_for_status()
+        return [entry.get("result") for entry in response.json()]
+
     async def _redis_zadd(self, key: str, score: float, member: str) -> bool:
         """Add member to sorted set with score."""
         try:
-            response = await self.client.post(
-                f"{self.base_url}/zadd/{key}",
-                json=[score, member]
-            )
-            return response.status_code == 200
+            await self._command("ZADD", key, score, member)
+            return True
         except Exception as e:
             print(f"❌ Redis ZADD error: {e}")
             return False
@@ -356,11 +363,8 @@ class LFUCacheManager:
     async def _redis_zrem(self, key: str, member: str) -> bool:
         """Remove member from sorted set."""
         try:
-            response = await self.client.post(
-                f"{self.base_url}/zrem/{key}",
-                json=[member]
-            )
-            return response.status_code == 200
+            await self._command("ZREM", key, member)
+            return True
         except Exception as e:
             print(f"❌ Redis ZREM error: {e}")
             return False
@@ -368,8 +372,8 @@ class LFUCacheManager:
     async def _redis_delete(self, key: str) -> bool:
         """Delete key from Redis."""
         try:
-            response = await self.client.post(f"{self.base_url}/del/{key}")
-            return response.status_code == 200
+            await self._command("DEL", key)
+            return True
         except Exception as e:
             print(f"❌ Redis DELETE error: {e}")
             return False
@@ -377,10 +381,8 @@ class LFUCacheManager:
     async def _redis_zincrby(self, key: str, increment: float, member: str) -> bool:
         """Increment score of member in sorted set."""
         try:
-            response = await self.client.post(
-                f"{self.base_url}/zincrby/{key}/{increment}/{member}"
-            )
-            return response.status_code == 200
+            await self._command("ZINCRBY", key, increment, member)
+            return True
         except Exception as e:
             print(f"❌ Redis ZINCRBY error: {e}")
             return False
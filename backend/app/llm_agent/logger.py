@@ -155,6 +155,45 @@ class AgentLogger:
         }
         self.session_logger.info(json.dumps(entry))
 
+    def log_turn(
+        self,
+        query: str,
+        response: str,
+        processing_time_ms: int,
+        source: str = "websocket",
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Log a completed query/response turn as one entry.
+
+        Equivalent to log_query_received + log_response_sent, but written
+        once after the turn so each request costs a single log write.
+
+        Args:
+            query: User query text
+            response: Response text
+            processing_time_ms: Total processing time
+            source: Source of query (websocket, api, etc.)
+            metadata: Additional metadata (intent, symbols, etc.)
+        """
+        if not self.current_session_id:
+            return
+
+        entry = {
+            "session_id": self.current_session_id,
+            "timestamp": datetime.now().isoformat(),
+            "event": "turn",
+            "data": {
+                "query": query,
+                "source": source,
+                "query_length": len(query),
+                "response": response[:500],  # Truncate long responses
+                "response_length": len(response),
+                "processing_time_ms": processing_time_ms,
+                "metadata": metadata or {}
+            }
+        }
+        self.session_logger.info(json.dumps(entry))
+
     def log_intent_analysis(
         self,
         query: str,
@@ -393,6 +432,17 @@ def log_response(response: str, processing_time_ms: int, metadata: Optional[Dict
     agent_logger.log_response_sent(response, processing_time_ms, metadata)
 
 
+def log_turn(
+    query: str,
+    response: str,
+    processing_time_ms: int,
+    source: str = "websocket",
+    metadata: Optional[Dict[str, Any]] = None
+):
+    """Log a completed query/response turn."""
+    agent_logger.log_turn(query, response, processing_time_ms, source, metadata)
+
+
 def log_intent(query: str, intents: List[Dict[str, Any]], processing_time_ms: int):
     """Log intent analysis."""
     agent_logger.log_intent_analysis(query, intents, processing_time_ms)
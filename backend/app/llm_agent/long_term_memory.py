@@ -335,7 +335,7 @@ class UserProfileManager:
 
         # Keep only last 20 sessions
         if len(self.profile.session_history) > 20:
-            self.profile.session_history = self.profile.session_history[-20:]
+            del self.profile.session_history[:-20]
 
         # Update trending symbols (last 10 sessions)
         recent_sessions = self.profile.session_history[-10:]
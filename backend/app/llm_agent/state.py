@@ -58,9 +58,9 @@ class IntentItem:
     watchlist_action: Optional[str] = None  # For watchlist intent: "add", "remove", or "view"
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
-    """Single message in chat history."""
+    """Single message in chat history (slotted: one is allocated per message, every turn)."""
     role: Literal["user", "assistant"]
     content: str
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
@@ -8,7 +8,8 @@ from datetime import datetime
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from .config import get_settings
 from .database import get_database
 from .cache import get_cache  # Legacy cache manager from cache.py
@@ -19,7 +20,7 @@ from .api import websocket_simple
 from .api.conversation_session import router as conversation_session_router
 from .api import voice_settings
 from .api.user.settings.voice import router as user_voice_settings_router
-from .utils.logger import get_logger
+from .utils.logger import get_logger, start_log_queue, stop_log_queue
 from .utils.conversation_logger import get_conversation_logger
 
 settings = get_settings()
@@ -41,6 +42,7 @@ async def lifespan(app: FastAPI):
         console_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
         logger.addHandler(file_handler)
         logger.addHandler(console_handler)
+    start_log_queue(logger.handlers)
 
     logger.info("🚀 Starting Voice News Agent Backend...")
     
@@ -56,6 +58,8 @@ async def lifespan(app: FastAPI):
                 try:
                     db = await asyncio.wait_for(get_database(), timeout=10.0)
                     await asyncio.wait_for(db.initialize(), timeout=10.0)
+                    # One round-trip opens a pooled connection before the first user request needs it
+                    await asyncio.wait_for(db.health_check(), timeout=10.0)
                     logger.info("✅ Database initialized")
                 except asyncio.TimeoutError:
                     logger.warning("⚠️ Database initialization timed out - continuing without DB")
@@ -69,12 +73,33 @@ async def lifespan(app: FastAPI):
                 try:
                     cache = await asyncio.wait_for(get_cache(), timeout=10.0)
                     await asyncio.wait_for(cache.initialize(), timeout=10.0)
+                    # Round-trip once so the TLS/HTTP2 session is open before the first request
+                    await asyncio.wait_for(cache.health_check(), timeout=10.0)
                     logger.info("✅ Cache initialized")
                 except asyncio.TimeoutError:
                     logger.warning("⚠️ Cache initialization timed out - continuing without cache")
                 except Exception as e:
                     logger.warning(f"⚠️ Cache initialization failed: {e} - continuing without cache")
             
+            # Warm the stock services so their lazy setup (DB wrapper, LFU cache) is off the request path
+            if settings.is_database_configured():
+                try:
+                    from .services import get_stock_price_service, get_stock_news_service
+                    # Not wrapped in wait_for: cancelling mid-init would leave a half-built singleton
+                    await get_stock_price_service()
+                    await get_stock_news_service()
+                    logger.info("✅ Stock services initialized")
+                except Exception as e:
+                    logger.warning(f"⚠️ Stock service initialization failed: {e} - will initialize on first use")
+            
+            # Build the shared agent (graph compile, memory stores) before the first WS session needs it
+            try:
+                from .core.agent_wrapper_langgraph import get_agent
+                await get_agent()
+                logger.info("✅ Agent initialized")
+            except Exception as e:
+                logger.warning(f"⚠️ Agent initialization failed: {e} - will initialize on first use")
+
             # Initialize WebSocket manager (this should be fast)
             try:
                 ws_manager = await get_websocket_manager()
@@ -206,7 +231,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"⚠️ Scheduler shutdown error: {e}")
 
+    # Close cache connections
+    try:
+        from .cache import cache_manager
+        await cache_manager.close()
+        logger.info("✅ Cache connections closed")
+    except Exception as e:
+        logger.warning(f"⚠️ Cache shutdown error: {e}")
+
     logger.info("✅ Backend shutdown complete!")
+    stop_log_queue()
 
 
 # Create FastAPI application
@@ -216,6 +250,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -228,6 +263,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON payloads (news lists, session turns) for clients that accept gzip
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.gzip_minimum_size,
+    compresslevel=settings.gzip_compress_level,
+)
+
 # Add request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -237,8 +279,11 @@ async def log_requests(request: Request, call_next):
     # Log request
     logger.info(f"📥 HTTP | {request.method} {request.url.path} | client={request.client.host if request.client else 'unknown'}")
     
-    # Process request
-    response = await call_next(request)
+    # Process request (unhandled route errors become the structured 500 instead of propagating)
+    try:
+        response = await call_next(request)
+    except Exception as exc:
+        response = await internal_error_handler(request, exc)
     
     # Calculate duration
     duration_ms = int((time.time() - start_time) * 1000)
@@ -262,7 +307,7 @@ app.include_router(user_voice_settings_router)  # User voice settings at /api/us
 
 # Include Stock & News API v1 router
 from .api.v1 import api_v1_router
-app.include_router(api_v1_router, prefix="/api/v1", tags=["v1"])
+app.include_router(api_v1_router)
 
 
 @app.get("/health")
@@ -466,14 +511,18 @@ async def not_found_handler(request, exc):
     )
 
 
-@app.exception_handler(500)
+@app.exception_handler(Exception)
 async def internal_error_handler(request, exc):
-    """Handle 500 errors."""
-    return JSONResponse(
+    """Log unhandled route errors with their traceback and return a generic 500."""
+    logging.getLogger("voice_news_agent").exception(
+        "Unhandled error in %s %s", request.method, request.url.path, exc_info=exc
+    )
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
             "message": "An internal server error occurred",
+            "detail": f"Internal error in {request.url.path}",
             "path": str(request.url)
         }
     )
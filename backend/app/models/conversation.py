@@ -14,8 +14,8 @@ class ConversationMessage(BaseModel):
     audio_url: Optional[str] = Field(None, description="Audio file URL")
     processing_time_ms: Optional[int] = Field(None, description="Processing time")
     confidence_score: Optional[float] = Field(None, description="Confidence score")
-    referenced_news_ids: List[str] = Field(default=[], description="Referenced news article IDs")
-    metadata: Dict[str, Any] = Field(default={}, description="Additional metadata")
+    referenced_news_ids: List[str] = Field(default_factory=list, description="Referenced news article IDs")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
     created_at: datetime = Field(..., description="Message timestamp")
 
 
@@ -27,22 +27,36 @@ class ConversationSession(BaseModel):
     session_end: Optional[datetime] = Field(None, description="Session end time")
     total_interactions: int = Field(default=0, description="Total interactions")
     voice_interruptions: int = Field(default=0, description="Voice interruptions count")
-    topics_discussed: List[str] = Field(default=[], description="Topics discussed")
+    topics_discussed: List[str] = Field(default_factory=list, description="Topics discussed")
     is_active: bool = Field(default=True, description="Session active status")
     messages: Optional[List[ConversationMessage]] = Field(None, description="Session messages")
 
 
-class ConversationMessageCreate(BaseModel):
-    """Conversation message creation model."""
-    session_id: str = Field(..., description="Session ID")
+class ConversationMessageBody(BaseModel):
+    """Conversation message payload when the session ID comes from the URL path."""
     user_id: str = Field(..., description="User ID")
     message_type: str = Field(..., description="Message type")
     content: str = Field(..., description="Message content")
     audio_url: Optional[str] = Field(None, description="Audio file URL")
     processing_time_ms: Optional[int] = Field(None, description="Processing time")
     confidence_score: Optional[float] = Field(None, description="Confidence score")
-    referenced_news_ids: List[str] = Field(default=[], description="Referenced news article IDs")
-    metadata: Dict[str, Any] = Field(default={}, description="Additional metadata")
+    referenced_news_ids: List[str] = Field(default_factory=list, description="Referenced news article IDs")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+
+    def message_metadata(self) -> Dict[str, Any]:
+        """Merge the typed message fields with caller metadata (caller keys win)."""
+        return {
+            "audio_url": self.audio_url,
+            "processing_time_ms": self.processing_time_ms,
+            "confidence_score": self.confidence_score,
+            "referenced_news_ids": self.referenced_news_ids,
+            **self.metadata
+        }
+
+
+class ConversationMessageCreate(ConversationMessageBody):
+    """Conversation message creation model."""
+    session_id: str = Field(..., description="Session ID")
 
 
 class ConversationSessionCreate(BaseModel):
@@ -92,8 +106,8 @@ class ConversationContext(BaseModel):
     current_topics: List[str] = Field(..., description="Current topics")
     user_preferences: Dict[str, Any] = Field(..., description="User preferences")
     conversation_memory: Dict[str, Any] = Field(..., description="Conversation memory")
-    last_news_items: List[str] = Field(default=[], description="Last discussed news items")
-    last_stock_queries: List[str] = Field(default=[], description="Last stock queries")
+    last_news_items: List[str] = Field(default_factory=list, description="Last discussed news items")
+    last_stock_queries: List[str] = Field(default_factory=list, description="Last stock queries")
 
 
 class ConversationInsight(BaseModel):
@@ -103,7 +117,7 @@ class ConversationInsight(BaseModel):
     confidence: float = Field(..., description="Insight confidence")
     relevance_score: float = Field(..., description="Relevance score")
     timestamp: datetime = Field(..., description="Insight timestamp")
-    metadata: Dict[str, Any] = Field(default={}, description="Additional metadata")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
 class ConversationAnalytics(BaseModel):
@@ -113,8 +127,8 @@ class ConversationAnalytics(BaseModel):
     total_messages: int = Field(default=0, description="Total messages")
     average_session_duration_minutes: float = Field(default=0.0, description="Average session duration")
     average_messages_per_session: float = Field(default=0.0, description="Average messages per session")
-    most_discussed_topics: List[str] = Field(default=[], description="Most discussed topics")
-    peak_usage_hours: List[int] = Field(default=[], description="Peak usage hours")
+    most_discussed_topics: List[str] = Field(default_factory=list, description="Most discussed topics")
+    peak_usage_hours: List[int] = Field(default_factory=list, description="Peak usage hours")
     interruption_rate: float = Field(default=0.0, description="Interruption rate")
     user_satisfaction_score: float = Field(default=0.0, description="User satisfaction score")
     last_active: Optional[datetime] = Field(None, description="Last activity timestamp")
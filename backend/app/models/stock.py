@@ -1,9 +1,16 @@
 """Stock-related Pydantic models."""
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Annotated, Optional, List, Dict, Any
+from pydantic import BaseModel, Field, StringConstraints
 from datetime import datetime
 
 
+# Ticker symbol, validated and uppercased once at parse time (e.g. "brk.b" -> "BRK.B")
+StockSymbol = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, to_upper=True, pattern=r"^[A-Za-z0-9.\-]{1,10}$")
+]
+
+
 class StockData(BaseModel):
     """Stock data model."""
     id: str = Field(..., description="Stock data ID")
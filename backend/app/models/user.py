@@ -2,6 +2,7 @@
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
+from .stock import StockSymbol
 
 
 class UserBase(BaseModel):
@@ -30,9 +31,6 @@ class User(UserBase):
     last_active: datetime = Field(..., description="Last activity timestamp")
     preferences: Optional[Dict[str, Any]] = None
 
-    class Config:
-        from_attributes = True
-
 
 class UserPreferences(BaseModel):
     """User preferences model."""
@@ -111,4 +109,4 @@ class AddTopicRequest(BaseModel):
 class AddWatchlistRequest(BaseModel):
     """Request model for adding a stock to watchlist."""
     user_id: str = Field(..., description="User ID")
-    symbol: str = Field(..., description="Stock symbol to add")
+    symbol: StockSymbol = Field(..., description="Stock symbol to add")
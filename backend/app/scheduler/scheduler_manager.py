@@ -127,7 +127,7 @@ class SchedulerManager:
             from ..database import db_manager
 
             # Get popular stocks from config
-            popular_symbols = {s.strip() for s in settings.popular_stocks.split(',') if s.strip()}
+            popular_symbols = set(settings.popular_stocks_list)
 
             # Get all watchlist symbols from users
             watchlist_symbols = await self._get_all_watchlist_symbols()
@@ -224,7 +224,7 @@ class SchedulerManager:
             from ..database import db_manager
 
             # Get popular stocks list
-            symbols = [s.strip() for s in settings.popular_stocks.split(',') if s.strip()]
+            symbols = settings.popular_stocks_list
             if not symbols:
                 logger.warning("⚠️ No popular stocks configured")
                 return
@@ -1,6 +1,7 @@
 """Stock price service with LFU caching and multi-source fetching."""
+import asyncio
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime, timezone
 import json
 from ..db.stock_prices import StockPriceDB
@@ -10,6 +11,9 @@ from ..external.finnhub_client import get_finnhub_client
 from ..external.polygon_client import get_polygon_client
 from ..database import db_manager
 
+# Upper bound on concurrent per-symbol lookups in a batch (keeps external API bursts polite)
+BATCH_PRICE_CONCURRENCY = 10
+
 
 class StockPriceService:
     """
@@ -45,7 +49,8 @@ class StockPriceService:
     async def get_stock_price(
         self,
         symbol: str,
-        refresh: bool = False
+        refresh: bool = False,
+        check_redis: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Get stock price with smart fallback: Redis → Database → API.
@@ -58,6 +63,7 @@ class StockPriceService:
         Args:
             symbol: Stock ticker symbol
             refresh: Force cache refresh (skip Redis/DB, go straight to API)
+            check_redis: Look in Redis first (False when a batch MGET already missed)
 
         Returns:
             Stock price data with cache metadata
@@ -68,33 +74,13 @@ class StockPriceService:
         cache_key = f"stock:price:{symbol.upper()}"
         start_time = time.time()
 
-        # Step 1: Try Redis cache first (unless refresh requested)
-        if not refresh:
+        # Step 1: Try Redis cache first (unless refresh requested or the caller already checked it)
+        if not refresh and check_redis:
             cached_data = await cache_manager.get(cache_key)
             if cached_data:
-                # Check if data is fresh (< 2 minutes old)
-                last_updated = cached_data.get("last_updated")
-                if last_updated:
-                    if isinstance(last_updated, str):
-                        last_updated = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
-
-                    # Ensure timezone-aware
-                    if last_updated.tzinfo is None:
-                        last_updated = last_updated.replace(tzinfo=timezone.utc)
-
-                    age_minutes = (datetime.now(timezone.utc) - last_updated).total_seconds() / 60
-
-                    if age_minutes < 2:  # Fresh data
-                        # Track LFU access
-                        await self.lfu_cache.track_access(cache_key, "stock_price")
-
-                        return {
-                            **cached_data,
-                            "source": "redis",
-                            "cache_hit": True,
-                            "age_minutes": round(age_minutes, 2),
-                            "response_time_ms": int((time.time() - start_time) * 1000)
-                        }
+                redis_hit = await self._fresh_redis_hit(cache_key, cached_data, start_time)
+                if redis_hit:
+                    return redis_hit
 
         # Step 2: Try Database (check for recent data)
         if not refresh:
@@ -182,6 +168,39 @@ class StockPriceService:
 
         return None
 
+    async def _fresh_redis_hit(
+        self,
+        cache_key: str,
+        cached_data: Dict[str, Any],
+        start_time: float
+    ) -> Optional[Dict[str, Any]]:
+        """Return a Redis-hit result if the cached price is fresh (< 2 minutes old)."""
+        last_updated = cached_data.get("last_updated")
+        if not last_updated:
+            return None
+
+        if isinstance(last_updated, str):
+            last_updated = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
+
+        # Ensure timezone-aware
+        if last_updated.tzinfo is None:
+            last_updated = last_updated.replace(tzinfo=timezone.utc)
+
+        age_minutes = (datetime.now(timezone.utc) - last_updated).total_seconds() / 60
+        if age_minutes >= 2:
+            return None
+
+        # Track LFU access
+        await self.lfu_cache.track_access(cache_key, "stock_price")
+
+        return {
+            **cached_data,
+            "source": "redis",
+            "cache_hit": True,
+            "age_minutes": round(age_minutes, 2),
+            "response_time_ms": int((time.time() - start_time) * 1000)
+        }
+
     async def get_multiple_prices(
         self,
         symbols: List[str],
@@ -200,27 +219,79 @@ class StockPriceService:
             refresh: Force cache refresh
 
         Returns:
-            Dictionary mapping symbol to price data
+            Dictionary mapping symbol to price data (in request order)
         """
-        results = {}
+        results: Dict[str, Optional[Dict[str, Any]]] = {symbol.upper(): None for symbol in symbols}
+        async for symbol, price_data in self.iter_multiple_prices(symbols, refresh):
+            results[symbol] = price_data
+        return results
+
+    async def iter_multiple_prices(
+        self,
+        symbols: List[str],
+        refresh: bool = False
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Yield (symbol, price data) pairs as each symbol's lookup finishes.
+
+        Same lookup path as get_multiple_prices (one Redis MGET, then bounded
+        concurrent DB/API fetches for the misses), but results come out in
+        completion order so callers can stream them.
+
+        Args:
+            symbols: List of stock ticker symbols
+            refresh: Force cache refresh
+
+        Yields:
+            (uppercase symbol, price data or None) pairs
+        """
+        if not self.lfu_cache:
+            await self.initialize()
+
         missing_symbols = []
+        semaphore = asyncio.Semaphore(BATCH_PRICE_CONCURRENCY)
+        start_time = time.time()
 
-        # Fetch prices concurrently (simplified - could use asyncio.gather)
-        for symbol in symbols:
-            price_data = await self.get_stock_price(symbol, refresh)
-            results[symbol.upper()] = price_data
+        # One MGET round-trip for every symbol instead of a Redis GET per symbol
+        cached = {}
+        if not refresh:
+            keys = [f"stock:price:{symbol.upper()}" for symbol in symbols]
+            cached = await cache_manager.get_multiple(keys)
+
+        async def fetch_one(symbol: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+            cache_key = f"stock:price:{symbol.upper()}"
+            try:
+                if cached.get(cache_key):
+                    redis_hit = await self._fresh_redis_hit(cache_key, cached[cache_key], start_time)
+                    if redis_hit:
+                        return symbol.upper(), redis_hit
+                async with semaphore:
+                    return symbol.upper(), await self.get_stock_price(symbol, refresh, check_redis=False)
+            except Exception as e:
+                # One failing symbol must not sink the whole batch
+                print(f"⚠️ Warning: Could not fetch price for {symbol.upper()}: {e}")
+                return symbol.upper(), None
+
+        tasks = [asyncio.create_task(fetch_one(symbol)) for symbol in symbols]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                symbol, price_data = await next_done
+
+                # Track symbols that were not in cache/DB (source="api")
+                # These are new symbols that should be added to scheduler
+                if price_data and price_data.get("source") == "api":
+                    missing_symbols.append(symbol)
 
-            # Track symbols that were not in cache/DB (source="api")
-            # These are new symbols that should be added to scheduler
-            if price_data and price_data.get("source") == "api":
-                missing_symbols.append(symbol.upper())
+                yield symbol, price_data
+        finally:
+            # A consumer that stops early (e.g. a disconnected stream) leaves nothing running
+            for task in tasks:
+                task.cancel()
 
         # Add missing symbols to scheduler for future updates
         if missing_symbols:
             await self._add_symbols_to_scheduler(missing_symbols)
 
-        return results
-
     async def _add_symbols_to_scheduler(self, symbols: List[str]):
         """
         Add new symbols to the scheduler's tracked list.
@@ -359,6 +430,31 @@ class StockPriceService:
         """
         return await self.stock_price_db.get_price_history(symbol, limit)
 
+    async def iter_price_history(
+        self,
+        symbol: str,
+        limit: int = 100,
+        before: Optional[datetime] = None,
+        before_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream historical price data for a symbol, one record at a time.
+
+        Args:
+            symbol: Stock ticker symbol
+            limit: Maximum number of records
+            before: Keyset cursor; only records updated before this time
+            before_id: Tie-break id for records updated exactly at ``before``
+
+        Yields:
+            Historical price records (newest first)
+        """
+        if not self.stock_price_db:
+            await self.initialize()
+
+        async for row in self.stock_price_db.iter_price_history(symbol, limit, before=before, before_id=before_id):
+            yield row
+
 
 # Global instance
 _stock_price_service: Optional[StockPriceService] = None
@@ -13,13 +13,13 @@ import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import logging
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConversationTurn:
-    """Represents a single conversation turn."""
+    """Represents a single conversation turn (immutable once logged)."""
     session_id: str
     user_id: str
     timestamp: str
@@ -33,21 +33,17 @@ class ConversationTurn:
     metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionInfo:
-    """Represents a conversation session."""
+    """Represents a conversation session (mutable: turns and totals grow while active)."""
     session_id: str
     user_id: str
     session_start: str
     session_end: Optional[str] = None
-    turns: List[ConversationTurn] = None
+    turns: List[ConversationTurn] = field(default_factory=list)
     total_turns: int = 0
     total_interruptions: int = 0
 
-    def __post_init__(self):
-        if self.turns is None:
-            self.turns = []
-
 
 class ConversationLogger:
     """Comprehensive conversation logger for voice interactions."""
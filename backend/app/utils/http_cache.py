@@ -0,0 +1,58 @@
+"""HTTP caching helpers for precomputed JSON payloads (ETag / conditional GET)."""
+import hashlib
+from typing import Any, Tuple
+
+import orjson
+from fastapi import Request, Response
+
+# Short-lived market data: browsers reuse it for 30s, shared caches (CDN/nginx) for 60s
+EDGE_CACHE_CONTROL = "public, max-age=30, s-maxage=60, stale-while-revalidate=120"
+
+# Payloads that only change with a deploy
+STATIC_CACHE_CONTROL = "public, max-age=3600, immutable"
+
+
+def precompute_json(content: Any) -> Tuple[bytes, str]:
+    """Serialize content once and derive a strong ETag from the bytes.
+
+    Args:
+        content: JSON-serializable payload
+
+    Returns:
+        Tuple of (serialized body, quoted ETag)
+    """
+    body = orjson.dumps(content)
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def cached_json_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    cache_control: str
+) -> Response:
+    """Return prebuilt JSON bytes, or an empty 304 when the client copy is current."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def set_cache_headers(response: Response, cache_control: str) -> None:
+    """Mark a response as cacheable by browsers and edge caches.
+
+    Vary: Accept-Encoding keeps gzip and identity variants apart in shared caches.
+    """
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Accept-Encoding"
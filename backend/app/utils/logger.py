@@ -1,9 +1,16 @@
 """Logging utility for Voice News Agent Backend."""
 import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+# Loggers on the WebSocket and cache hot paths; their records are handed to a
+# background thread so formatting and stream I/O stay off the event loop
+HOT_PATH_LOGGERS = ("voice_news_agent.ws", "voice_news_agent.cache")
+LOG_QUEUE_MAXSIZE = 10_000
 
 class VoiceAgentLogger:
     """Custom logger for voice agent with detailed flow tracking."""
@@ -103,3 +110,55 @@ def get_logger() -> VoiceAgentLogger:
     """Get the voice agent logger."""
     return voice_logger
 
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records rather than blocking when the queue is full.
+
+    Records are queued as-is: the listener runs in this process, so the
+    message and any traceback are formatted on its thread, not the caller's.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+_log_listener: Optional[QueueListener] = None
+
+
+def start_log_queue(handlers: List[logging.Handler]):
+    """Route the hot-path loggers through a bounded queue drained by ``handlers``."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    for name in HOT_PATH_LOGGERS:
+        hot_logger = logging.getLogger(name)
+        hot_logger.addHandler(queue_handler)
+        hot_logger.propagate = False
+
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+
+
+def stop_log_queue():
+    """Flush queued records and restore direct logging for the hot-path loggers."""
+    global _log_listener
+    if _log_listener is None:
+        return
+
+    _log_listener.stop()
+    _log_listener = None
+    for name in HOT_PATH_LOGGERS:
+        hot_logger = logging.getLogger(name)
+        for handler in [h for h in hot_logger.handlers if isinstance(h, DroppingQueueHandler)]:
+            hot_logger.removeHandler(handler)
+        hot_logger.propagate = True
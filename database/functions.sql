@@ -0,0 +1,41 @@
+-- Postgres functions called by the backend through Supabase RPC.
+-- Apply after database/schema.sql (make db-apply runs both); every statement is idempotent.
+
+-- Atomically add or remove one value in a users array column.
+-- Used by DatabaseManager.mutate_user_array for topic/watchlist edits.
+-- Returns no row if the user does not exist.
+create or replace function mutate_user_array(
+    p_user_id uuid, p_column text, p_value text, p_remove boolean
+) returns table(items text[], changed boolean) language plpgsql as $$
+begin
+    if p_column not in ('preferred_topics', 'watchlist_stocks') then
+        raise exception 'unsupported column %', p_column;
+    end if;
+    return query execute format(
+        'with prev as (select %1$I as old from users where id = $1 for update)
+         update users u set %1$I = case
+             when $3 then array_remove(coalesce(u.%1$I, ''{}''), $2)
+             when $2 = any(coalesce(u.%1$I, ''{}'')) then u.%1$I
+             else array_append(coalesce(u.%1$I, ''{}''), $2) end
+         from prev where u.id = $1
+         returning u.%1$I, u.%1$I is distinct from prev.old', p_column)
+    using p_user_id, p_value, p_remove;
+end $$;
+
+-- Set user_voice_settings.last_used_at from the database clock.
+-- Used by PATCH /api/user/settings/voice/{user_id}/last-used; returns false if the user has no settings row.
+create or replace function touch_voice_settings_last_used(uid uuid)
+returns boolean language plpgsql as $$
+begin
+    update user_voice_settings set last_used_at = now() where user_id = uid;
+    return found;
+end $$;
+
+-- Fill in duration_seconds for sessions the heartbeat monitor just closed.
+-- Used by HeartbeatMonitor._close_stale_sessions after its batched UPDATE.
+create or replace function set_session_durations(p_session_ids uuid[])
+returns void language sql as $$
+    update conversation_sessions
+    set duration_seconds = extract(epoch from session_end - session_start)
+    where session_id = any(p_session_ids) and session_end is not null;
+$$;
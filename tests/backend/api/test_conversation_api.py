@@ -56,11 +56,69 @@ class TestConversationEndpoints:
         )
         assert response.status_code in [200, 201, 404, 422]
 
+    def test_add_message_maps_body_to_role_and_metadata(self, test_session_id, test_user_id):
+        """Test the JSON body is stored with its role and merged metadata."""
+        from unittest.mock import AsyncMock
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_db.add_conversation_message.return_value = {"id": "msg-1"}
+        app.dependency_overrides[get_database] = lambda: mock_db
+        try:
+            response = client.post(
+                f"/api/conversation/{test_session_id}/messages",
+                json={
+                    "user_id": test_user_id,
+                    "message_type": "agent_response",
+                    "content": "Markets are up",
+                    "referenced_news_ids": ["news-1"],
+                    "metadata": {"source": "test"}
+                }
+            )
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+
+        assert response.status_code == 200
+        mock_db.add_conversation_message.assert_awaited_once_with(
+            session_id=test_session_id,
+            user_id=test_user_id,
+            role="agent",
+            content="Markets are up",
+            metadata={
+                "audio_url": None,
+                "processing_time_ms": None,
+                "confidence_score": None,
+                "referenced_news_ids": ["news-1"],
+                "source": "test"
+            }
+        )
+
     def test_get_conversation_summary(self, test_session_id):
         """Test GET /api/conversation/{session_id}/summary."""
         response = client.get(f"/api/conversation/{test_session_id}/summary")
         assert response.status_code in [200, 404]
 
+    def test_get_conversation_summary_counts_roles(self, test_session_id):
+        """Test summary counts user and agent messages by role."""
+        from unittest.mock import AsyncMock
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_db.get_conversation_messages.return_value = [
+            {"role": "user"}, {"role": "agent"}, {"role": "user"}, {"role": "system"}
+        ]
+        app.dependency_overrides[get_database] = lambda: mock_db
+        try:
+            response = client.get(f"/api/conversation/{test_session_id}/summary")
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_messages"] == 4
+        assert data["user_messages"] == 2
+        assert data["agent_messages"] == 1
+
     def test_conversation_health_check(self):
         """Test GET /api/conversation/health."""
         response = client.get("/api/conversation/health")
@@ -87,6 +145,97 @@ class TestConversationSessionEndpoints:
         data = response.json()
         assert isinstance(data, list)
 
+    def test_get_active_session_with_turns(self):
+        """Test an active session and its turns round-trip through the response model."""
+        from backend.app.utils.conversation_logger import get_conversation_logger
+
+        conversation_logger = get_conversation_logger()
+        test_session_id = str(uuid.uuid4())
+        conversation_logger.start_session(test_session_id, "test-user")
+        conversation_logger.log_conversation_turn(
+            session_id=test_session_id,
+            user_id="test-user",
+            transcription="What's new with AAPL?",
+            agent_response="Apple is up 2% today.",
+            processing_time_ms=120.0,
+            audio_format="wav",
+            audio_size_bytes=1024,
+            tts_chunks_sent=3
+        )
+        try:
+            response = client.get(f"/api/conversation-session/sessions/{test_session_id}")
+        finally:
+            conversation_logger.active_sessions.pop(test_session_id, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_turns"] == 1
+        assert data["turns"][0]["transcription"] == "What's new with AAPL?"
+        assert data["turns"][0]["tts_chunks_sent"] == 3
+
+    def test_get_session_not_modified(self):
+        """Test polling an unchanged session returns 304 until a new turn lands."""
+        from backend.app.utils.conversation_logger import get_conversation_logger
+
+        conversation_logger = get_conversation_logger()
+        test_session_id = str(uuid.uuid4())
+        url = f"/api/conversation-session/sessions/{test_session_id}"
+        conversation_logger.start_session(test_session_id, "test-user")
+        try:
+            etag = client.get(url).headers["etag"]
+
+            response = client.get(url, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.content == b""
+
+            conversation_logger.log_conversation_turn(
+                session_id=test_session_id,
+                user_id="test-user",
+                transcription="Any news?",
+                agent_response="Nothing new.",
+                processing_time_ms=5.0,
+                audio_format="wav",
+                audio_size_bytes=256,
+                tts_chunks_sent=1
+            )
+            response = client.get(url, headers={"If-None-Match": etag})
+            assert response.status_code == 200
+            assert response.headers["etag"] != etag
+        finally:
+            conversation_logger.active_sessions.pop(test_session_id, None)
+
+    def test_list_sessions_streams_valid_json(self):
+        """Test the streamed session list matches the SessionInfoResponse shape."""
+        from backend.app.api.conversation_session import SessionInfoResponse
+        from backend.app.utils.conversation_logger import get_conversation_logger
+
+        conversation_logger = get_conversation_logger()
+        test_session_id = str(uuid.uuid4())
+        test_user_id = f"stream-user-{uuid.uuid4()}"
+        conversation_logger.start_session(test_session_id, test_user_id)
+        for text in ("first", "second"):
+            conversation_logger.log_conversation_turn(
+                session_id=test_session_id,
+                user_id=test_user_id,
+                transcription=text,
+                agent_response=f"reply to {text}",
+                processing_time_ms=10.0,
+                audio_format="wav",
+                audio_size_bytes=512,
+                tts_chunks_sent=1
+            )
+        try:
+            response = client.get(f"/api/conversation-session/sessions?user_id={test_user_id}")
+        finally:
+            conversation_logger.active_sessions.pop(test_session_id, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        session = SessionInfoResponse.model_validate(data[0])
+        assert [turn.transcription for turn in session.turns] == ["first", "second"]
+        assert session.total_turns == 2
+
     def test_get_model_info(self):
         """Test GET /api/conversation-session/models/info."""
         response = client.get("/api/conversation-session/models/info")
@@ -23,6 +23,16 @@ class TestHealthEndpoints:
         data = response.json()
         assert "status" in data
 
+    def test_large_responses_are_gzipped(self):
+        """Test payloads above the minimum size are gzip-encoded, small ones are not."""
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+        assert "paths" in response.json()
+
+        response = client.get("/live", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
     def test_liveness_probe(self):
         """Test GET /live."""
         response = client.get("/live")
@@ -71,9 +71,28 @@ class TestNewsEndpoints:
         data = response.json()
         assert "topics" in data
 
+    def test_get_news_topics_not_modified(self):
+        """Test GET /api/news/topics returns 304 for a matching ETag."""
+        response = client.get("/api/news/topics")
+        etag = response.headers["etag"]
+        assert "max-age" in response.headers["cache-control"]
+
+        cached = client.get("/api/news/topics", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
     def test_news_health_check(self):
         """Test GET /api/news/health."""
         response = client.get("/api/news/health")
         assert response.status_code == 200
         data = response.json()
         assert "status" in data
+
+    def test_news_health_check_timestamp_is_current(self):
+        """Test the spliced health payload is valid JSON with a fresh timestamp."""
+        from datetime import datetime, timedelta
+
+        data = client.get("/api/news/health").json()
+        assert data["services"]["external_apis"] == "available"
+        stamped = datetime.fromisoformat(data["timestamp"].removesuffix("Z"))
+        assert abs(datetime.utcnow() - stamped) < timedelta(minutes=1)
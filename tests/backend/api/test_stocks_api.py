@@ -23,6 +23,35 @@ class TestStockPriceEndpoints:
         response = client.get("/api/v1/stocks/GOOGL/price?refresh=true")
         assert response.status_code == 200
 
+    def test_symbol_is_validated_and_normalized_at_parse_time(self):
+        """Test path symbols are uppercased by validation and malformed ones are rejected."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        service = MagicMock()
+        service.get_stock_price = AsyncMock(return_value={"symbol": "BRK.B", "price": 450.0})
+        with patch("backend.app.api.v1.stocks.get_stock_price_service", AsyncMock(return_value=service)):
+            response = client.get("/api/v1/stocks/brk.b/price")
+            rejected = client.get("/api/v1/stocks/not;a;symbol/price")
+
+        assert response.status_code == 200
+        service.get_stock_price.assert_awaited_once_with("BRK.B", refresh=False)
+        assert rejected.status_code == 422
+
+    def test_get_stock_price_is_edge_cacheable_unless_refreshed(self):
+        """Test the default price read carries Cache-Control and a forced refresh does not."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from backend.app.utils.http_cache import EDGE_CACHE_CONTROL
+
+        service = MagicMock()
+        service.get_stock_price = AsyncMock(return_value={"symbol": "AAPL", "price": 175.0})
+        with patch("backend.app.api.v1.stocks.get_stock_price_service", AsyncMock(return_value=service)):
+            cached = client.get("/api/v1/stocks/AAPL/price")
+            refreshed = client.get("/api/v1/stocks/AAPL/price?refresh=true")
+
+        assert cached.headers["cache-control"] == EDGE_CACHE_CONTROL
+        assert "accept-encoding" in cached.headers["vary"].lower()
+        assert "cache-control" not in refreshed.headers
+
     def test_batch_stock_prices(self):
         """Test POST /api/v1/stocks/prices/batch."""
         response = client.post(
@@ -35,6 +64,59 @@ class TestStockPriceEndpoints:
         assert "total_count" in data
         assert data["total_count"] == 3
 
+    def test_batch_stock_prices_response_shape(self):
+        """Test batch records are mapped onto the response model with hit/miss counts."""
+        from unittest.mock import AsyncMock, patch
+
+        service = AsyncMock()
+        service.get_multiple_prices.return_value = {
+            "AAPL": {"symbol": "AAPL", "price": 175.43, "volume": 1000,
+                     "last_updated": "2024-01-01T00:00:00+00:00", "source": "redis", "cache_hit": True},
+            "MSFT": {"symbol": "MSFT", "price": 410.0, "source": "api", "cache_hit": False},
+            "NOPE": None
+        }
+        with patch("backend.app.api.v1.stocks.get_stock_price_service", AsyncMock(return_value=service)):
+            response = client.post(
+                "/api/v1/stocks/prices/batch",
+                json={"symbols": ["AAPL", "MSFT", "NOPE"]}
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 2
+        assert data["cache_hits"] == 1
+        assert data["cache_misses"] == 1
+        aapl, msft = data["prices"]
+        assert aapl["volume"] == 1000
+        assert aapl["last_updated"].startswith("2024-01-01T00:00:00")
+        assert msft["change"] is None
+        assert msft["last_updated"]
+
+    def test_batch_stock_prices_stream_ndjson(self):
+        """Test the streaming batch writes one JSON line per priced symbol in completion order."""
+        import json
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        async def iter_multiple_prices(symbols, refresh=False):
+            yield "MSFT", {"symbol": "MSFT", "price": 410.0, "source": "redis", "cache_hit": True}
+            yield "NOPE", None
+            yield "AAPL", {"symbol": "AAPL", "price": 175.43, "source": "api"}
+
+        service = MagicMock()
+        service.iter_multiple_prices = iter_multiple_prices
+        with patch("backend.app.api.v1.stocks.get_stock_price_service", AsyncMock(return_value=service)):
+            response = client.post(
+                "/api/v1/stocks/prices/batch/stream",
+                json={"symbols": ["AAPL", "MSFT", "NOPE"]}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["symbol"] for line in lines] == ["MSFT", "AAPL"]
+        assert lines[0]["cache_hit"] is True
+        assert lines[1]["change"] is None
+
     def test_batch_stock_prices_empty_list(self):
         """Test POST /api/v1/stocks/prices/batch with empty list."""
         response = client.post(
@@ -48,6 +130,80 @@ class TestStockPriceEndpoints:
         response = client.get("/api/v1/stocks/TSLA/history?limit=10")
         assert response.status_code in [200, 404]
 
+    def test_get_stock_history_streams_rows(self):
+        """Test the streamed history document has the same shape as before."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        rows = [{"symbol": "TSLA", "price": 250.0 + i} for i in range(3)]
+
+        async def iter_price_history(symbol, limit=100, before=None, before_id=None):
+            for row in rows[:limit]:
+                yield row
+
+        service = MagicMock()
+        service.iter_price_history = iter_price_history
+        with patch("backend.app.api.v1.stocks.get_stock_price_service", AsyncMock(return_value=service)):
+            response = client.get("/api/v1/stocks/tsla/history?limit=2")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "symbol": "TSLA", "history": rows[:2], "count": 2, "limit": 2,
+            "next_before": None, "next_before_id": None
+        }
+
+    def test_get_stock_history_pages_by_keyset(self):
+        """Test a full page returns a next_before/next_before_id cursor that is passed back."""
+        from datetime import datetime, timezone
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        rows = [
+            {"id": "b", "symbol": "TSLA", "price": 250.0, "last_updated": "2024-01-01T10:02:00+00:00"},
+            {"id": "a", "symbol": "TSLA", "price": 249.0, "last_updated": "2024-01-01T10:01:00+00:00"},
+        ]
+        calls = []
+
+        async def iter_price_history(symbol, limit=100, before=None, before_id=None):
+            calls.append((before, before_id))
+            for row in rows[:limit]:
+                yield row
+
+        service = MagicMock()
+        service.iter_price_history = iter_price_history
+        with patch("backend.app.api.v1.stocks.get_stock_price_service", AsyncMock(return_value=service)):
+            response = client.get("/api/v1/stocks/tsla/history?limit=2")
+            page = response.json()
+            assert page["next_before"] == "2024-01-01T10:01:00+00:00"
+            assert page["next_before_id"] == "a"
+
+            response = client.get(
+                "/api/v1/stocks/tsla/history",
+                params={"limit": 2, "before_ts": page["next_before"], "before_id": page["next_before_id"]}
+            )
+
+        assert response.status_code == 200
+        assert calls == [(None, None), (datetime(2024, 1, 1, 10, 1, tzinfo=timezone.utc), "a")]
+
+    def test_get_stock_history_marks_partial_on_error(self):
+        """Test a mid-stream DB failure ends the document as partial with a resume cursor."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        row = {"id": "b", "symbol": "TSLA", "price": 250.0, "last_updated": "2024-01-01T10:02:00+00:00"}
+
+        async def iter_price_history(symbol, limit=100, before=None, before_id=None):
+            yield row
+            raise RuntimeError("connection reset")
+
+        service = MagicMock()
+        service.iter_price_history = iter_price_history
+        with patch("backend.app.api.v1.stocks.get_stock_price_service", AsyncMock(return_value=service)):
+            response = client.get("/api/v1/stocks/tsla/history?limit=5")
+
+        body = response.json()
+        assert body["history"] == [row]
+        assert body["partial"] is True
+        assert body["error"] == "history fetch failed"
+        assert (body["next_before"], body["next_before_id"]) == ("2024-01-01T10:02:00+00:00", "b")
+
 
 class TestStockNewsEndpoints:
     """Test suite for /api/v1/stock-news/* endpoints."""
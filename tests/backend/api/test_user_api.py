@@ -2,6 +2,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from backend.app.main import app
+from backend.app.cache import get_cache
 import uuid
 
 client = TestClient(app)
@@ -32,6 +33,33 @@ class TestUserEndpoints:
         )
         assert response.status_code in [200, 404, 422]
 
+    def test_update_preferences_sends_only_provided_fields(self, test_user_id):
+        """Test PUT forwards just the sent fields and skips the write when nothing changed."""
+        from unittest.mock import AsyncMock
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_db.update_user_preferences.return_value = True
+        app.dependency_overrides[get_database] = lambda: mock_db
+        app.dependency_overrides[get_cache] = lambda: AsyncMock()
+        try:
+            response = client.put(
+                f"/api/user/preferences?user_id={test_user_id}",
+                json={"preferred_topics": ["technology"], "watchlist_stocks": None}
+            )
+            assert response.status_code == 200
+            mock_db.update_user_preferences.assert_awaited_once_with(
+                test_user_id, {"preferred_topics": ["technology"]}
+            )
+
+            mock_db.update_user_preferences.reset_mock()
+            response = client.put(f"/api/user/preferences?user_id={test_user_id}", json={})
+            assert response.json() == {"message": "No changes"}
+            mock_db.update_user_preferences.assert_not_called()
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+            app.dependency_overrides.pop(get_cache, None)
+
     def test_get_topics(self, test_user_id):
         """Test GET /api/user/topics."""
         response = client.get(f"/api/user/topics?user_id={test_user_id}")
@@ -53,6 +81,145 @@ class TestUserEndpoints:
         response = client.delete(f"/api/user/topics/technology?user_id={test_user_id}")
         assert response.status_code in [200, 404]
 
+    def test_topic_mutations_are_single_atomic_calls(self, test_user_id):
+        """Test add/remove topic issue one atomic array update and no preference read."""
+        from unittest.mock import AsyncMock
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_cache = AsyncMock()
+        mock_db.mutate_user_array.return_value = {"items": ["technology", "crypto"], "changed": True}
+        app.dependency_overrides[get_database] = lambda: mock_db
+        app.dependency_overrides[get_cache] = lambda: mock_cache
+        try:
+            response = client.post("/api/user/topics/add", json={"user_id": test_user_id, "topic": "crypto"})
+            assert response.status_code == 200
+            assert response.json()["topics"] == ["technology", "crypto"]
+            mock_db.mutate_user_array.assert_awaited_once_with(test_user_id, "preferred_topics", "crypto")
+
+            mock_db.mutate_user_array.reset_mock()
+            response = client.delete(f"/api/user/topics/crypto?user_id={test_user_id}")
+            assert response.status_code == 200
+            mock_db.mutate_user_array.assert_awaited_once_with(
+                test_user_id, "preferred_topics", "crypto", remove=True
+            )
+            mock_db.get_user_preferences.assert_not_called()
+            assert mock_cache.delete_user_preferences.await_count == 2
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+            app.dependency_overrides.pop(get_cache, None)
+
+    def test_topic_mutation_db_error_is_500_not_404(self, test_user_id):
+        """Test a failed array update surfaces as a server error instead of a missing user."""
+        from unittest.mock import AsyncMock
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_db.mutate_user_array.side_effect = RuntimeError("function mutate_user_array does not exist")
+        app.dependency_overrides[get_database] = lambda: mock_db
+        app.dependency_overrides[get_cache] = lambda: AsyncMock()
+        try:
+            response = client.post("/api/user/topics/add", json={"user_id": test_user_id, "topic": "crypto"})
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+            app.dependency_overrides.pop(get_cache, None)
+
+        assert response.status_code == 500
+
+    def test_preference_reads_are_cached_per_user(self, test_user_id):
+        """Test a cache hit skips the database and a miss populates the per-user entry."""
+        from unittest.mock import AsyncMock
+        from backend.app.api.user import PREFERENCES_CACHE_TTL
+        from backend.app.database import get_database
+
+        preferences = {"preferred_topics": ["crypto"], "watchlist_stocks": ["NVDA"]}
+        mock_db = AsyncMock()
+        mock_cache = AsyncMock()
+        mock_cache.get_user_preferences.return_value = None
+        mock_db.get_user_preferences.return_value = preferences
+        app.dependency_overrides[get_database] = lambda: mock_db
+        app.dependency_overrides[get_cache] = lambda: mock_cache
+        try:
+            response = client.get(f"/api/user/topics?user_id={test_user_id}")
+            assert response.status_code == 200
+            assert response.json()["preferred_topics"] == ["crypto"]
+            assert "technology" in response.json()["available_topics"]
+            mock_cache.set_user_preferences.assert_awaited_once_with(
+                test_user_id, preferences, ttl=PREFERENCES_CACHE_TTL
+            )
+
+            mock_db.get_user_preferences.reset_mock()
+            mock_cache.get_user_preferences.return_value = preferences
+            response = client.get(f"/api/user/watchlist?user_id={test_user_id}")
+            assert response.status_code == 200
+            assert response.json()["watchlist_stocks"] == ["NVDA"]
+            mock_db.get_user_preferences.assert_not_called()
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+            app.dependency_overrides.pop(get_cache, None)
+
+    def test_add_existing_watchlist_stock_skips_price_fetch(self, test_user_id):
+        """Test an unchanged watchlist (symbol already present) does not trigger a price fetch."""
+        from unittest.mock import AsyncMock, patch
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_db.mutate_user_array.return_value = {"items": ["NVDA"], "changed": False}
+        app.dependency_overrides[get_database] = lambda: mock_db
+        app.dependency_overrides[get_cache] = lambda: AsyncMock()
+        try:
+            with patch("backend.app.api.user.get_stock_price_service") as mock_service:
+                response = client.post("/api/user/watchlist/add", json={"user_id": test_user_id, "symbol": "nvda"})
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+            app.dependency_overrides.pop(get_cache, None)
+
+        assert response.status_code == 200
+        assert response.json()["watchlist"] == ["NVDA"]
+        mock_db.mutate_user_array.assert_awaited_once_with(test_user_id, "watchlist_stocks", "NVDA")
+        mock_service.assert_not_called()
+
+    def test_get_profile_combines_preferences_and_voice_settings(self, test_user_id):
+        """Test GET /api/user/profile returns both halves from one database call."""
+        from unittest.mock import AsyncMock
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_db.get_user_profile.return_value = {
+            "preferences": {"preferred_topics": ["crypto"], "watchlist_stocks": ["NVDA"]},
+            "voice_settings": {"voice_type": "calm"}
+        }
+        app.dependency_overrides[get_database] = lambda: mock_db
+        try:
+            response = client.get(f"/api/user/profile?user_id={test_user_id}")
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["user_id"] == test_user_id
+        assert data["preferences"]["watchlist_stocks"] == ["NVDA"]
+        assert data["voice_settings"]["voice_type"] == "calm"
+        mock_db.get_user_profile.assert_awaited_once_with(test_user_id)
+
+    def test_unhandled_error_returns_structured_500(self, test_user_id):
+        """Test route errors go through the app-level handler without leaking the message."""
+        from unittest.mock import AsyncMock
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_db.get_user_profile.side_effect = RuntimeError("connection string with secrets")
+        app.dependency_overrides[get_database] = lambda: mock_db
+        try:
+            response = client.get(f"/api/user/profile?user_id={test_user_id}")
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+
+        assert response.status_code == 500
+        data = response.json()
+        assert data["detail"] == "Internal error in /api/user/profile"
+        assert "secrets" not in response.text
+
     def test_get_watchlist(self, test_user_id):
         """Test GET /api/user/watchlist."""
         response = client.get(f"/api/user/watchlist?user_id={test_user_id}")
@@ -85,3 +252,12 @@ class TestUserEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "status" in data
+
+    def test_user_health_check_timestamp_is_current(self):
+        """Test the spliced health payload is valid JSON with a fresh timestamp."""
+        from datetime import datetime, timedelta
+
+        data = client.get("/api/user/health").json()
+        assert data["services"] == {"database": "available", "cache": "available"}
+        stamped = datetime.fromisoformat(data["timestamp"].removesuffix("Z"))
+        assert abs(datetime.utcnow() - stamped) < timedelta(minutes=1)
@@ -57,6 +57,7 @@ class TestVoiceSettingsPresets:
         assert "casual" in voice_type_names
         assert "professional" in voice_type_names
         assert "energetic" in voice_type_names
+        assert "immutable" in response.headers["cache-control"]
 
         # Check structure of first voice type
         vt = data["voice_types"][0]
@@ -66,6 +67,15 @@ class TestVoiceSettingsPresets:
         assert "characteristics" in vt
         assert isinstance(vt["characteristics"], list)
 
+    def test_presets_not_modified(self):
+        """Test the precomputed presets payload honours If-None-Match."""
+        etag = client.get("/api/user/settings/voice/presets").headers["etag"]
+
+        response = client.get("/api/user/settings/voice/presets", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
     def test_default_preset_values(self):
         """Test that default preset has expected values."""
         response = client.get("/api/user/settings/voice/presets")
@@ -125,6 +135,41 @@ class TestVoiceSettingsGetEndpoint:
         # Should still try to query and return 404
         assert response.status_code == 404
 
+    def test_get_settings_awaits_async_client(self):
+        """Test GET awaits the native async Supabase client instead of a threadpool call."""
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.app.database import get_database
+
+        row = {
+            "user_id": "test-user-async",
+            "voice_type": "professional",
+            "speech_rate": "1.0",
+            "vad_sensitivity": "balanced",
+            "vad_aggressiveness": 2,
+            "interruption_enabled": True,
+            "interruption_threshold": "0.5",
+            "use_audio_compression": True,
+            "auto_play_responses": True,
+            "updated_at": "2024-01-01T00:00:00Z"
+        }
+        query = MagicMock()
+        query.select.return_value = query
+        query.eq.return_value = query
+        query.maybe_single.return_value = query
+        query.execute = AsyncMock(return_value=MagicMock(data=row))
+        mock_db = MagicMock()
+        mock_db.async_client.table.return_value = query
+        app.dependency_overrides[get_database] = lambda: mock_db
+        try:
+            response = client.get("/api/user/settings/voice/test-user-async")
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+
+        assert response.status_code == 200
+        assert response.json()["voice_type"] == "professional"
+        query.execute.assert_awaited_once()
+        mock_db.client.table.assert_not_called()
+
 
 class TestVoiceSettingsCreateUpdate:
     """Test POST voice settings endpoint (create/update)."""
@@ -271,6 +316,58 @@ class TestVoiceSettingsLastUsed:
         # Should return 404 if settings don't exist (or 500 if table missing)
         assert response.status_code in [404, 500]
 
+    def test_update_last_used_uses_database_clock(self):
+        """Test the timestamp is set server-side by the touch RPC, not sent from Python."""
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.app.api.user.settings import voice
+        from backend.app.database import get_database
+
+        voice._LAST_TOUCH.pop("test-user-touch", None)
+        rpc = MagicMock()
+        rpc.execute = AsyncMock(return_value=MagicMock(data=False))
+        mock_db = MagicMock()
+        mock_db.async_client.rpc.return_value = rpc
+        app.dependency_overrides[get_database] = lambda: mock_db
+        try:
+            response = client.patch("/api/user/settings/voice/test-user-touch/last-used")
+            assert response.status_code == 404
+
+            rpc.execute.return_value = MagicMock(data=True)
+            response = client.patch("/api/user/settings/voice/test-user-touch/last-used")
+            assert response.status_code == 204
+            mock_db.async_client.rpc.assert_called_with(
+                "touch_voice_settings_last_used", {"uid": "test-user-touch"}
+            )
+            mock_db.async_client.table.assert_not_called()
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+            voice._LAST_TOUCH.pop("test-user-touch", None)
+
+    def test_update_last_used_is_debounced_per_user(self):
+        """Test repeat touches inside the debounce window skip the database write."""
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.app.api.user.settings import voice
+        from backend.app.database import get_database
+
+        rpc = MagicMock()
+        rpc.execute = AsyncMock(return_value=MagicMock(data=True))
+        mock_db = MagicMock()
+        mock_db.async_client.rpc.return_value = rpc
+        app.dependency_overrides[get_database] = lambda: mock_db
+        try:
+            for _ in range(3):
+                response = client.patch("/api/user/settings/voice/test-user-chatty/last-used")
+                assert response.status_code == 204
+            assert rpc.execute.await_count == 1
+
+            voice._LAST_TOUCH["test-user-chatty"] -= voice.LAST_USED_DEBOUNCE_SECONDS
+            response = client.patch("/api/user/settings/voice/test-user-chatty/last-used")
+            assert response.status_code == 204
+            assert rpc.execute.await_count == 2
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+            voice._LAST_TOUCH.pop("test-user-chatty", None)
+
 
 class TestVoiceSettingsValidation:
     """Test Pydantic validation for voice settings."""
@@ -53,6 +53,33 @@ class TestVoiceEndpoints:
         # TTS may not be available in test environment
         assert response.status_code in [200, 500, 503]
 
+    def test_synthesize_speech_uses_stable_cache_key(self):
+        """Test synthesis is keyed by a process-independent hash and reuses a cached URL."""
+        from unittest.mock import AsyncMock
+        import xxhash
+        import orjson
+        from backend.app.cache import get_cache
+
+        mock_cache = AsyncMock()
+        mock_cache.get_tts_audio.return_value = None
+        app.dependency_overrides[get_cache] = lambda: mock_cache
+        payload = {"text": "Hello world", "voice": "en-US-AriaNeural"}
+        try:
+            response = client.post("/api/voice/synthesize", json=payload)
+            assert response.status_code == 200
+            text_hash = xxhash.xxh3_128_hexdigest(orjson.dumps(["Hello world", 1.0, 1.0, 1.0, "mp3"]))
+            assert response.json()["audio_url"].endswith(f"/{text_hash}.mp3")
+            mock_cache.set_tts_audio.assert_awaited_once_with(
+                text_hash, "en-US-AriaNeural", response.json()["audio_url"], ttl=3600
+            )
+
+            mock_cache.get_tts_audio.return_value = "https://cdn.example/cached.mp3"
+            response = client.post("/api/voice/synthesize", json=payload)
+            assert response.json()["audio_url"] == "https://cdn.example/cached.mp3"
+            assert mock_cache.set_tts_audio.await_count == 1
+        finally:
+            app.dependency_overrides.pop(get_cache, None)
+
     def test_update_watchlist(self):
         """Test POST /api/voice/watchlist/update."""
         response = client.post(
@@ -71,3 +98,12 @@ class TestVoiceEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "status" in data
+
+    def test_voice_health_check_timestamp_is_current(self):
+        """Test the spliced health payload is valid JSON with a fresh timestamp."""
+        from datetime import datetime, timedelta
+
+        data = client.get("/api/voice/health").json()
+        assert data["services"] == {"agent": "available", "tts": "available", "asr": "available"}
+        stamped = datetime.fromisoformat(data["timestamp"].removesuffix("Z"))
+        assert abs(datetime.utcnow() - stamped) < timedelta(minutes=1)
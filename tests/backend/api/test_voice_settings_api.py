@@ -20,6 +20,30 @@ class TestVoiceSettingsEndpoints:
         response = client.get(f"/api/voice-settings/{test_user_id}")
         assert response.status_code in [200, 404]
 
+    def test_voice_settings_cached_as_json_object(self, test_user_id):
+        """Test settings are cached as a plain object and read back from either cache format."""
+        from unittest.mock import AsyncMock, patch
+
+        cache = AsyncMock()
+        cache.get.return_value = None
+        db = AsyncMock()
+        db.get_voice_settings.return_value = {"speech_rate": 1.5}
+        with patch("backend.app.api.voice_settings.get_cache", AsyncMock(return_value=cache)), \
+                patch("backend.app.api.voice_settings.get_database", AsyncMock(return_value=db)):
+            response = client.get(f"/api/voice-settings/{test_user_id}")
+            cached = cache.set.await_args.args[1]
+
+            cache.get.return_value = cached
+            from_object = client.get(f"/api/voice-settings/{test_user_id}")
+            cache.get.return_value = '{"speech_rate": 0.8}'
+            from_legacy_string = client.get(f"/api/voice-settings/{test_user_id}")
+
+        assert response.json()["speech_rate"] == 1.5
+        assert isinstance(cached, dict) and cached["speech_rate"] == 1.5
+        assert from_object.json()["speech_rate"] == 1.5
+        assert from_legacy_string.json()["speech_rate"] == 0.8
+        db.get_voice_settings.assert_awaited_once()
+
     def test_update_voice_settings(self, test_user_id):
         """Test PUT /api/voice-settings/{user_id}."""
         response = client.put(
@@ -106,6 +106,7 @@ def mock_logger():
     logger.end_session = Mock()
     logger.log_query_received = Mock()
     logger.log_response_sent = Mock()
+    logger.log_turn = Mock()
     logger.log_intent_analysis = Mock()
     logger.log_tool_execution = Mock()
     logger.log_llm_call = Mock()
@@ -130,6 +130,29 @@ class TestAgentLogger:
             assert response_entry['data']['processing_time_ms'] == 2500
             assert response_entry['data']['metadata']['intent'] == "price_check"
 
+    def test_log_turn(self, logger, temp_log_dir):
+        """Test a query/response turn is written as a single entry."""
+        logger.start_session("test_session", "user_id")
+        logger.log_turn(
+            query="What's the price of META?",
+            response="META is trading at $450.23",
+            processing_time_ms=2500,
+            source="api",
+            metadata={"intent": "price_check", "symbols": ["META"]}
+        )
+
+        log_file = Path(temp_log_dir) / 'agent/sessions' / f"{datetime.now().strftime('%Y%m%d')}.jsonl"
+        with open(log_file) as f:
+            lines = f.readlines()
+            assert len(lines) == 2  # session_start + turn
+            turn_entry = json.loads(lines[-1])
+            assert turn_entry['event'] == "turn"
+            assert turn_entry['data']['query'] == "What's the price of META?"
+            assert turn_entry['data']['source'] == "api"
+            assert turn_entry['data']['response'] == "META is trading at $450.23"
+            assert turn_entry['data']['processing_time_ms'] == 2500
+            assert turn_entry['data']['metadata']['intent'] == "price_check"
+
     def test_log_intent_analysis(self, logger, temp_log_dir):
         """Test intent analysis logging."""
         logger.start_session("test_session", "user_id")
@@ -45,7 +45,9 @@ class TestNewsAPI:
             assert response.status_code == 200
             data = response.json()
             assert "articles" in data
-            mock_agent.get_news_latest.assert_called_once_with(["technology", "finance"], 5)
+            mock_agent.get_news_latest.assert_called_once_with(
+                ["technology", "finance"], 5, breaking_only=False, category=None
+            )
     
     def test_search_news(self, test_client):
         """Test news search endpoint."""
@@ -70,7 +72,7 @@ class TestNewsAPI:
             data = response.json()
             assert "articles" in data
             assert len(data["articles"]) == 1
-            mock_agent.search_news.assert_called_once_with("apple", 10)
+            mock_agent.search_news.assert_called_once_with("apple", 10, category=None, topics=None)
     
     def test_get_news_article(self, test_client):
         """Test getting specific news article."""
@@ -120,6 +122,32 @@ class TestNewsAPI:
         assert all("summary" in item for item in data)
         assert all("article_id" in item for item in data)
     
+    def test_summarize_news_fetches_articles_in_one_query(self, test_client):
+        """Test summarization batches the article lookup and keeps request order."""
+        from backend.app.main import app
+        from backend.app.database import get_database
+
+        mock_db = AsyncMock()
+        mock_db.get_news_articles.return_value = [
+            {"id": "news-2", "title": "Second", "summary": "Two"},
+            {"id": "news-1", "title": "First", "summary": "One"},
+        ]
+        app.dependency_overrides[get_database] = lambda: mock_db
+        try:
+            response = test_client.post(
+                "/api/news/summarize",
+                json={"article_ids": ["news-1", "news-2", "news-3"], "summary_type": "brief"}
+            )
+        finally:
+            app.dependency_overrides.pop(get_database, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["article_id"] for item in data] == ["news-1", "news-2", "news-3"]
+        assert data[0]["summary"] == "Summary of First: One"
+        assert "Sample Article news-3" in data[2]["summary"]
+        mock_db.get_news_articles.assert_awaited_once_with(["news-1", "news-2", "news-3"])
+    
     def test_get_breaking_news(self, test_client):
         """Test getting breaking news."""
         with patch('backend.app.api.news.get_agent') as mock_get_agent:
@@ -148,6 +176,55 @@ class TestNewsAPI:
             assert len(data["articles"]) == 1  # Only breaking news
             assert data["articles"][0]["is_breaking"] is True
     
+    def test_filters_are_pushed_to_agent(self, test_client):
+        """Test breaking/category filters are forwarded instead of applied in Python."""
+        from backend.app.main import app
+        from backend.app.core.agent_wrapper_langgraph import get_agent
+
+        mock_agent = AsyncMock()
+        mock_agent.get_news_latest.return_value = []
+        app.dependency_overrides[get_agent] = lambda: mock_agent
+        try:
+            response = test_client.get(
+                "/api/news/latest",
+                params={"limit": 3, "breaking_only": True, "category": "finance"}
+            )
+            assert response.status_code == 200
+            mock_agent.get_news_latest.assert_awaited_once_with(
+                [], 3, breaking_only=True, category="finance"
+            )
+
+            mock_agent.get_news_latest.reset_mock()
+            response = test_client.get("/api/news/breaking", params={"limit": 2})
+            assert response.status_code == 200
+            mock_agent.get_news_latest.assert_awaited_once_with([], 2, breaking_only=True)
+        finally:
+            app.dependency_overrides.pop(get_agent, None)
+
+    @pytest.mark.asyncio
+    async def test_latest_news_is_served_from_shared_cache(self):
+        """Test the agent reuses the cached breaking/latest result instead of re-querying."""
+        from backend.app.core.agent_wrapper_langgraph import LangGraphAgentWrapper, NEWS_LATEST_TTL_SECONDS
+
+        agent = LangGraphAgentWrapper()
+        agent._initialized = True
+        agent.db = AsyncMock()
+        agent.cache = AsyncMock()
+        agent.db.get_latest_news.return_value = [{"id": "news-1", "is_breaking": True}]
+        agent.cache.get_news_latest.return_value = None
+
+        result = await agent.get_news_latest([], 5, breaking_only=True)
+
+        assert result == [{"id": "news-1", "is_breaking": True}]
+        agent.cache.set_news_latest.assert_awaited_once_with(
+            [], result, ttl=NEWS_LATEST_TTL_SECONDS, limit=5, breaking_only=True, category=None
+        )
+
+        agent.cache.get_news_latest.return_value = result
+        agent.db.get_latest_news.reset_mock()
+        assert await agent.get_news_latest([], 5, breaking_only=True) == result
+        agent.db.get_latest_news.assert_not_called()
+
     def test_get_news_topics(self, test_client):
         """Test getting available news topics."""
         response = test_client.get("/api/news/topics")
@@ -251,3 +251,103 @@ class TestVoiceSettingsIntegration:
 
         assert user1_response.json()['vad_threshold'] == 0.01
         assert user2_response.json()['vad_threshold'] == 0.03
+
+
+class TestVoiceSettingsStorage:
+    """Test how the endpoints read and write the database and cache."""
+
+    @pytest.fixture
+    def backends(self):
+        """Patch the module's database and cache getters with mocks."""
+        from unittest.mock import AsyncMock, patch
+
+        db, cache = AsyncMock(), AsyncMock()
+        with patch("backend.app.api.voice_settings.get_database", AsyncMock(return_value=db)), \
+                patch("backend.app.api.voice_settings.get_cache", AsyncMock(return_value=cache)):
+            yield db, cache
+
+    def test_update_writes_db_and_cache(self, backends):
+        """Test a successful update saves the row and caches the settings."""
+        from fastapi.testclient import TestClient
+
+        db, cache = backends
+        db.save_voice_settings.return_value = True
+
+        response = TestClient(app).put("/api/voice-settings/user-1", json={"vad_threshold": 0.03})
+
+        assert response.status_code == 200
+        assert db.save_voice_settings.await_args.args[1]["vad_threshold"] == 0.03
+        assert cache.set.await_args.args[0] == "voice_settings:user-1"
+        cache.delete.assert_not_called()
+
+    def test_failed_save_drops_cached_copy(self, backends):
+        """Test a DB failure returns 500 and removes the concurrently cached settings."""
+        from fastapi.testclient import TestClient
+
+        db, cache = backends
+        db.save_voice_settings.side_effect = ConnectionError("db down")
+
+        response = TestClient(app).put("/api/voice-settings/user-1", json={"vad_threshold": 0.03})
+
+        assert response.status_code == 500
+        cache.delete.assert_awaited_once_with("voice_settings:user-1")
+
+    def test_reset_ignores_cache_failure(self, backends):
+        """Test reset succeeds when only the cache delete fails."""
+        from fastapi.testclient import TestClient
+
+        db, cache = backends
+        db.delete_voice_settings.return_value = True
+        cache.delete.side_effect = ConnectionError("cache down")
+
+        response = TestClient(app).delete("/api/voice-settings/user-1")
+
+        assert response.status_code == 200
+
+    def test_defaults_are_precomputed(self, backends):
+        """Test a user without settings gets the shared default payload cached as-is."""
+        from fastapi.testclient import TestClient
+        from backend.app.api.voice_settings import DEFAULT_SETTINGS_JSON
+
+        db, cache = backends
+        cache.get.return_value = None
+        db.get_voice_settings.return_value = None
+
+        response = TestClient(app).get("/api/voice-settings/new-user")
+
+        assert response.status_code == 200
+        assert response.json() == DEFAULT_SETTINGS_JSON
+        cache.set.assert_awaited_once_with("voice_settings:new-user", DEFAULT_SETTINGS_JSON, ttl=3600)
+
+    def test_cache_hit_skips_validation(self, backends):
+        """Test a cached settings dict is used as-is and the database is not read."""
+        from unittest.mock import patch
+        from fastapi.testclient import TestClient
+
+        db, cache = backends
+        cache.get.return_value = {"vad_threshold": 0.03, "use_compression": True}
+
+        with patch.object(VoiceSettings, "model_validate", side_effect=AssertionError("revalidated")):
+            response = TestClient(app).get("/api/voice-settings/user-1")
+
+        assert response.status_code == 200
+        assert response.json()["vad_threshold"] == 0.03
+        assert response.json()["silence_timeout_ms"] == 700
+        db.get_voice_settings.assert_not_called()
+
+
+class TestVoiceSettingsStaticPayloads:
+    """Test the precomputed preset and compression-info responses."""
+
+    @pytest.mark.parametrize("path", ["/api/voice-settings/user-1/presets", "/api/voice-settings/user-1/compression-info"])
+    def test_static_payload_supports_conditional_get(self, path):
+        """Test the prebuilt body is served with an ETag and revalidates to 304."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(app)
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.json()
+
+        revalidated = client.get(path, headers={"If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
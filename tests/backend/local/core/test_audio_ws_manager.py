@@ -0,0 +1,60 @@
+"""
+Tests for AudioWebSocketManager frame routing.
+"""
+
+import base64
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.app.core.websocket_manager_v2 import AudioWebSocketManager
+
+
+@pytest.fixture
+def manager():
+    """AudioWebSocketManager with the audio pipeline and heartbeat mocked out."""
+    with patch("backend.app.core.websocket_manager_v2.get_conversation_tracker"):
+        manager = AudioWebSocketManager()
+    manager.process_audio = AsyncMock()
+    manager.handle_heartbeat = AsyncMock()
+    return manager
+
+
+class TestAudioFrameRouting:
+    """Test text and binary frames reach the right handler."""
+
+    @pytest.mark.asyncio
+    async def test_raw_binary_frame_is_audio(self, manager):
+        """Test a non-JSON binary frame goes straight to the audio pipeline."""
+        await manager.handle_binary("session-1", b"\x1aE\xdf\xa3webm")
+
+        manager.process_audio.assert_awaited_once_with("session-1", b"\x1aE\xdf\xa3webm")
+
+    @pytest.mark.asyncio
+    async def test_binary_frame_starting_with_brace_is_still_audio(self, manager):
+        """Test audio whose first byte is 0x7B or 0x5B is not mistaken for JSON."""
+        for chunk in (b"{\x00\x01pcm", b"[\x02\x03pcm"):
+            await manager.handle_binary("session-1", chunk)
+
+        assert [c.args for c in manager.process_audio.await_args_list] == [
+            ("session-1", b"{\x00\x01pcm"), ("session-1", b"[\x02\x03pcm")
+        ]
+        manager.handle_heartbeat.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_text_frame_is_a_control_message(self, manager):
+        """Test control messages are parsed from text frames."""
+        await manager.handle_message("session-1", '{"event": "heartbeat"}')
+
+        manager.handle_heartbeat.assert_awaited_once_with("session-1")
+        manager.process_audio.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_base64_audio_event_still_supported(self, manager):
+        """Test the text audio_chunk event decodes its payload before processing."""
+        chunk = base64.b64encode(b"pcm").decode()
+
+        await manager.handle_message(
+            "session-1", f'{{"event": "audio_chunk", "data": {{"audio_chunk": "{chunk}", "format": "wav"}}}}'
+        )
+
+        manager.process_audio.assert_awaited_once_with("session-1", b"pcm", "wav")
@@ -0,0 +1,205 @@
+"""
+Tests for CacheManager command routing (native RESP pool vs Upstash REST).
+"""
+
+import orjson
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.app.cache import CacheManager
+
+
+def _rest_cache(*results):
+    """CacheManager on the REST transport whose POSTs return the given JSON bodies."""
+    cache = CacheManager()
+    cache.base_url = "https://redis.example"
+    cache.client = MagicMock()
+    cache.client.post = AsyncMock(side_effect=[
+        MagicMock(content=orjson.dumps(body), raise_for_status=MagicMock())
+        for body in results
+    ])
+    return cache
+
+
+def _resp_cache():
+    """CacheManager on the RESP transport with a mocked redis.asyncio client."""
+    cache = CacheManager()
+    cache.redis = MagicMock()
+    cache.redis.execute_command = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    cache.redis.pipeline.return_value = pipe
+    return cache, pipe
+
+
+class TestCacheManagerTransports:
+    """Test the same commands go out over either transport."""
+
+    @pytest.mark.asyncio
+    async def test_rest_get_and_set_post_command_arrays(self):
+        """Test REST calls post the raw command instead of encoding values into the URL."""
+        cache = _rest_cache({"result": orjson.dumps({"price": 1.0}).decode()}, {"result": "OK"})
+
+        assert await cache.get("stock:price:AAPL") == {"price": 1.0}
+        assert await cache.set("stock:price:AAPL", {"price": 2.0}, ttl=60) is True
+
+        calls = cache.client.post.await_args_list
+        assert calls[0].args == ("https://redis.example",)
+        assert orjson.loads(calls[0].kwargs["content"]) == ["GET", "stock:price:AAPL"]
+        assert orjson.loads(calls[1].kwargs["content"]) == ["SET", "stock:price:AAPL", '{"price":2.0}', "EX", 60]
+
+    @pytest.mark.asyncio
+    async def test_resp_get_multiple_is_one_mget(self):
+        """Test a RESP batch read is a single MGET on the pooled client."""
+        cache, _ = _resp_cache()
+        cache.redis.execute_command.return_value = [b'{"price": 1.0}', None]
+
+        result = await cache.get_multiple(["a", "b"])
+
+        assert result == {"a": {"price": 1.0}, "b": None}
+        cache.redis.execute_command.assert_awaited_once_with("MGET", "a", "b")
+
+    @pytest.mark.asyncio
+    async def test_pipeline_sends_queued_commands_together(self):
+        """Test commands queued on pipeline() go out in one non-transactional round-trip."""
+        cache, pipe = _resp_cache()
+
+        async with cache.pipeline() as batch:
+            batch.delete("a").set("b", 1, ttl=10)
+
+        cache.redis.pipeline.assert_called_once_with(transaction=False)
+        assert [c.args for c in pipe.execute_command.call_args_list] == [
+            ("DEL", "a"), ("SET", "b", "1", "EX", 10)
+        ]
+        pipe.execute.assert_awaited_once()
+        cache.redis.execute_command.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user_cache_is_one_unlink(self):
+        """Test a user's four keys are dropped with a single variadic UNLINK."""
+        cache, _ = _resp_cache()
+
+        await cache.invalidate_user_cache("u1")
+
+        cache.redis.execute_command.assert_awaited_once_with(
+            "UNLINK",
+            "user:session:u1",
+            "user:preferences:u1",
+            "user:watchlist:u1",
+            "user:conversation:u1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_rest_pipeline_uses_pipeline_endpoint(self):
+        """Test REST batches go to Upstash's /pipeline endpoint."""
+        cache = _rest_cache([{"result": "OK"}, {"result": "OK"}])
+
+        assert await cache.set_multiple({"a": 1, "b": 2}, ttl=30) is True
+
+        call = cache.client.post.await_args
+        assert call.args == ("https://redis.example/pipeline",)
+        assert orjson.loads(call.kwargs["content"]) == [["SET", "a", "1", "EX", 30], ["SET", "b", "2", "EX", 30]]
+
+    @pytest.mark.asyncio
+    async def test_ai_response_key_is_stable_xxh3(self):
+        """Test AI responses are keyed by the prompt's xxh3-128 digest."""
+        import xxhash
+
+        cache, _ = _resp_cache()
+        cache.redis.execute_command.return_value = b'"cached answer"'
+
+        assert await cache.get_ai_response("what moved NVDA today?") == "cached answer"
+
+        expected = "ai:response:" + xxhash.xxh3_128_hexdigest(b"what moved NVDA today?")
+        cache.redis.execute_command.assert_awaited_once_with("GET", expected)
+
+    @pytest.mark.asyncio
+    async def test_read_mostly_keys_are_served_from_l1(self):
+        """Test a repeated voice-settings read stays in-process until the key is written."""
+        cache, _ = _resp_cache()
+        cache.redis.execute_command.side_effect = [b'{"voice_type": "calm"}', "OK", b'{"voice_type": "fast"}']
+
+        assert await cache.get("voice_settings:u1") == {"voice_type": "calm"}
+        assert await cache.get("voice_settings:u1") == {"voice_type": "calm"}
+        assert cache.redis.execute_command.await_count == 1
+
+        await cache.set("voice_settings:u1", {"voice_type": "fast"})
+        assert await cache.get("voice_settings:u1") == {"voice_type": "fast"}
+        assert cache.redis.execute_command.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_l1_entries_expire(self, monkeypatch):
+        """Test L1 entries are refetched after their TTL and other keys bypass L1."""
+        from backend.app import cache as cache_module
+
+        cache, _ = _resp_cache()
+        cache.redis.execute_command.return_value = b'["NVDA"]'
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+        await cache.get("user:watchlist:u1")
+        now[0] += cache_module.L1_TTL_SECONDS + 1
+        await cache.get("user:watchlist:u1")
+        await cache.get("stock:price:NVDA")
+        await cache.get("stock:price:NVDA")
+
+        assert cache.redis.execute_command.await_count == 4
+
+    def test_news_latest_key_is_fixed_length_and_order_free(self):
+        """Test topic order and duplicates do not change the key and long lists stay short."""
+        key = CacheManager._news_latest_key(["tech", "crypto", "tech"], 10)
+
+        assert key == CacheManager._news_latest_key(["crypto", "tech"], 10)
+        assert key != CacheManager._news_latest_key(["crypto", "tech"], 20)
+        assert len(CacheManager._news_latest_key([f"topic{i}" for i in range(100)], 10)) == len(key)
+
+    @pytest.mark.asyncio
+    async def test_close_drains_rest_client_and_allows_reconnect(self, monkeypatch):
+        """Test close() shuts the HTTP/2 REST client and resets the manager for lazy re-init."""
+        from backend.app import cache as cache_module
+
+        monkeypatch.setattr(cache_module.settings, "redis_url", None)
+        cache = CacheManager()
+        await cache.initialize()
+        client = cache.client
+
+        await cache.close()
+
+        assert client.is_closed
+        assert cache.client is None
+        assert not cache._initialized
+
+    @pytest.mark.asyncio
+    async def test_pipeline_returns_mixed_results_in_order(self):
+        """Test a pipelined GET + EXPIRE comes back decoded in one REST round-trip."""
+        cache = _rest_cache([{"result": '{"vad_threshold":0.02}'}, {"result": 1}])
+
+        async with cache.pipeline() as batch:
+            batch.get("voice_settings:u1").expire("voice_settings:u1", 3600)
+
+        assert batch.results == [{"vad_threshold": 0.02}, 1]
+        call = cache.client.post.await_args
+        assert call.args == ("https://redis.example/pipeline",)
+        assert orjson.loads(call.kwargs["content"]) == [
+            ["GET", "voice_settings:u1"], ["EXPIRE", "voice_settings:u1", 3600]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_calls_initialize_once(self, monkeypatch):
+        """Test commands racing on a cold manager share a single client."""
+        import asyncio
+        from unittest.mock import patch
+        from backend.app import cache as cache_module
+
+        monkeypatch.setattr(cache_module.settings, "redis_url", None)
+        cache = CacheManager()
+        client = MagicMock()
+        client.post = AsyncMock(return_value=MagicMock(content=b'{"result": null}', raise_for_status=MagicMock()))
+
+        with patch.object(cache_module.httpx, "AsyncClient", return_value=client) as factory:
+            await asyncio.gather(*(cache.get(f"stock:price:{i}") for i in range(5)))
+
+        factory.assert_called_once()
+        assert client.post.await_count == 5
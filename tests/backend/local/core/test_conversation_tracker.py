@@ -0,0 +1,180 @@
+"""
+Tests for ConversationTracker message persistence batching.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.app.core.conversation_tracker import ConversationTracker, SessionState
+
+
+@pytest.fixture
+def db():
+    """Patched db_manager whose conversation_messages inserts are recorded."""
+    with patch("backend.app.core.conversation_tracker.db_manager") as db_manager:
+        db_manager._initialized = True
+        yield db_manager
+
+
+def _tracker(*session_ids, **batching):
+    """Tracker with in-memory state for sessions that already have a db_id."""
+    tracker = ConversationTracker(**batching)
+    for session_id in session_ids:
+        tracker.session_states[session_id] = SessionState(
+            user_id=f"user-{session_id}",
+            session_start=datetime.utcnow(),
+            db_id=f"db-{session_id}"
+        )
+    return tracker
+
+
+class TestMessageBatching:
+    """Test queued messages are written with bulk inserts."""
+
+    @pytest.mark.asyncio
+    async def test_worker_drains_queue_into_one_insert(self, db):
+        """Test messages queued together go out in a single insert and counts are per session."""
+        tracker = _tracker("session-a", "session-b", batch_max_latency_ms=0)
+        await tracker.track_message("session-a", "user", "hi")
+        await tracker.track_message("session-a", "assistant", "hello")
+        await tracker.track_message("session-b", "user", "price of NVDA?")
+
+        tracker._running = True
+        worker = asyncio.create_task(tracker._worker())
+        await asyncio.sleep(0.05)
+        worker.cancel()
+
+        insert = db.client.table.return_value.insert
+        insert.assert_called_once()
+        rows = insert.call_args.args[0]
+        assert [(row["session_id"], row["role"]) for row in rows] == [
+            ("db-session-a", "user"), ("db-session-a", "assistant"), ("db-session-b", "user")
+        ]
+        assert tracker.session_states["session-a"].message_count == 2
+        assert tracker.session_states["session-b"].message_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_row_inserts(self, db, monkeypatch):
+        """Test a batch that keeps failing is retried row by row so good rows are kept."""
+        async def no_sleep(_):
+            pass
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+        tracker = _tracker("session-a")
+        execute = db.client.table.return_value.insert.return_value.execute
+        execute.side_effect = [Exception("bad row")] * 3 + [MagicMock(), Exception("bad row")]
+
+        await tracker.track_message("session-a", "user", "good")
+        await tracker.track_message("session-a", "user", "bad")
+        await tracker._flush_queue()
+
+        inserts = [c.args[0] for c in db.client.table.return_value.insert.call_args_list]
+        assert len(inserts) == 5
+        assert all(isinstance(rows, list) and len(rows) == 2 for rows in inserts[:3])
+        assert [row["content"] for row in inserts[3:]] == ["good", "bad"]
+        assert tracker.session_states["session-a"].message_count == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_waits_for_latency_window_or_size(self, db):
+        """Test a batch holds for late messages until the window closes, but flushes early when full."""
+        tracker = _tracker("session-a", batch_max_size=3, batch_max_latency_ms=50)
+        insert = db.client.table.return_value.insert
+
+        tracker._running = True
+        worker = asyncio.create_task(tracker._worker())
+        await tracker.track_message("session-a", "user", "one")
+        await asyncio.sleep(0.01)
+        await tracker.track_message("session-a", "assistant", "two")
+        await asyncio.sleep(0.01)
+        insert.assert_not_called()  # window still open
+
+        await asyncio.sleep(0.1)
+        assert [row["content"] for row in insert.call_args.args[0]] == ["one", "two"]
+
+        for n in range(3):
+            await tracker.track_message("session-a", "user", f"burst {n}")
+        await asyncio.sleep(0.01)  # well inside the window, but the batch is full
+        worker.cancel()
+
+        assert insert.call_count == 2
+        assert len(insert.call_args.args[0]) == 3
+
+    @pytest.mark.asyncio
+    async def test_ids_resolved_at_enqueue_survive_state_cleanup(self, db):
+        """Test a queued message is still saved after its session state was cleaned up."""
+        tracker = _tracker("session-a")
+        await tracker.track_message("session-a", "user", "late message")
+        del tracker.session_states["session-a"]
+
+        await tracker._flush_queue()
+
+        row, = db.client.table.return_value.insert.call_args.args[0]
+        assert (row["session_id"], row["user_id"]) == ("db-session-a", "user-session-a")
+
+    @pytest.mark.asyncio
+    async def test_inserts_run_on_background_db_threads(self, db):
+        """Test tracker writes use the dedicated DB threads, not the default to_thread pool."""
+        import threading
+
+        threads = []
+        execute = db.client.table.return_value.insert.return_value.execute
+        execute.side_effect = lambda: threads.append(threading.current_thread().name)
+        tracker = _tracker("session-a")
+
+        await tracker.track_message("session-a", "user", "hi")
+        await tracker._flush_queue()
+
+        assert len(threads) == 1
+        assert threads[0].startswith("db-background")
+
+
+class TestSessionLifecycle:
+    """Test session start/end persistence."""
+
+    @pytest.mark.asyncio
+    async def test_start_session_records_slotted_state(self, db):
+        """Test a started session is tracked as a slotted SessionState stamped with one start time."""
+        tracker = ConversationTracker()
+        db.client.table.return_value.insert.return_value.execute.return_value = MagicMock(data=[{"id": "db-session-a"}])
+
+        await tracker.start_session("session-a", "user-a", {"device": "ios"})
+
+        state = tracker.session_states["session-a"]
+        assert (state.user_id, state.db_id, state.metadata) == ("user-a", "db-session-a", {"device": "ios"})
+        assert state.is_active and state.message_count == 0
+        assert not hasattr(state, "__dict__")
+
+        row = db.client.table.return_value.insert.call_args.args[0]
+        assert row["session_start"] == row["started_at"] == state.session_start.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_end_session_is_a_single_update(self, db):
+        """Test ending a session costs one UPDATE round-trip and no pre-check SELECT."""
+        tracker = _tracker("session-a")
+        table = db.client.table.return_value
+        table.update.return_value.eq.return_value.execute.return_value = MagicMock(data=[{"id": "db-session-a"}])
+
+        with patch.object(tracker, "_cleanup_session_state", AsyncMock()):  # skip the delayed state cleanup
+            await tracker.end_session("session-a")
+
+        table.select.assert_not_called()
+        table.update.assert_called_once()
+        assert table.update.call_args.args[0]["is_active"] is False
+
+    @pytest.mark.asyncio
+    async def test_discussed_news_saved_with_one_insert(self, db):
+        """Test all news discussed in a session is written in a single bulk insert."""
+        tracker = _tracker("session-a")
+        tracker.track_discussed_news("session-a", "nvda", "NVDA beats estimates")
+        tracker.track_discussed_news("session-a", "tsla", "TSLA recalls vehicles")
+
+        await tracker._save_discussed_news("session-a")
+
+        insert = db.client.table.return_value.insert
+        insert.assert_called_once()
+        rows = insert.call_args.args[0]
+        assert [(row["session_id"], row["stock_symbol"]) for row in rows] == [
+            ("db-session-a", "NVDA"), ("db-session-a", "TSLA")
+        ]
@@ -295,3 +295,175 @@ class TestMockMemory:
         result = mock_memory.get_deep_dive_context("tell me more")
         
         assert result is None  # Mock always returns None
+
+
+class TestSharedLangGraphAgent:
+    """Test the shared LangGraph agent singleton."""
+
+    async def test_concurrent_get_agent_builds_once(self, monkeypatch):
+        """Test a request racing the startup warm-up waits for the same agent."""
+        import asyncio
+        from backend.app.core import agent_wrapper_langgraph as module
+
+        builds = []
+
+        async def slow_initialize(self):
+            builds.append(self)
+            await asyncio.sleep(0.01)
+
+        monkeypatch.setattr(module, "_agent_wrapper_instance", None)
+        monkeypatch.setattr(module, "_agent_init_task", None)
+        monkeypatch.setattr(module.LangGraphAgentWrapper, "initialize", slow_initialize)
+
+        agents = await asyncio.gather(*(module.get_agent() for _ in range(3)))
+
+        assert len(builds) == 1
+        assert all(agent is builds[0] for agent in agents)
+
+    async def test_get_agent_build_survives_caller_cancel_and_retries_failure(self, monkeypatch):
+        """Test a cancelled first caller doesn't abort the build and a failed build is retried."""
+        import asyncio
+        from backend.app.core import agent_wrapper_langgraph as module
+
+        attempts = []
+
+        async def initialize(self):
+            attempts.append(self)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1:
+                raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(module, "_agent_wrapper_instance", None)
+        monkeypatch.setattr(module, "_agent_init_task", None)
+        monkeypatch.setattr(module.LangGraphAgentWrapper, "initialize", initialize)
+
+        with pytest.raises(RuntimeError):
+            await module.get_agent()
+
+        first = asyncio.create_task(module.get_agent())
+        await asyncio.sleep(0)
+        first.cancel()
+        agent = await module.get_agent()
+
+        assert agent is attempts[1]
+        assert len(attempts) == 2
+
+    async def test_chat_history_keeps_last_ten_messages(self, monkeypatch):
+        """Test a long session only carries the most recent turns into the graph."""
+        from backend.app.core import agent_wrapper_langgraph as module
+
+        states = []
+
+        async def ainvoke(state):
+            states.append(state)
+            return {"summary": f"answer {len(states)}", "intent": "chat"}
+
+        monkeypatch.setattr(module, "_agent_logger", Mock())
+        monkeypatch.setattr(module, "_get_session_logger", Mock())
+        monkeypatch.setattr(module, "_MarketState", lambda **kwargs: kwargs)
+        monkeypatch.setattr(module, "_ChatMessage", lambda **kwargs: kwargs)
+
+        wrapper = module.LangGraphAgentWrapper()
+        wrapper._initialized = True
+        wrapper.graph = Mock(ainvoke=ainvoke)
+        wrapper.user_memories["u1"] = Mock(current_session_id="s1")
+
+        for turn in range(12):
+            await wrapper.process_text_command("u1", f"question {turn}", session_id="s1")
+
+        history = wrapper.session_chat_history["s1"]
+        assert len(history) == module.CHAT_HISTORY_MAX_MESSAGES
+        assert history[0] == {"role": "user", "content": "question 7"}
+        assert isinstance(states[-1]["chat_history"], list)
+        assert len(states[-1]["chat_history"]) == module.CHAT_HISTORY_MAX_MESSAGES
+
+    def test_serialize_intents_handles_dicts_and_objects(self):
+        """Test graph intents flatten the same way whether they are dicts or IntentItem-like objects."""
+        from types import SimpleNamespace
+        from backend.app.core.agent_wrapper_langgraph import _serialize_intents
+
+        expected = [{"intent": "price_check", "symbols": ["NVDA"], "timeframe": "1d"}]
+
+        assert _serialize_intents([]) == []
+        assert _serialize_intents([{"intent": "price_check", "symbols": ["NVDA"], "timeframe": "1d", "reasoning": "x"}]) == expected
+        assert _serialize_intents([SimpleNamespace(intent="price_check", symbols=["NVDA"], timeframe="1d")]) == expected
+
+    async def test_user_memories_evict_least_recent_and_finalize(self, monkeypatch):
+        """Test the memory map is bounded and an evicted memory is flushed, not dropped."""
+        import asyncio
+        from backend.app.core import agent_wrapper_langgraph as module
+
+        monkeypatch.setattr(module, "MAX_USER_MEMORIES", 2)
+        wrapper = module.LangGraphAgentWrapper()
+        memories = {user: Mock(finalize_session=AsyncMock()) for user in ("u1", "u2", "u3")}
+
+        wrapper.user_memories["u1"] = memories["u1"]
+        wrapper.user_memories["u2"] = memories["u2"]
+        wrapper.user_memories["u1"]  # u1 is now the most recently used
+        wrapper.user_memories["u3"] = memories["u3"]
+        await asyncio.gather(*wrapper._finalize_tasks)
+
+        assert list(wrapper.user_memories) == ["u1", "u3"]
+        memories["u2"].finalize_session.assert_awaited_once()
+        memories["u1"].finalize_session.assert_not_awaited()
+
+    async def test_initialize_runs_setup_steps_concurrently(self):
+        """Test database and cache setup overlap with the graph compile."""
+        import asyncio
+        import threading
+        from backend.app.core.agent_wrapper_langgraph import LangGraphAgentWrapper
+
+        compiling = threading.Event()
+        loop_thread = threading.get_ident()
+
+        def compile_graph():
+            assert threading.get_ident() != loop_thread
+            compiling.set()
+            return "graph"
+
+        async def get_database():
+            await asyncio.to_thread(compiling.wait, 1)
+            return "db"
+
+        with patch('backend.app.database.get_database', get_database), \
+             patch('backend.app.cache.get_cache', AsyncMock(return_value="cache")), \
+             patch('backend.app.llm_agent.graph.compile_graph', compile_graph):
+            wrapper = LangGraphAgentWrapper()
+            await wrapper.initialize()
+
+        assert (wrapper.db, wrapper.cache, wrapper.graph) == ("db", "cache", "graph")
+        assert compiling.is_set()
+
+    async def test_concurrent_initialize_runs_once(self):
+        """Test callers racing on a cold wrapper share one initialization."""
+        import asyncio
+        from backend.app.core.agent_wrapper_langgraph import LangGraphAgentWrapper
+
+        compile_graph = Mock(return_value="graph")
+
+        with patch('backend.app.database.get_database', AsyncMock(return_value="db")), \
+             patch('backend.app.cache.get_cache', AsyncMock(return_value="cache")), \
+             patch('backend.app.llm_agent.graph.compile_graph', compile_graph):
+            wrapper = LangGraphAgentWrapper()
+            await asyncio.gather(*(wrapper.initialize() for _ in range(3)))
+
+        compile_graph.assert_called_once()
+        assert wrapper._initialized
+
+    async def test_concurrent_memory_misses_share_one_instance(self):
+        """Test first requests racing for the same user load its memory once."""
+        import asyncio
+        from backend.app.core.agent_wrapper_langgraph import LangGraphAgentWrapper
+
+        async def load(user_id):
+            await asyncio.sleep(0.01)
+            return Mock(user_id=user_id)
+
+        factory = AsyncMock(side_effect=load)
+        with patch('backend.app.llm_agent.long_term_memory_supabase.get_memory_for_user', factory):
+            wrapper = LangGraphAgentWrapper()
+            memories = await asyncio.gather(*(wrapper._get_memory_for_user(u) for u in ("u1", "u1", "u2", "u1")))
+
+        assert factory.await_count == 2
+        assert memories[0] is memories[1] is memories[3]
+        assert memories[2].user_id == "u2"
@@ -0,0 +1,74 @@
+"""
+Tests for DatabaseManager error reporting.
+"""
+
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from backend.app.database import DatabaseManager
+
+
+def _db(execute):
+    """DatabaseManager whose users query chain ends in the given execute mock."""
+    db = DatabaseManager()
+    db.client = MagicMock()
+    db.client.table.return_value.select.return_value.eq.return_value.execute = execute
+    return db
+
+
+class TestUserProfile:
+    """Test a missing user and a failed query are told apart."""
+
+    @pytest.mark.asyncio
+    async def test_missing_user_is_none(self):
+        """Test no users row means None (the route's 404)."""
+        db = _db(MagicMock(return_value=MagicMock(data=[])))
+
+        assert await db.get_user_profile("u1") is None
+
+    @pytest.mark.asyncio
+    async def test_query_error_is_raised(self):
+        """Test a failed query propagates instead of looking like a missing user."""
+        db = _db(MagicMock(side_effect=RuntimeError("connection refused")))
+
+        with pytest.raises(RuntimeError):
+            await db.get_user_profile("u1")
+
+
+class TestMutateUserArray:
+    """Test the atomic users array RPC."""
+
+    @pytest.mark.asyncio
+    async def test_rpc_runs_and_errors_are_raised(self):
+        """Test the RPC result is returned and a failed call propagates."""
+        db = DatabaseManager()
+        db.client = MagicMock()
+        db.client.rpc.return_value.execute.return_value = MagicMock(data=[{"items": ["crypto"], "changed": True}])
+
+        assert await db.mutate_user_array("u1", "preferred_topics", "crypto") == {"items": ["crypto"], "changed": True}
+
+        db.client.rpc.return_value.execute.side_effect = RuntimeError("connection refused")
+        with pytest.raises(RuntimeError):
+            await db.mutate_user_array("u1", "preferred_topics", "crypto")
+
+
+class TestLatestNews:
+    """Test the filtered latest-news query."""
+
+    @pytest.mark.asyncio
+    async def test_query_runs_off_the_event_loop(self):
+        """Test the breaking/category query executes on a worker thread."""
+        db = DatabaseManager()
+        db.client = MagicMock()
+        query = db.client.table.return_value.select.return_value
+        query.eq.return_value = query
+        threads = []
+        query.order.return_value.limit.return_value.execute = (
+            lambda: threads.append(threading.get_ident()) or MagicMock(data=[{"id": "n1"}])
+        )
+
+        assert await db.get_latest_news(limit=5, breaking_only=True, category="tech") == [{"id": "n1"}]
+        assert threads and threads[0] != threading.get_ident()
+        db.client.table.return_value.select.assert_called_once_with("*, news_sources!inner(*)")
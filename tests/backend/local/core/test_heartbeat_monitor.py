@@ -0,0 +1,74 @@
+"""
+Tests for HeartbeatMonitor stale session sweeps.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from backend.app.core.heartbeat_monitor import HeartbeatMonitor
+
+
+@pytest.fixture
+def db():
+    """Patched db_manager whose conversation_sessions queries are recorded."""
+    with patch("backend.app.core.heartbeat_monitor.db_manager") as db_manager:
+        db_manager._initialized = True
+        yield db_manager
+
+
+def _session(session_id, heartbeat_age):
+    """Stale session row whose last heartbeat was ``heartbeat_age`` seconds ago."""
+    last_heartbeat = datetime.now(timezone.utc) - timedelta(seconds=heartbeat_age)
+    return {"session_id": session_id, "last_heartbeat_at": last_heartbeat.isoformat()}
+
+
+def _stale_query(db):
+    """The mocked active-and-stale sessions query chain."""
+    return db.client.table.return_value.select.return_value.eq.return_value.lt.return_value
+
+
+class TestStaleSessionSweep:
+    """Test stale sessions are closed with batched writes."""
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_timeout_is_filtered_in_sql(self, db):
+        """Test the query only asks for active sessions whose heartbeat is older than the timeout."""
+        _stale_query(db).execute.return_value = MagicMock(data=[])
+
+        before = datetime.now(timezone.utc)
+        await HeartbeatMonitor(timeout_seconds=100)._check_stale_sessions()
+
+        table = db.client.table.return_value
+        table.select.return_value.eq.assert_called_once_with("is_active", True)
+        column, cutoff = table.select.return_value.eq.return_value.lt.call_args.args
+        assert column == "last_heartbeat_at"
+        assert abs((before - datetime.fromisoformat(cutoff)).total_seconds() - 100) < 5
+        table.update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stale_sessions_closed_with_one_update_and_one_rpc(self, db):
+        """Test N stale sessions cost one .in_() UPDATE plus one duration RPC."""
+        table = db.client.table.return_value
+        _stale_query(db).execute.return_value = MagicMock(data=[_session("stale-a", 300), _session("stale-c", 150)])
+
+        await HeartbeatMonitor(timeout_seconds=100)._check_stale_sessions()
+
+        table.update.assert_called_once()
+        assert table.update.call_args.args[0]["is_active"] is False
+        table.update.return_value.in_.assert_called_once_with("session_id", ["stale-a", "stale-c"])
+        db.client.rpc.assert_called_once_with(
+            "set_session_durations", {"p_session_ids": ["stale-a", "stale-c"]}
+        )
+
+    @pytest.mark.asyncio
+    async def test_duration_rpc_failure_keeps_sessions_closed(self, db):
+        """Test a failing duration RPC does not undo or retry the close."""
+        table = db.client.table.return_value
+        _stale_query(db).execute.return_value = MagicMock(data=[_session("stale-a", 300)])
+        db.client.rpc.return_value.execute.side_effect = Exception("function does not exist")
+
+        await HeartbeatMonitor(timeout_seconds=100)._check_stale_sessions()
+
+        table.update.return_value.in_.return_value.execute.assert_called_once()
+        db.client.rpc.assert_called_once()
@@ -0,0 +1,51 @@
+"""
+Tests for LFUCacheManager's Upstash REST command encoding.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.app.lfu_cache.lfu_manager import LFUCacheManager
+
+
+def _lfu_manager(*bodies):
+    """LFUCacheManager whose REST POSTs return the given JSON bodies."""
+    manager = LFUCacheManager()
+    manager.base_url = "https://redis.example"
+    manager._initialized = True
+    manager.client = MagicMock()
+    manager.client.post = AsyncMock(side_effect=[
+        MagicMock(json=MagicMock(return_value=body), raise_for_status=MagicMock())
+        for body in bodies
+    ])
+    return manager
+
+
+class TestLFUCommands:
+    """Test LFU commands are POSTed as JSON arrays rather than URL paths."""
+
+    @pytest.mark.asyncio
+    async def test_zincrby_member_travels_in_body(self):
+        """Test a member with URL-special characters is sent verbatim in the body."""
+        manager = _lfu_manager({"result": "1.5"})
+
+        assert await manager._redis_zincrby("stock_news:lfu", 1.5, "news:BRK.B/2024?x=1") is True
+
+        call = manager.client.post.await_args
+        assert call.args == ("https://redis.example",)
+        assert call.kwargs["json"] == ["ZINCRBY", "stock_news:lfu", 1.5, "news:BRK.B/2024?x=1"]
+
+    @pytest.mark.asyncio
+    async def test_eviction_is_one_pipeline(self):
+        """Test evicting several entries deletes and untracks them in a single round-trip."""
+        manager = _lfu_manager(
+            {"result": ["a", "0.1", "b", "0.2"]},
+            [{"result": 2}, {"result": 2}]
+        )
+
+        await manager.evict_lfu_entries("stock_price", 2)
+
+        zrange, pipeline = manager.client.post.await_args_list
+        assert zrange.kwargs["json"] == ["ZRANGE", "stock_price:lfu", 0, 1, "WITHSCORES"]
+        assert pipeline.args == ("https://redis.example/pipeline",)
+        assert pipeline.kwargs["json"] == [["DEL", "a", "b"], ["ZREM", "stock_price:lfu", "a", "b"]]
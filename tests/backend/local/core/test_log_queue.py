@@ -0,0 +1,61 @@
+"""
+Tests for the background log queue used by the WebSocket and cache loggers.
+"""
+
+import logging
+import queue
+import sys
+
+from backend.app.utils.logger import DroppingQueueHandler, start_log_queue, stop_log_queue
+
+
+class _Collector(logging.Handler):
+    """Handler that keeps the messages it receives."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestLogQueue:
+    """Test hot-path records are drained off-thread and never block."""
+
+    def test_hot_path_records_reach_handlers_via_listener(self):
+        """Test ws/cache records are delivered by the listener and not propagated."""
+        collector = _Collector()
+        start_log_queue([collector])
+        try:
+            hot_logger = logging.getLogger("voice_news_agent.ws")
+            assert not hot_logger.propagate
+            hot_logger.warning("send failed")
+        finally:
+            stop_log_queue()
+
+        assert collector.messages == ["send failed"]
+        assert logging.getLogger("voice_news_agent.ws").propagate
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test a record arriving at a full queue is discarded."""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        record = logging.makeLogRecord({"msg": "frame"})
+
+        handler.emit(record)
+        handler.emit(record)
+
+        assert handler.queue.qsize() == 1
+
+    def test_traceback_is_formatted_by_the_listener(self):
+        """Test logger.exception queues the raw exc_info instead of formatting it in the caller."""
+        handler = DroppingQueueHandler(queue.Queue())
+        try:
+            raise ValueError("socket reset")
+        except ValueError:
+            record = logging.makeLogRecord({"msg": "ws endpoint error", "exc_info": sys.exc_info()})
+            handler.emit(record)
+
+        queued = handler.queue.get_nowait()
+        assert queued.exc_info[0] is ValueError
+        assert queued.exc_text is None
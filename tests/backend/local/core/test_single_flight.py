@@ -0,0 +1,122 @@
+"""
+Tests for SingleFlight agent command sharing.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.app.core.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test concurrent commands run immediately and identical ones are shared."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_call(self):
+        """Test overlapping duplicate commands run once and distinct ones each run."""
+        handler = AsyncMock(side_effect=lambda **kwargs: {"response_text": kwargs["query"]})
+        flight = SingleFlight()
+
+        results = await asyncio.gather(
+            flight.submit(handler, query="news", user_id="u1", session_id="s1"),
+            flight.submit(handler, query="news", user_id="u1", session_id="s1"),
+            flight.submit(handler, query="AAPL", user_id="u2", session_id="s2"),
+        )
+
+        assert [r["response_text"] for r in results] == ["news", "news", "AAPL"]
+        assert handler.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        """Test a failing agent call raises in each caller that shared it."""
+        handler = AsyncMock(side_effect=RuntimeError("llm down"))
+        flight = SingleFlight()
+
+        results = await asyncio.gather(
+            flight.submit(handler, query="news", user_id="u1"),
+            flight.submit(handler, query="news", user_id="u1"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        handler.assert_awaited_once_with(query="news", user_id="u1")
+
+    @pytest.mark.asyncio
+    async def test_requests_dispatch_without_a_window(self):
+        """Test a command reaches the agent on the next loop tick, not after a collection delay."""
+        handler = AsyncMock(return_value={})
+        flight = SingleFlight()
+
+        task = asyncio.create_task(flight.submit(handler, query="a"))
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        handler.assert_awaited_once_with(query="a")
+        await task
+
+    @pytest.mark.asyncio
+    async def test_bad_call_does_not_strand_waiters(self):
+        """Test a handler that fails before returning a coroutine still resolves its caller."""
+        async def handler(query):
+            return {}
+
+        with pytest.raises(TypeError):
+            await asyncio.wait_for(SingleFlight().submit(handler, command="x"), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_joins_call_already_running(self):
+        """Test a duplicate arriving after dispatch shares the running call instead of starting one."""
+        release = asyncio.Event()
+
+        async def slow_agent(query):
+            await release.wait()
+            return {"response_text": query}
+
+        handler = AsyncMock(side_effect=slow_agent)
+        flight = SingleFlight()
+
+        first = asyncio.create_task(flight.submit(handler, query="news"))
+        await asyncio.sleep(0.05)
+        assert handler.await_count == 1
+
+        second = asyncio.create_task(flight.submit(handler, query="news"))
+        await asyncio.sleep(0.05)
+        release.set()
+
+        assert await first == await second == {"response_text": "news"}
+        assert handler.await_count == 1
+
+        # Once the call settles the key is released and a new request runs again
+        await flight.submit(handler, query="news")
+        assert handler.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_error_with_no_waiters_left_is_retrieved(self):
+        """Test a shared call failing after all its callers were cancelled logs no unretrieved error."""
+        import gc
+
+        release = asyncio.Event()
+
+        async def failing_agent(query):
+            await release.wait()
+            raise RuntimeError("llm down")
+
+        loop = asyncio.get_running_loop()
+        unhandled = []
+        loop.set_exception_handler(lambda _, context: unhandled.append(context))
+        try:
+            flight = SingleFlight()
+            caller = asyncio.create_task(flight.submit(failing_agent, query="news"))
+            await asyncio.sleep(0)
+            caller.cancel()
+            release.set()
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+            del caller
+            gc.collect()
+        finally:
+            loop.set_exception_handler(None)
+
+        assert not unhandled
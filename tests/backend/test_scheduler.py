@@ -103,6 +103,7 @@ class TestPopularStocksUpdate:
                     with patch('backend.app.database.db_manager', mock_db_manager):
                         with patch('backend.app.scheduler.scheduler_manager.settings') as mock_settings:
                             mock_settings.popular_stocks = "AAPL,GOOGL"
+                            mock_settings.popular_stocks_list = ["AAPL", "GOOGL"]
 
                             # Run the update
                             await scheduler._update_popular_stocks()
@@ -123,6 +124,7 @@ class TestPopularStocksUpdate:
 
         with patch('backend.app.scheduler.scheduler_manager.settings') as mock_settings:
             mock_settings.popular_stocks = ""
+            mock_settings.popular_stocks_list = []
 
             # Should not raise error
             await scheduler._update_popular_stocks()
@@ -155,6 +157,7 @@ class TestPopularStocksUpdate:
                     with patch('backend.app.database.db_manager', mock_db_manager):
                         with patch('backend.app.scheduler.scheduler_manager.settings') as mock_settings:
                             mock_settings.popular_stocks = "AAPL,INVALID"
+                            mock_settings.popular_stocks_list = ["AAPL", "INVALID"]
 
                             # Should not raise error
                             await scheduler._update_popular_stocks()
@@ -196,6 +199,7 @@ class TestLatestNewsUpdate:
                     with patch('backend.app.database.db_manager', mock_db_manager):
                         with patch('backend.app.scheduler.scheduler_manager.settings') as mock_settings:
                             mock_settings.popular_stocks = "AAPL"
+                            mock_settings.popular_stocks_list = ["AAPL"]
 
                             # Run the update
                             await scheduler._update_latest_news()
@@ -224,6 +228,7 @@ class TestLatestNewsUpdate:
             with patch('backend.app.cache.cache_manager', mock_cache_manager):
                 with patch('backend.app.scheduler.scheduler_manager.settings') as mock_settings:
                     mock_settings.popular_stocks = "AAPL"
+                    mock_settings.popular_stocks_list = ["AAPL"]
 
                     # Should not raise error
                     await scheduler._update_latest_news()
@@ -244,6 +244,86 @@ class TestStockPriceCacheScenarios:
                 if isinstance(result, dict):
                     assert result['data']['symbol'] == 'AAPL'
 
+    @pytest.mark.asyncio
+    async def test_batch_prices_fetched_concurrently(self):
+        """Test batch lookups overlap (bounded) and a failing symbol doesn't sink the batch."""
+        from backend.app.services.stock_price_service import BATCH_PRICE_CONCURRENCY
+
+        service = StockPriceService()
+        in_flight = 0
+        peak = 0
+
+        async def fake_get_stock_price(symbol, refresh=False, check_redis=True):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if symbol == 'BAD':
+                raise RuntimeError("upstream error")
+            return {'symbol': symbol, 'price': 1.0, 'source': 'redis', 'cache_hit': True}
+
+        symbols = [f'S{i}' for i in range(BATCH_PRICE_CONCURRENCY * 2)] + ['BAD']
+        service.lfu_cache = AsyncMock()
+        mock_cache_manager = AsyncMock()
+        mock_cache_manager.get_multiple.return_value = {}
+        with patch('backend.app.services.stock_price_service.cache_manager', mock_cache_manager):
+            with patch.object(service, 'get_stock_price', side_effect=fake_get_stock_price):
+                results = await service.get_multiple_prices(symbols)
+
+        assert 1 < peak <= BATCH_PRICE_CONCURRENCY
+        assert results['BAD'] is None
+        assert results['S0']['price'] == 1.0
+        assert list(results) == symbols
+
+    @pytest.mark.asyncio
+    async def test_batch_prices_read_redis_with_one_mget(self):
+        """Test a batch reads Redis once and only sends misses down the DB/API path."""
+        service = StockPriceService()
+        service.lfu_cache = AsyncMock()
+
+        mock_cache_manager = AsyncMock()
+        mock_cache_manager.get_multiple.return_value = {
+            'stock:price:AAPL': {
+                'symbol': 'AAPL',
+                'price': 175.43,
+                'last_updated': datetime.utcnow().isoformat()
+            },
+            'stock:price:MSFT': None
+        }
+        fetched = AsyncMock(return_value={'symbol': 'MSFT', 'price': 410.0, 'source': 'database'})
+
+        with patch('backend.app.services.stock_price_service.cache_manager', mock_cache_manager):
+            with patch.object(service, 'get_stock_price', fetched):
+                results = await service.get_multiple_prices(['aapl', 'msft'])
+
+        mock_cache_manager.get_multiple.assert_awaited_once_with(['stock:price:AAPL', 'stock:price:MSFT'])
+        mock_cache_manager.get.assert_not_called()
+        fetched.assert_awaited_once_with('msft', False, check_redis=False)
+        assert results['AAPL']['source'] == 'redis'
+        assert results['AAPL']['cache_hit'] is True
+        assert results['MSFT']['price'] == 410.0
+
+    @pytest.mark.asyncio
+    async def test_iter_multiple_prices_yields_fastest_first(self):
+        """Test streamed batch results come out as lookups finish, not in request order."""
+        service = StockPriceService()
+        service.lfu_cache = AsyncMock()
+
+        async def get_stock_price(symbol, refresh=False, check_redis=True):
+            await asyncio.sleep(0.05 if symbol == 'slow' else 0)
+            return {'symbol': symbol.upper(), 'price': 1.0, 'source': 'database'}
+
+        mock_cache_manager = AsyncMock()
+        mock_cache_manager.get_multiple.return_value = {}
+        with patch('backend.app.services.stock_price_service.cache_manager', mock_cache_manager):
+            with patch.object(service, 'get_stock_price', side_effect=get_stock_price):
+                streamed = [symbol async for symbol, _ in service.iter_multiple_prices(['slow', 'fast'])]
+                batch = await service.get_multiple_prices(['slow', 'fast'])
+
+        assert streamed == ['FAST', 'SLOW']
+        assert list(batch) == ['SLOW', 'FAST']
+
     @pytest.mark.asyncio
     async def test_batch_quotes_with_mixed_cache_states(self):
         """Test batch fetching with some symbols in cache, others need API."""
@@ -251,6 +331,56 @@ class TestStockPriceCacheScenarios:
         # Implementation depends on whether batch API is exposed
         pass
 
+    @staticmethod
+    def _history_query(*results):
+        """Chainable stock_prices query mock whose execute() returns/raises the given results."""
+        query = MagicMock()
+        for step in ('select', 'eq', 'lt', 'or_', 'order', 'limit'):
+            getattr(query, step).return_value = query
+        query.execute.side_effect = list(results)
+        client = MagicMock()
+        client.table.return_value = query
+        return query, client
+
+    @pytest.mark.asyncio
+    async def test_price_history_pages_by_keyset(self):
+        """Test history pages continue from the last row's (timestamp, id) instead of an offset."""
+        from backend.app.db.stock_prices import StockPriceDB
+
+        pages = [
+            [{'id': 'c', 'last_updated': '2024-01-01T10:03:00'}, {'id': 'b', 'last_updated': '2024-01-01T10:02:00'}],
+            [{'id': 'a', 'last_updated': '2024-01-01T10:02:00'}],
+        ]
+        query, client = self._history_query(*[MagicMock(data=page) for page in pages])
+
+        db = StockPriceDB(client)
+        rows = [row async for row in db.iter_price_history('tsla', limit=5, before=datetime(2024, 1, 2), page_size=2)]
+
+        assert [row['id'] for row in rows] == ['c', 'b', 'a']
+        query.lt.assert_called_once_with('last_updated', '2024-01-02T00:00:00')
+        # The second page keeps rows tied on the boundary timestamp
+        query.or_.assert_called_once_with(
+            'last_updated.lt."2024-01-01T10:02:00",and(last_updated.eq."2024-01-01T10:02:00",id.lt.b)'
+        )
+        assert [c.args for c in query.order.call_args_list[:2]] == [('last_updated',), ('id',)]
+        query.range.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_price_history_page_error_is_raised(self):
+        """Test a failed page fetch propagates instead of ending the history early."""
+        from backend.app.db.stock_prices import StockPriceDB
+
+        page = [{'id': 'b', 'last_updated': '2024-01-01T10:02:00'}, {'id': 'a', 'last_updated': '2024-01-01T10:01:00'}]
+        _, client = self._history_query(MagicMock(data=page), RuntimeError('connection reset'))
+
+        db = StockPriceDB(client)
+        rows = []
+        with pytest.raises(RuntimeError):
+            async for row in db.iter_price_history('tsla', limit=5, page_size=2):
+                rows.append(row)
+
+        assert rows == page
+
 
 class TestStockPriceDataQuality:
     """Test suite for data validation and quality checks."""